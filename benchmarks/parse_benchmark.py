@@ -0,0 +1,92 @@
+"""
+Micro-benchmark for per-page HTML parsing cost.
+
+Compares the previous approach (two `html.parser` parses per page: one for the
+text, one for the links) with the single-pass `extract_text_and_anchors` plus
+`score_internal_links` the crawler uses now, on every installed parser backend.
+
+Usage:
+    python -m benchmarks.parse_benchmark [page1.html page2.html ...] [--repeat N]
+
+Without files, a synthetic page of roughly 300 KB is used.
+"""
+import argparse
+import logging
+import re
+import time
+from typing import List, Tuple
+
+from bs4 import BeautifulSoup
+
+from src.scraper.scraper_utils import HTML_PARSER_BACKENDS, available_html_parsers, extract_text_and_anchors, score_internal_links
+
+BASE_URL = "https://example.com/"
+
+
+def _synthetic_page(sections: int = 400) -> str:
+    parts: List[str] = ["<html><head><title>Example GmbH</title><style>body { color: #333; }</style></head><body>"]
+    nav_paths = ["ueber-uns", "about", "produkte", "leistungen", "kontakt", "karriere", "blog/news"]
+    parts.append("<nav>" + "".join(f'<a href="/{p}">{p.title()}</a>' for p in nav_paths) + "</nav>")
+    for i in range(sections):
+        parts.append(
+            f"<section><h2>Section {i}</h2><p>Wir entwickeln Software und Dienstleistungen fuer den Mittelstand. "
+            f"Unsere Loesungen verbinden Beratung, Implementierung und Betrieb. Absatz {i}.</p>"
+            f'<a href="/produkte/item-{i}">Produkt {i}</a> <a href="https://other.example.org/{i}">Partner</a>'
+            f"<script>var tracking_{i} = {{id: {i}}};</script></section>"
+        )
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def _legacy_two_pass(html_content: str) -> Tuple[str, List[Tuple[str, int]]]:
+    """The previous per-page cost: a text parse and a separate link parse, both with html.parser."""
+    soup = BeautifulSoup(html_content, 'html.parser')
+    for script_or_style in soup(["script", "style"]):
+        script_or_style.decompose()
+    text = re.sub(r'\s+', ' ', soup.get_text(separator=' ', strip=True)).strip()
+    _, anchors = extract_text_and_anchors(html_content, "html.parser")
+    return text, score_internal_links(anchors, BASE_URL, "benchmark", "benchmark")
+
+
+def _single_pass(html_content: str, parser: str) -> Tuple[str, List[Tuple[str, int]]]:
+    text, anchors = extract_text_and_anchors(html_content, parser)
+    return text, score_internal_links(anchors, BASE_URL, "benchmark", "benchmark")
+
+
+def _time_per_page(func, pages: List[str], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html_content in pages:
+            func(html_content)
+    return (time.perf_counter() - start) / (repeat * len(pages))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark per-page HTML parsing cost.")
+    parser.add_argument("files", nargs="*", help="HTML files to parse (default: a synthetic page).")
+    parser.add_argument("--repeat", type=int, default=5, help="Parses per page per variant.")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)  # Link scoring logs every page
+
+    pages = []
+    for path in args.files:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            pages.append(f.read())
+    if not pages:
+        pages = [_synthetic_page()]
+    avg_kb = sum(len(p) for p in pages) / len(pages) / 1024
+    print(f"{len(pages)} page(s), average {avg_kb:.0f} KB, {args.repeat} repeat(s)")
+
+    baseline = _time_per_page(_legacy_two_pass, pages, args.repeat)
+    print(f"{'two-pass html.parser (before)':<32} {baseline * 1000:8.1f} ms/page")
+    installed_backends = available_html_parsers()
+    for backend in HTML_PARSER_BACKENDS:
+        if backend not in installed_backends:
+            print(f"{'single-pass ' + backend:<32} {'not installed':>8}")
+            continue
+        per_page = _time_per_page(lambda html_content: _single_pass(html_content, backend), pages, args.repeat)
+        print(f"{'single-pass ' + backend:<32} {per_page * 1000:8.1f} ms/page  ({baseline / per_page:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
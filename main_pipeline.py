@@ -1,5 +1,6 @@
 import pandas as pd
 from typing import List, Dict, Optional, Any
+import argparse
 import csv
 import logging
 import os
@@ -12,7 +13,7 @@ from dotenv import load_dotenv
 
 from src.data_handling.loader import load_and_preprocess_data
 # from src.data_handling.consolidator import get_canonical_base_url, generate_processed_contacts_report # Moved to report orchestrator
-from src.llm_clients.gemini_client import GeminiClient
+from src.llm_clients.gemini_client import AsyncGeminiClient, GeminiClient
 from src.core.schemas import GoldenPartnerMatchOutput # For the new pipeline result
 from src.core.logging_config import setup_logging
 from src.core.config import AppConfig
@@ -29,6 +30,7 @@ from src.utils.helpers import (
 )
 from src.reporting.metrics_manager import write_run_metrics
 from src.processing.pipeline_flow import execute_pipeline_flow
+from src.processing.checkpoint_store import PipelineCheckpointStore, get_checkpoint_db_path, open_checkpoint_store
 from src.reporting.main_report_orchestrator import generate_all_reports # NEW
 
 load_dotenv(override=True)
@@ -38,16 +40,42 @@ logger = logging.getLogger(__name__)
 # __file__ will refer to main_pipeline.py's location
 BASE_FILE_PATH_FOR_RESOLVE = __file__
 
-def main() -> None:
+def parse_args() -> argparse.Namespace:
+    """Parses command-line arguments for the pipeline."""
+    parser = argparse.ArgumentParser(description="Run the sales prompt pipeline.")
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        default=None,
+        help="Resume an interrupted run: reuse its output directory and checkpoint, "
+             "skip finished rows and restart only incomplete stages."
+    )
+    parser.add_argument(
+        "--llm-cache",
+        choices=["use", "refresh", "bypass"],
+        default=None,
+        help="Override LLM_CACHE_MODE for this run: 'use' cached Gemini responses, "
+             "'refresh' them (call the API and overwrite), or 'bypass' the cache entirely."
+    )
+    return parser.parse_args()
+
+def main(resume_run_id: Optional[str] = None, llm_cache_mode: Optional[str] = None) -> None:
     app_config: AppConfig = AppConfig() # Initialize AppConfig globally for easy access
+    if llm_cache_mode:
+        app_config.llm_cache_mode = llm_cache_mode
     """
     Main entry point for the phone validation pipeline.
     Orchestrates the entire process from data loading to report generation.
+
+    Args:
+        resume_run_id: If given, the run with this ID is resumed from its checkpoint
+                       instead of starting a new run.
+        llm_cache_mode: If given, overrides the configured LLM response cache mode.
     """
     pipeline_start_time = time.time()
     
     # 1. Initialize Run ID and Metrics
-    run_id = generate_run_id()
+    run_id = resume_run_id if resume_run_id else generate_run_id()
     run_metrics: Dict[str, Any] = initialize_run_metrics(run_id) # Use helper
 
     # 2. Setup Output Directories
@@ -62,6 +90,11 @@ def main() -> None:
     setup_logging(file_log_level=file_log_level_int, console_log_level=console_log_level_int, log_file_path=log_file_path)
     
     logger.info(f"Logging initialized. Run ID: {run_id}")
+    if resume_run_id:
+        logger.info(f"Resuming run {run_id}.")
+        if not os.path.exists(get_checkpoint_db_path(run_output_dir, run_id)):
+            logger.error(f"CRITICAL: No checkpoint found for run {run_id} in {run_output_dir}. Cannot resume. Exiting.")
+            return
     logger.info(f"Base output directory for this run: {run_output_dir}")
 
     # Resolve input file path (relative to project root if not absolute)
@@ -84,8 +117,11 @@ def main() -> None:
     # 4. Initialize LLM Extractor
     gemini_client: Optional[GeminiClient] = None # Initialize as Optional
     try:
-        gemini_client = GeminiClient(config=app_config)
-        logger.info("GeminiClient initialized successfully.")
+        if app_config.llm_async_client_enabled:
+            gemini_client = AsyncGeminiClient(config=app_config)
+        else:
+            gemini_client = GeminiClient(config=app_config)
+        logger.info(f"{type(gemini_client).__name__} initialized successfully.")
     except ValueError as ve:
         logger.error(f"Failed to initialize GeminiClient: {ve}. Check GEMINI_API_KEY. Pipeline cannot proceed with LLM steps.")
         run_metrics["errors_encountered"].append(f"LLM Extractor init failed: {ve}")
@@ -185,11 +221,18 @@ def main() -> None:
     # 8. Execute Core Pipeline Flow
     failure_log_file_handle = None
     failure_writer = None
+    checkpoint_store: Optional[PipelineCheckpointStore] = None
     try:
-        failure_log_file_handle = open(failure_log_csv_path, 'w', newline='', encoding='utf-8')
+        # A resumed run appends to the failure log written so far; finished rows are not logged again.
+        append_failure_log = bool(resume_run_id) and os.path.exists(failure_log_csv_path)
+        failure_log_file_handle = open(failure_log_csv_path, 'a' if append_failure_log else 'w', newline='', encoding='utf-8')
         failure_writer = csv.writer(failure_log_file_handle)
-        # Write header for failure log
-        failure_writer.writerow(['log_timestamp', 'input_row_identifier', 'CompanyName', 'GivenURL', 'stage_of_failure', 'error_reason', 'error_details', 'Associated_Pathful_Canonical_URL'])
+        if not append_failure_log:
+            # Write header for failure log
+            failure_writer.writerow(['log_timestamp', 'input_row_identifier', 'CompanyName', 'GivenURL', 'stage_of_failure', 'error_reason', 'error_details', 'Associated_Pathful_Canonical_URL'])
+
+        if app_config.pipeline_checkpoint_enabled or resume_run_id:
+            checkpoint_store = open_checkpoint_store(run_output_dir, run_id)
 
         logger.info("Starting core pipeline processing flow...")
         # These variables will be populated by execute_pipeline_flow
@@ -208,7 +251,8 @@ def main() -> None:
             run_id=run_id,
             failure_writer=failure_writer,
             run_metrics=run_metrics,
-            golden_partner_summaries=golden_partner_summaries
+            golden_partner_summaries=golden_partner_summaries,
+            checkpoint_store=checkpoint_store
         )
         run_metrics["data_processing_stats"]["row_level_failure_summary"] = row_level_failure_counts # Update from flow
         logger.info("Core pipeline processing flow finished.")
@@ -238,6 +282,9 @@ def main() -> None:
         logger.error(f"An unhandled error occurred during pipeline execution or reporting: {pipeline_exec_error}", exc_info=True)
         run_metrics["errors_encountered"].append(f"Pipeline execution/reporting error: {str(pipeline_exec_error)}")
     finally:
+        if checkpoint_store:
+            checkpoint_store.close()
+        gemini_client.close()
         if failure_log_file_handle:
             try:
                 failure_log_file_handle.close()
@@ -262,4 +309,5 @@ if __name__ == '__main__':
     # Basic logging config if no handlers are configured yet (e.g., when run directly)
     if not logger.hasHandlers():
         logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    main()
\ No newline at end of file
+    cli_args = parse_args()
+    main(resume_run_id=cli_args.resume, llm_cache_mode=cli_args.llm_cache)
\ No newline at end of file
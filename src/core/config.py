@@ -72,12 +72,39 @@ class AppConfig:
         scraper_score_threshold_for_limit_bypass (int): Score to bypass page limit.
         scraper_max_high_priority_pages_after_limit (int): Max high-priority pages after limit.
         scraper_pages_for_summary_count (int): Number of top pages for summary text.
+        scraper_sitemap_discovery_enabled (bool): Seed the crawl frontier with keyword-scored sitemap URLs.
+        scraper_sitemap_seed_count (int): Maximum sitemap URLs queued per entry point.
+        scraper_sitemap_max_files (int): Maximum sitemap files (indexes included) fetched per site.
+        scraper_sitemap_max_urls (int): Maximum page URLs read from a site's sitemaps.
+        scraper_sitemap_max_bytes (int): Maximum decompressed bytes read from one sitemap file.
+        scraper_summary_driven_crawl (bool): Stop crawling an entry point once the summary input is complete
+            (enough priority pages collected or LLM_MAX_INPUT_CHARS_FOR_SUMMARY filled).
         
         max_depth_internal_links (int): Maximum depth for following internal links.
         scraper_networkidle_timeout_ms (int): Playwright networkidle timeout (ms).
+        scraper_adaptive_networkidle_enabled (bool): Learn per domain whether the networkidle wait changes page
+                                                     text, and skip it on domains where it does not.
+        scraper_networkidle_learning_pages (int): Pages per domain measured before the wait can be skipped.
+        scraper_http_fast_path_enabled (bool): Fetch pages over plain HTTP first and use Playwright only
+                                               for domains whose pages look client-rendered.
+        scraper_http_min_text_chars (int): Minimum extractable text length for an HTTP-fetched page to be
+                                           used without a browser.
+        scraper_http_max_connections (int): Connection limit of the run-wide HTTP client (fast path, robots.txt,
+                                            sitemaps, page cache, link validation).
+        scraper_http_max_keepalive_connections (int): Idle connections the run-wide HTTP client keeps open for reuse.
+        scraper_child_fetch_concurrency (int): Child pages of one site fetched concurrently (1 = one at a time, the default).
+        scraper_max_concurrent_fetches_per_host (int): Max page fetches running against one host at a time.
+        scraper_host_politeness_delay_ms (int): Minimum delay (ms) between the starts of two fetches to the same host.
+        scraper_link_validation_concurrency_per_host (int): Max concurrent link-validation requests per host.
+        scraper_in_browser_extraction (bool): Extract text and links of browser-rendered pages with one
+                                              `page.evaluate` call instead of serializing and re-parsing the DOM.
+        scraper_html_parser (str): HTML parser backend: "auto", "selectolax", "lxml" or "html.parser".
         
         output_base_dir (str): Base directory for output files.
         scraped_content_subdir (str): Subdirectory for scraped content.
+        scraped_content_store (str): "packed" (one compressed JSONL store per run with an offset index)
+                                     or "directory" (one text file per page).
+        scraped_content_compression (str): Compression of the packed store: "zstd", "gzip" or "none".
         llm_context_subdir (str): Subdirectory for LLM context/raw responses.
         filename_company_name_max_len (int): Max length for company name in filenames.
         filename_url_domain_max_len (int): Max length for domain in filenames.
@@ -85,6 +112,11 @@ class AppConfig:
         
         respect_robots_txt (bool): Whether to respect robots.txt.
         robots_txt_user_agent (str): User-agent for checking robots.txt.
+        robots_cache_ttl_seconds (int): How long a fetched robots.txt is reused (across rows and runs).
+        robots_cache_path (str): JSON file persisting fetched robots.txt files between runs (empty = in-memory only).
+        page_cache_enabled (bool): Reuse pages of earlier runs when the server confirms they are unchanged.
+        page_cache_path (str): Path of the SQLite file holding cached pages.
+        page_cache_ttl_seconds (int): Cached pages older than this are purged and fetched normally.
         
         gemini_api_key (Optional[str]): API key for Google Gemini.
         llm_model_name (str): Google Gemini model to use.
@@ -98,17 +130,35 @@ class AppConfig:
         LLM_MAX_INPUT_CHARS_FOR_SUMMARY (int): Max input characters for summary LLM call.
         llm_max_tokens_summary (Optional[int]): Max tokens for summary generation.
         llm_temperature_summary (Optional[float]): Temperature for summary generation.
+        llm_cache_enabled (bool): Whether Gemini responses are cached on disk and reused across runs.
+        llm_cache_mode (str): Cache mode: "use" (read and write), "refresh" (write only) or "bypass" (off).
+        llm_cache_path (str): Path of the SQLite file holding cached LLM responses.
+        llm_cache_ttl_seconds (int): Age after which cached LLM responses expire (0 = never).
+        llm_cache_max_entries (int): Maximum number of cached LLM responses; least recently used are evicted (0 = unlimited).
+        llm_async_client_enabled (bool): Whether LLM calls use the async Gemini client with rate limiting.
+        llm_rate_limit_rpm (int): Maximum Gemini requests per minute per model (0 = unlimited).
+        llm_rate_limit_tpm (int): Maximum Gemini tokens (prompt + completion) per minute per model (0 = unlimited).
+        llm_rate_limit_cooldown_seconds (float): Pause applied to all callers of a model after a 429 response.
+        llm_max_retries (int): Total attempts per LLM call for retryable API errors (async client).
         
         PROMPT_PATH_WEBSITE_SUMMARIZER (str): Path to website summarizer prompt.
         prompt_path_summarization (str): Path to the (old) summarization prompt.
         prompt_path_homepage_context (str): Path to homepage context prompt.
         PROMPT_PATH_ATTRIBUTE_EXTRACTOR (str): Path to attribute extractor prompt.
+        PROMPT_PATH_SUMMARY_AND_ATTRIBUTES (str): Path to the combined summary + attribute extraction prompt.
+        llm_combined_summary_extraction (bool): Whether summary and attribute extraction are done in one structured-output LLM call.
         PROMPT_PATH_COMPARISON_SALES_LINE (str): Path to comparison sales line prompt.
         MAX_GOLDEN_PARTNERS_IN_PROMPT (int): Max golden partners to include in prompts.
+        golden_partner_ranking_enabled (bool): Whether golden partners are pre-ranked locally so only the top
+                                               MAX_GOLDEN_PARTNERS_IN_PROMPT are sent in the sales-insights prompt.
         extraction_profile (str): Current extraction profile to use (e.g., "minimal").
 
         url_probing_tlds (List[str]): TLDs for domain-like input probing.
         enable_dns_error_fallbacks (bool): Enable DNS error fallback strategies.
+        dns_preflight_enabled (bool): Resolve all input hosts and DNS fallback variants concurrently before scraping.
+        dns_resolve_concurrency (int): Maximum concurrent DNS lookups.
+        dns_resolve_timeout_seconds (float): Per-lookup DNS timeout; timed-out hosts are still tried by the scraper.
+        dns_fallback_probe_timeout_seconds (float): Timeout of the HEAD request that probes DNS fallback candidates.
         
         input_excel_file_path (str): Path to the input data file.
         input_file_profile_name (str): Name of the input column mapping profile.
@@ -122,6 +172,30 @@ class AppConfig:
         
         log_level (str): Logging level for the file log (e.g., INFO, DEBUG).
         console_log_level (str): Logging level for console output.
+
+        pipeline_max_concurrent_rows (int): Maximum number of input rows processed concurrently.
+        pipeline_execution_mode (str): How rows move through the pipeline: "row" (each row runs
+                                       all stages back-to-back) or "staged" (independent stage
+                                       worker pools connected by bounded queues).
+        pipeline_scrape_workers (int): Number of scrape workers in "staged" mode.
+        pipeline_summarize_workers (int): Number of website-summary LLM workers in "staged" mode.
+        pipeline_extract_workers (int): Number of attribute-extraction LLM workers in "staged" mode.
+        pipeline_insights_workers (int): Number of sales-insights LLM workers in "staged" mode.
+        pipeline_stage_queue_size (int): Maximum number of rows waiting between two stages in "staged" mode.
+        pipeline_checkpoint_enabled (bool): If True, per-row progress is saved to a SQLite checkpoint
+                                            in the run directory so the run can be resumed with --resume.
+        pipeline_deduplicate_domains (bool): If True, rows sharing an input canonical domain are scraped and
+                                             analyzed once; the results are copied to the other rows.
+        scraper_resource_blocking_enabled (bool): Abort heavy resources and tracker requests in browser contexts.
+        scraper_blocked_resource_types (List[str]): Playwright resource types aborted by the blocking profile.
+        scraper_blocked_tracker_domains (List[str]): Third-party tracker domains whose requests are aborted.
+        scraper_resource_blocking_allowlist (List[str]): Per-site exceptions ("domain" or "domain:type1|type2").
+        browser_pool_enabled (bool): If True, scraping uses Chromium browsers shared across rows
+                                     instead of launching one browser per row.
+        browser_pool_size (int): Number of pooled browsers (0 = match the scraping concurrency).
+        browser_pool_max_pages_per_browser (int): Recycle a pooled browser after this many page loads (0 = never).
+        browser_pool_max_memory_mb (int): Recycle a pooled browser when browser processes exceed this
+                                          resident memory in MB (0 = never; requires psutil).
  
         page_type_keywords_about (List[str]): Keywords for 'about' pages.
         page_type_keywords_product_service (List[str]): Keywords for 'product/service' pages.
@@ -215,15 +289,35 @@ class AppConfig:
         self.scraper_max_high_priority_pages_after_limit: int = int(os.getenv('SCRAPER_MAX_HIGH_PRIORITY_PAGES_AFTER_LIMIT', '5'))  # Default to 5
 
         self.scraper_pages_for_summary_count: int = int(os.getenv('SCRAPER_PAGES_FOR_SUMMARY_COUNT', '3'))
+        self.scraper_sitemap_discovery_enabled: bool = os.getenv('SCRAPER_SITEMAP_DISCOVERY_ENABLED', 'True').lower() == 'true'
+        self.scraper_sitemap_seed_count: int = int(os.getenv('SCRAPER_SITEMAP_SEED_COUNT', '10'))
+        self.scraper_sitemap_max_files: int = int(os.getenv('SCRAPER_SITEMAP_MAX_FILES', '5'))
+        self.scraper_sitemap_max_urls: int = int(os.getenv('SCRAPER_SITEMAP_MAX_URLS', '5000'))
+        self.scraper_sitemap_max_bytes: int = int(os.getenv('SCRAPER_SITEMAP_MAX_BYTES', str(20 * 1024 * 1024)))
+        self.scraper_summary_driven_crawl: bool = os.getenv('SCRAPER_SUMMARY_DRIVEN_CRAWL', 'False').lower() == 'true'
  
         # Existing Scraper Settings
         self.max_depth_internal_links: int = int(os.getenv('MAX_DEPTH_INTERNAL_LINKS', '1'))
         scraper_timeout_str = os.getenv('SCRAPER_NETWORKIDLE_TIMEOUT_MS', '3000').split('#')[0].strip().strip('\'"')
         self.scraper_networkidle_timeout_ms: int = int(scraper_timeout_str)
+        self.scraper_adaptive_networkidle_enabled: bool = os.getenv('SCRAPER_ADAPTIVE_NETWORKIDLE_ENABLED', 'True').lower() == 'true'
+        self.scraper_networkidle_learning_pages: int = int(os.getenv('SCRAPER_NETWORKIDLE_LEARNING_PAGES', '2'))
+        self.scraper_http_fast_path_enabled: bool = os.getenv('SCRAPER_HTTP_FAST_PATH_ENABLED', 'True').lower() == 'true'
+        self.scraper_http_min_text_chars: int = int(os.getenv('SCRAPER_HTTP_MIN_TEXT_CHARS', '500'))
+        self.scraper_http_max_connections: int = max(1, int(os.getenv('SCRAPER_HTTP_MAX_CONNECTIONS', '100')))
+        self.scraper_http_max_keepalive_connections: int = max(0, int(os.getenv('SCRAPER_HTTP_MAX_KEEPALIVE_CONNECTIONS', '20')))
+        self.scraper_child_fetch_concurrency: int = max(1, int(os.getenv('SCRAPER_CHILD_FETCH_CONCURRENCY', '1')))
+        self.scraper_max_concurrent_fetches_per_host: int = max(1, int(os.getenv('SCRAPER_MAX_CONCURRENT_FETCHES_PER_HOST', '4')))
+        self.scraper_host_politeness_delay_ms: int = max(0, int(os.getenv('SCRAPER_HOST_POLITENESS_DELAY_MS', '250')))
+        self.scraper_link_validation_concurrency_per_host: int = int(os.getenv('SCRAPER_LINK_VALIDATION_CONCURRENCY_PER_HOST', '6'))
+        self.scraper_in_browser_extraction: bool = os.getenv('SCRAPER_IN_BROWSER_EXTRACTION', 'False').lower() == 'true'
+        self.scraper_html_parser: str = os.getenv('SCRAPER_HTML_PARSER', 'auto')
  
         # --- Output Configuration ---
         self.output_base_dir: str = os.getenv('OUTPUT_BASE_DIR', 'output_data')  # Relative to project root
         self.scraped_content_subdir: str = 'scraped_content'
+        self.scraped_content_store: str = os.getenv('SCRAPED_CONTENT_STORE', 'packed').strip().lower()
+        self.scraped_content_compression: str = os.getenv('SCRAPED_CONTENT_COMPRESSION', 'zstd').strip().lower()
         self.llm_context_subdir: str = 'llm_context'  # Subdirectory for LLM raw responses
         self.filename_company_name_max_len: int = int(os.getenv('FILENAME_COMPANY_NAME_MAX_LEN', '25'))  # Default to 25
         self.filename_url_domain_max_len: int = int(os.getenv('FILENAME_URL_DOMAIN_MAX_LEN', '8'))    # Default to 8
@@ -232,6 +326,11 @@ class AppConfig:
         # --- Robots.txt Handling ---
         self.respect_robots_txt: bool = os.getenv('RESPECT_ROBOTS_TXT', 'True').lower() == 'true'
         self.robots_txt_user_agent: str = os.getenv('ROBOTS_TXT_USER_AGENT', '*')
+        self.robots_cache_ttl_seconds: int = int(os.getenv('ROBOTS_CACHE_TTL_SECONDS', '86400'))
+        self.robots_cache_path: str = os.getenv('ROBOTS_CACHE_PATH', os.path.join('cache', 'robots_cache.json'))
+        self.page_cache_enabled: bool = os.getenv('PAGE_CACHE_ENABLED', 'True').lower() == 'true'
+        self.page_cache_path: str = os.getenv('PAGE_CACHE_PATH', os.path.join('cache', 'page_cache.sqlite'))
+        self.page_cache_ttl_seconds: int = int(os.getenv('PAGE_CACHE_TTL_SECONDS', str(30 * 24 * 3600)))
 
         # --- LLM Configuration ---
         self.gemini_api_key: Optional[str] = os.getenv('GEMINI_API_KEY')
@@ -273,6 +372,20 @@ class AppConfig:
             except ValueError:
                 print(f"Warning: Invalid LLM_TEMPERATURE_SUMMARY value '{llm_temperature_summary_str}'. It will be ignored.")
 
+        # LLM response cache
+        self.llm_cache_enabled: bool = os.getenv('LLM_CACHE_ENABLED', 'True').lower() == 'true'
+        self.llm_cache_mode: str = os.getenv('LLM_CACHE_MODE', 'use').lower()
+        self.llm_cache_path: str = os.getenv('LLM_CACHE_PATH', os.path.join('cache', 'llm_response_cache.sqlite'))
+        self.llm_cache_ttl_seconds: int = int(os.getenv('LLM_CACHE_TTL_SECONDS', str(30 * 24 * 3600)))
+        self.llm_cache_max_entries: int = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '50000'))
+
+        # Async LLM client and rate limiting
+        self.llm_async_client_enabled: bool = os.getenv('LLM_ASYNC_CLIENT_ENABLED', 'True').lower() == 'true'
+        self.llm_rate_limit_rpm: int = int(os.getenv('LLM_RATE_LIMIT_RPM', '300'))
+        self.llm_rate_limit_tpm: int = int(os.getenv('LLM_RATE_LIMIT_TPM', '1000000'))
+        self.llm_rate_limit_cooldown_seconds: float = float(os.getenv('LLM_RATE_LIMIT_COOLDOWN_SECONDS', '10'))
+        self.llm_max_retries: int = int(os.getenv('LLM_MAX_RETRIES', '5'))
+
         # --- Extraction Profiles and Prompt Paths ---
         # --- Extraction Profiles and Prompt Paths ---
         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
@@ -295,6 +408,8 @@ class AppConfig:
         self.prompt_path_homepage_context: str = get_clean_path('PROMPT_PATH_HOMEPAGE_CONTEXT', 'prompts/homepage_context_prompt.txt')
         self.PROMPT_PATH_WEBSITE_SUMMARIZER: str = get_clean_path('PROMPT_PATH_WEBSITE_SUMMARIZER', 'prompts/website_summarizer_prompt.txt')
         self.PROMPT_PATH_ATTRIBUTE_EXTRACTOR: str = get_clean_path('PROMPT_PATH_ATTRIBUTE_EXTRACTOR', 'prompts/attribute_extractor_prompt.txt')
+        self.PROMPT_PATH_SUMMARY_AND_ATTRIBUTES: str = get_clean_path('PROMPT_PATH_SUMMARY_AND_ATTRIBUTES', 'prompts/website_summary_and_attributes_prompt.txt')
+        self.llm_combined_summary_extraction: bool = os.getenv('LLM_COMBINED_SUMMARY_EXTRACTION', 'False').lower() == 'true'
         self.LLM_MAX_INPUT_CHARS_FOR_SUMMARY: int = int(os.getenv('LLM_MAX_INPUT_CHARS_FOR_SUMMARY', '40000'))
         
         # --- Language-Specific Prompt Configuration ---
@@ -305,11 +420,16 @@ class AppConfig:
         else:
             self.PROMPT_PATH_COMPARISON_SALES_LINE: str = get_clean_path('PROMPT_PATH_COMPARISON_SALES_LINE', 'prompts/comparison_sales_line_prompt.txt')
         self.MAX_GOLDEN_PARTNERS_IN_PROMPT: int = int(os.getenv('MAX_GOLDEN_PARTNERS_IN_PROMPT', '10'))
+        self.golden_partner_ranking_enabled: bool = os.getenv('GOLDEN_PARTNER_RANKING_ENABLED', 'True').lower() == 'true'
  
         # --- URL Probing Configuration ---
         url_probing_tlds_str: str = os.getenv('URL_PROBING_TLDS', 'de,com,at,ch')
         self.url_probing_tlds: List[str] = [tld.strip().lower() for tld in url_probing_tlds_str.split(',') if tld.strip()]
         self.enable_dns_error_fallbacks: bool = os.getenv('ENABLE_DNS_ERROR_FALLBACKS', 'True').lower() == 'true'
+        self.dns_preflight_enabled: bool = os.getenv('DNS_PREFLIGHT_ENABLED', 'True').lower() == 'true'
+        self.dns_resolve_concurrency: int = int(os.getenv('DNS_RESOLVE_CONCURRENCY', '64'))
+        self.dns_resolve_timeout_seconds: float = float(os.getenv('DNS_RESOLVE_TIMEOUT_SECONDS', '5'))
+        self.dns_fallback_probe_timeout_seconds: float = float(os.getenv('DNS_FALLBACK_PROBE_TIMEOUT_SECONDS', '5'))
 
         # --- Data Handling & Input Profiling ---
         self.input_excel_file_path: str = os.getenv('INPUT_EXCEL_FILE_PATH', 'data_to_be_inputed.xlsx')  # Relative to project root
@@ -362,6 +482,38 @@ class AppConfig:
                 if raw_row_range != "0":  # "0" is a valid way to say "all rows"
                     print(f"Warning: Invalid ROW_PROCESSING_RANGE value '{raw_row_range}'. Processing all rows.")
         
+        # --- Pipeline Execution Configuration ---
+        self.pipeline_max_concurrent_rows: int = max(1, int(os.getenv('PIPELINE_MAX_CONCURRENT_ROWS', '1')))  # 1 = sequential
+        self.pipeline_execution_mode: str = os.getenv('PIPELINE_EXECUTION_MODE', 'row').strip().lower()  # "row" or "staged"
+        self.pipeline_scrape_workers: int = max(1, int(os.getenv('PIPELINE_SCRAPE_WORKERS', '4')))
+        self.pipeline_summarize_workers: int = max(1, int(os.getenv('PIPELINE_SUMMARIZE_WORKERS', '4')))
+        self.pipeline_extract_workers: int = max(1, int(os.getenv('PIPELINE_EXTRACT_WORKERS', '4')))
+        self.pipeline_insights_workers: int = max(1, int(os.getenv('PIPELINE_INSIGHTS_WORKERS', '4')))
+        self.pipeline_stage_queue_size: int = max(1, int(os.getenv('PIPELINE_STAGE_QUEUE_SIZE', '8')))
+        self.pipeline_checkpoint_enabled: bool = os.getenv('PIPELINE_CHECKPOINT_ENABLED', 'True').lower() == 'true'
+        self.pipeline_deduplicate_domains: bool = os.getenv('PIPELINE_DEDUPLICATE_DOMAINS', 'True').lower() == 'true'
+
+        # --- Resource Blocking Configuration ---
+        self.scraper_resource_blocking_enabled: bool = os.getenv('SCRAPER_RESOURCE_BLOCKING_ENABLED', 'True').lower() == 'true'
+        blocked_resource_types_str: str = os.getenv('SCRAPER_BLOCKED_RESOURCE_TYPES', 'image,media,font,stylesheet')
+        self.scraper_blocked_resource_types: List[str] = [t.strip().lower() for t in blocked_resource_types_str.split(',') if t.strip()]
+        blocked_tracker_domains_str: str = os.getenv(
+            'SCRAPER_BLOCKED_TRACKER_DOMAINS',
+            'google-analytics.com,googletagmanager.com,doubleclick.net,googlesyndication.com,googleadservices.com,'
+            'facebook.net,connect.facebook.net,hotjar.com,clarity.ms,bat.bing.com,snap.licdn.com,ads.linkedin.com,'
+            'hs-analytics.net,hs-scripts.com,hsadspixel.net,matomo.cloud,cookiebot.com,usercentrics.eu,'
+            'onetrust.com,cookielaw.org,trustarc.com,quantserve.com,scorecardresearch.com,criteo.com,taboola.com,outbrain.com'
+        )
+        self.scraper_blocked_tracker_domains: List[str] = [d.strip().lower() for d in blocked_tracker_domains_str.split(',') if d.strip()]
+        resource_blocking_allowlist_str: str = os.getenv('SCRAPER_RESOURCE_BLOCKING_ALLOWLIST', '')
+        self.scraper_resource_blocking_allowlist: List[str] = [e.strip().lower() for e in resource_blocking_allowlist_str.split(',') if e.strip()]
+
+        # --- Browser Pool Configuration ---
+        self.browser_pool_enabled: bool = os.getenv('BROWSER_POOL_ENABLED', 'True').lower() == 'true'
+        self.browser_pool_size: int = max(0, int(os.getenv('BROWSER_POOL_SIZE', '0')))
+        self.browser_pool_max_pages_per_browser: int = max(0, int(os.getenv('BROWSER_POOL_MAX_PAGES_PER_BROWSER', '200')))
+        self.browser_pool_max_memory_mb: int = max(0, int(os.getenv('BROWSER_POOL_MAX_MEMORY_MB', '0')))
+
         # --- Data Handling Enhancements ---
         self.consecutive_empty_rows_to_stop: int = int(os.getenv('CONSECUTIVE_EMPTY_ROWS_TO_STOP', '3'))
 
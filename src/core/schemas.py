@@ -6,7 +6,7 @@ Analyzer application. These schemas ensure data consistency, provide clear
 data structures, and enable validation for inputs and outputs of various
 pipeline components, especially those interacting with LLMs or generating reports.
 """
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Tuple, Union
 from pydantic import BaseModel, Field
 
 
@@ -69,6 +69,42 @@ class DetailedCompanyAttributes(BaseModel):
     company_size_category_inferred: Optional[str] = Field(default=None, description="Inferred company size category (e.g., 'Startup', 'SME', 'Large Enterprise', 'Unknown/Not Specified').")
     innovation_level_indicators_text: Optional[str] = Field(default=None, description="Textual clues about the company's innovation level or focus (e.g., 'uses innovative workshops', 'AI-supported').")
     website_clarity_notes: Optional[str] = Field(default=None, description="Notes on how clearly the business model and target group are communicated on the website, based on the summary.")
+class WebsiteSummaryAndAttributes(BaseModel):
+    """
+    Structures the output of the single LLM call that both summarizes the scraped
+    website text and extracts detailed company attributes (combined mode).
+    Used as the `response_schema` of that call; the URL fields of
+    `WebsiteTextSummary` and `DetailedCompanyAttributes` are filled in programmatically.
+    """
+    summary: str = Field(description="Concise summary of key information from the website: core business, offerings, target audience, business model, technology, USP and mission.")
+    extracted_company_name_from_summary: Optional[str] = Field(default=None, description="Company name as identified from the website content.")
+    key_topics_mentioned: Optional[List[str]] = Field(default_factory=list, description="A list of key topics, services, or products mentioned in the website content.")
+    b2b_indicator: Optional[bool] = Field(default=None, description="True if the company primarily serves other businesses (B2B), False if primarily private customers (B2C), null if unclear.")
+    phone_outreach_suitability: Optional[bool] = Field(default=None, description="True if the company's product/service seems suitable for telephone-based acquisition, False otherwise, null if unclear.")
+    target_group_size_assessment: Optional[str] = Field(default=None, description="Qualitative assessment of potential callable target group size (e.g., 'Appears Small', 'Appears Medium', 'Appears Large / >=500 potential', 'Unknown').")
+    industry: Optional[str] = Field(default=None, description="Primary industry of the company.")
+    products_services_offered: Optional[List[str]] = Field(default_factory=list, description="List of key products or services offered.")
+    usp_key_selling_points: Optional[List[str]] = Field(default_factory=list, description="Unique Selling Propositions or key selling points highlighted.")
+    customer_target_segments: Optional[List[str]] = Field(default_factory=list, description="Specific customer segments targeted by the company.")
+    business_model: Optional[str] = Field(default=None, description="Description of the company's business model (e.g., 'Service-oriented; Project-based consulting', 'SaaS').")
+    company_size_indicators_text: Optional[str] = Field(default=None, description="Textual clues or indicators about company size (e.g., 'mentions large enterprise clients', 'startup phase').")
+    company_size_category_inferred: Optional[str] = Field(default=None, description="Inferred company size category (e.g., 'Startup', 'SME', 'Large Enterprise', 'Unknown/Not Specified').")
+    innovation_level_indicators_text: Optional[str] = Field(default=None, description="Textual clues about the company's innovation level or focus (e.g., 'uses innovative workshops', 'AI-supported').")
+    website_clarity_notes: Optional[str] = Field(default=None, description="Notes on how clearly the business model and target group are communicated on the website.")
+
+    def to_summary_and_attributes(self, original_url: str) -> Tuple[WebsiteTextSummary, DetailedCompanyAttributes]:
+        """Splits the combined output into the objects produced by the separate summary and extraction calls."""
+        summary_fields = set(WebsiteTextSummary.model_fields) - {"original_url"}
+        attribute_fields = set(DetailedCompanyAttributes.model_fields) - {"input_summary_url"}
+        data = self.model_dump()
+        website_summary = WebsiteTextSummary(
+            original_url=original_url, **{k: v for k, v in data.items() if k in summary_fields}
+        )
+        detailed_attributes = DetailedCompanyAttributes(
+            input_summary_url=original_url, **{k: v for k, v in data.items() if k in attribute_fields}
+        )
+        return website_summary, detailed_attributes
+
 class GoldenPartnerMatchOutput(BaseModel):
     """
     Structures the output of an LLM call that includes comparison
@@ -0,0 +1,122 @@
+"""
+Local pre-ranking of golden partners for the sales-insights prompt.
+
+Sending every golden partner summary to the LLM in every sales-insights call
+costs thousands of prompt tokens per row, although only a handful of partners
+are plausible matches for a given company. `GoldenPartnerRanker` builds a
+hashed TF-IDF vector for each partner summary once per run and ranks partners
+by cosine similarity to the target company's `DetailedCompanyAttributes`, so
+the prompt only needs to include the top `MAX_GOLDEN_PARTNERS_IN_PROMPT`
+candidates.
+
+Tokens are hashed into a fixed number of buckets (CRC32, stable across runs),
+which avoids keeping a vocabulary and keeps the partner matrix small.
+"""
+import logging
+import math
+import re
+import zlib
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..core.schemas import DetailedCompanyAttributes
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_PATTERN = re.compile(r"[^\W\d_]{3,}", re.UNICODE)
+DEFAULT_HASH_FEATURES = 2 ** 14
+
+
+def _tokenize(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def _hashed_term_counts(text: str, n_features: int) -> np.ndarray:
+    """Returns sublinear (1 + log tf) term weights of `text`, hashed into `n_features` buckets."""
+    counts = np.zeros(n_features, dtype=np.float64)
+    for token in _tokenize(text):
+        counts[zlib.crc32(token.encode("utf-8")) % n_features] += 1.0
+    nonzero = counts > 0
+    counts[nonzero] = 1.0 + np.log(counts[nonzero])
+    return counts
+
+
+def partner_text_for_ranking(partner_summary: Dict[str, Any]) -> str:
+    """Returns the text of a `summarize_golden_partner` output that is used for ranking."""
+    return f"{partner_summary.get('name', '')} {partner_summary.get('summary', '')}"
+
+
+def attributes_text_for_ranking(attributes: DetailedCompanyAttributes) -> str:
+    """Returns the descriptive text of a target company's attributes that is used for ranking."""
+    parts: List[str] = [
+        attributes.industry or "",
+        " ".join(attributes.products_services_offered or []),
+        " ".join(attributes.usp_key_selling_points or []),
+        " ".join(attributes.customer_target_segments or []),
+        attributes.business_model or "",
+        attributes.company_size_category_inferred or "",
+        attributes.innovation_level_indicators_text or "",
+    ]
+    return " ".join(part for part in parts if part)
+
+
+class GoldenPartnerRanker:
+    """Ranks golden partner summaries by hashed TF-IDF cosine similarity to a target company."""
+
+    def __init__(self, partner_summaries: List[Dict[str, Any]], n_features: int = DEFAULT_HASH_FEATURES):
+        """
+        Builds the partner matrix. Call once per run.
+
+        Args:
+            partner_summaries (List[Dict[str, Any]]): Outputs of `summarize_golden_partner`.
+            n_features (int): Number of hash buckets for the term vectors.
+        """
+        self.partner_summaries = partner_summaries
+        self.n_features = n_features
+        term_weights = np.vstack([
+            _hashed_term_counts(partner_text_for_ranking(summary), n_features) for summary in partner_summaries
+        ]) if partner_summaries else np.zeros((0, n_features))
+
+        # Smoothed IDF over the partner corpus, as in scikit-learn's TfidfVectorizer.
+        document_frequency = (term_weights > 0).sum(axis=0)
+        self._idf = np.log((1 + len(partner_summaries)) / (1 + document_frequency)) + 1.0
+        self._partner_matrix = self._normalize(term_weights * self._idf)
+        logger.info(f"GoldenPartnerRanker built for {len(partner_summaries)} partners ({n_features} hash features).")
+
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def score(self, target_attributes: DetailedCompanyAttributes) -> np.ndarray:
+        """Returns the cosine similarity of every partner to the target company."""
+        target_vector = _hashed_term_counts(attributes_text_for_ranking(target_attributes), self.n_features) * self._idf
+        return self._partner_matrix @ self._normalize(target_vector)
+
+    def top_k(self, target_attributes: DetailedCompanyAttributes, k: Optional[int]) -> List[Dict[str, Any]]:
+        """
+        Returns the `k` partner summaries most similar to the target company, best match first.
+
+        All partners are returned (in their original order) if `k` is not positive, is at
+        least the number of partners, or the target has no descriptive text to rank on.
+        """
+        if not k or k <= 0 or k >= len(self.partner_summaries):
+            return list(self.partner_summaries)
+        if not attributes_text_for_ranking(target_attributes).strip():
+            return list(self.partner_summaries)
+        similarities = self.score(target_attributes)
+        # Stable sort keeps the original partner order among equal scores.
+        ranked_indices = np.argsort(-similarities, kind="stable")[:k]
+        return [self.partner_summaries[i] for i in ranked_indices]
+
+
+def estimate_prompt_tokens_saved(prompt_tokens: int, included_chars: int, omitted_chars: int) -> int:
+    """
+    Estimates the prompt tokens saved by omitting `omitted_chars` characters of partner text,
+    scaling the prompt's measured token count by the characters-per-token ratio of the prompt.
+    """
+    if prompt_tokens <= 0 or included_chars <= 0 or omitted_chars <= 0:
+        return 0
+    return int(math.floor(prompt_tokens * omitted_chars / included_chars))
@@ -21,7 +21,7 @@ from ...utils.llm_processing_helpers import (
 
 logger = logging.getLogger(__name__)
 
-def extract_detailed_attributes(
+async def extract_detailed_attributes(
     gemini_client: GeminiClient,
     config: AppConfig,
     summary_obj: WebsiteTextSummary,
@@ -153,7 +153,7 @@ def extract_detailed_attributes(
         logger.error(f"{log_prefix} Failed to save request payload artifact: {e_save_payload}", exc_info=True)
     raw_llm_response_str_current_call: Optional[str] = None
     try:
-        response = gemini_client.generate_content_with_retry(
+        response = await gemini_client.generate_content_async(
             contents=contents_for_api,
             generation_config=generation_config,
             system_instruction=system_instruction_text,
@@ -173,6 +173,8 @@ def extract_detailed_attributes(
                 token_stats["total_tokens"] = response.usage_metadata.total_token_count or 0
             else:
                 logger.warning(f"{log_prefix} LLM usage metadata not found or incomplete in response.")
+
+            gemini_client.record_cache_stats(response, token_stats)
             
             logger.info(f"{log_prefix} LLM usage: {token_stats}")
             if raw_llm_response_str_current_call:
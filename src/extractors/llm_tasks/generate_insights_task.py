@@ -12,6 +12,7 @@ from pydantic import ValidationError as PydanticValidationError
 
 from ...core.config import AppConfig
 from ...core.schemas import DetailedCompanyAttributes, GoldenPartnerMatchOutput, WebsiteTextSummary
+from ...data_handling.partner_ranker import GoldenPartnerRanker, estimate_prompt_tokens_saved
 from ...utils.helpers import sanitize_filename_component
 from ...llm_clients.gemini_client import GeminiClient
 from ...utils.llm_processing_helpers import (
@@ -22,7 +23,7 @@ from ...utils.llm_processing_helpers import (
 
 logger = logging.getLogger(__name__)
 
-def generate_sales_insights(
+async def generate_sales_insights(
     gemini_client: GeminiClient,
     config: AppConfig,
     target_attributes: DetailedCompanyAttributes,
@@ -32,7 +33,8 @@ def generate_sales_insights(
     llm_requests_dir: str,
     file_identifier_prefix: str,
     triggering_input_row_id: Any,
-    triggering_company_name: str
+    triggering_company_name: str,
+    partner_ranker: Optional[GoldenPartnerRanker] = None
 ) -> Tuple[Optional[GoldenPartnerMatchOutput], Optional[str], Optional[Dict[str, int]]]:
     """
     Generates sales insights by comparing target company attributes with golden partner summaries using an LLM.
@@ -50,6 +52,8 @@ def generate_sales_insights(
         file_identifier_prefix: Prefix for naming saved artifact files.
         triggering_input_row_id: Identifier of the original input data row.
         triggering_company_name: The name of the company being analyzed.
+        partner_ranker: If given, only the `config.MAX_GOLDEN_PARTNERS_IN_PROMPT` partners
+                        most similar to `target_attributes` are included in the prompt.
 
     Returns:
         A tuple containing:
@@ -76,7 +80,15 @@ def generate_sales_insights(
 
         target_attributes_json = target_attributes.model_dump_json(indent=2)
 
-        partner_summaries_str = "\n".join([f"{i+1}. {json.dumps(summary)}" for i, summary in enumerate(golden_partner_summaries)])
+        prompt_partner_summaries = golden_partner_summaries
+        if partner_ranker is not None:
+            prompt_partner_summaries = partner_ranker.top_k(target_attributes, config.MAX_GOLDEN_PARTNERS_IN_PROMPT)
+        partner_summaries_str = "\n".join([f"{i+1}. {json.dumps(summary)}" for i, summary in enumerate(prompt_partner_summaries)])
+        omitted_partner_chars = 0
+        if len(prompt_partner_summaries) < len(golden_partner_summaries):
+            all_partner_summaries_str = "\n".join([f"{i+1}. {json.dumps(summary)}" for i, summary in enumerate(golden_partner_summaries)])
+            omitted_partner_chars = len(all_partner_summaries_str) - len(partner_summaries_str)
+            logger.info(f"{log_prefix} Including {len(prompt_partner_summaries)} of {len(golden_partner_summaries)} golden partners in prompt (top-ranked).")
 
         formatted_prompt = prompt_template.replace("{{TARGET_COMPANY_ATTRIBUTES_JSON_PLACEHOLDER}}", target_attributes_json)
         formatted_prompt = formatted_prompt.replace("{{GOLDEN_PARTNER_SUMMARIES_PLACEHOLDER}}", partner_summaries_str)
@@ -167,7 +179,7 @@ def generate_sales_insights(
 
     raw_llm_response_str_current_call: Optional[str] = None
     try:
-        response = gemini_client.generate_content_with_retry(
+        response = await gemini_client.generate_content_async(
             contents=contents_for_api,
             generation_config=generation_config,
             system_instruction=system_instruction_text,
@@ -189,6 +201,18 @@ def generate_sales_insights(
                 token_stats["total_tokens"] = response.usage_metadata.total_token_count or 0
             else:
                 logger.warning(f"{log_prefix} LLM usage metadata not found or incomplete in response.")
+
+            cache_status = gemini_client.record_cache_stats(response, token_stats)
+
+            if omitted_partner_chars:
+                measured_prompt_tokens = token_stats["prompt_tokens"]
+                if cache_status == "hit":
+                    measured_prompt_tokens = response.cached_usage.get("prompt_tokens", 0)
+                token_stats["partners_in_prompt"] = len(prompt_partner_summaries)
+                token_stats["partners_omitted"] = len(golden_partner_summaries) - len(prompt_partner_summaries)
+                token_stats["partner_prompt_tokens_saved"] = estimate_prompt_tokens_saved(
+                    measured_prompt_tokens, len(formatted_prompt), omitted_partner_chars
+                )
             
             logger.info(f"{log_prefix} LLM usage: {token_stats}")
 
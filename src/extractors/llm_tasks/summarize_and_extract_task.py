@@ -0,0 +1,246 @@
+"""
+Handles the combined LLM task of summarizing website text and extracting
+detailed company attributes in a single structured-output call.
+"""
+import logging
+import json
+from typing import Dict, Any, List, Tuple, Optional
+
+import google.generativeai.types as genai_types
+from google.api_core import exceptions as google_exceptions
+from pydantic import ValidationError as PydanticValidationError
+
+from ...core.config import AppConfig
+from ...core.schemas import WebsiteTextSummary, DetailedCompanyAttributes, WebsiteSummaryAndAttributes
+from ...utils.helpers import sanitize_filename_component
+from ...llm_clients.gemini_client import GeminiClient
+from ...utils.llm_processing_helpers import (
+    load_prompt_template,
+    save_llm_artifact,
+    extract_json_from_text,
+    adapt_schema_for_gemini,
+)
+
+logger = logging.getLogger(__name__)
+
+async def generate_summary_and_attributes(
+    gemini_client: GeminiClient,
+    config: AppConfig,
+    original_url: str,
+    scraped_text: str,
+    llm_context_dir: str,
+    llm_requests_dir: str,
+    file_identifier_prefix: str,
+    triggering_input_row_id: Any,
+    triggering_company_name: str
+) -> Tuple[Optional[WebsiteTextSummary], Optional[DetailedCompanyAttributes], Optional[str], Optional[Dict[str, int]]]:
+    """
+    Generates a website summary and detailed company attributes with one LLM call.
+
+    The call requests `application/json` output constrained by a response schema
+    derived from `WebsiteSummaryAndAttributes`, so the response is parsed directly
+    instead of being recovered from free text.
+
+    Args:
+        gemini_client: The Gemini client for API interactions.
+        config: The application configuration object (`AppConfig`).
+        original_url: The original URL from which the text was scraped. It is
+                      stored on both output objects.
+        scraped_text: The text content scraped from one or more pages of the website.
+        llm_context_dir: Directory to save LLM interaction artifacts.
+        llm_requests_dir: Directory to save LLM request payloads.
+        file_identifier_prefix: Prefix for naming saved artifact files.
+        triggering_input_row_id: Identifier of the original input data row.
+        triggering_company_name: The name of the company.
+
+    Returns:
+        A tuple containing:
+        - `website_summary`: A `WebsiteTextSummary` if successful, otherwise `None`.
+        - `detailed_attributes`: A `DetailedCompanyAttributes` if successful, otherwise `None`.
+        - `raw_llm_response_str`: The raw text response from the LLM or an error message.
+        - `token_stats`: A dictionary with token usage statistics.
+    """
+    log_prefix = f"[{file_identifier_prefix}, RowID: {triggering_input_row_id}, Company: {triggering_company_name}, Type: SummaryAndAttributes]"
+    logger.info(f"{log_prefix} Starting combined website summarization and attribute extraction.")
+
+    raw_llm_response_str: Optional[str] = None
+    token_stats: Dict[str, int] = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    prompt_template_path: str = "Path not initialized"
+
+    try:
+        if not config.PROMPT_PATH_SUMMARY_AND_ATTRIBUTES:
+            logger.error(f"{log_prefix} AppConfig.PROMPT_PATH_SUMMARY_AND_ATTRIBUTES is not set.")
+            return None, None, "Error: PROMPT_PATH_SUMMARY_AND_ATTRIBUTES not configured.", token_stats
+        prompt_template_path = config.PROMPT_PATH_SUMMARY_AND_ATTRIBUTES
+        prompt_template = load_prompt_template(prompt_template_path)
+
+        max_chars = config.LLM_MAX_INPUT_CHARS_FOR_SUMMARY
+        if len(scraped_text) > max_chars:
+            logger.warning(f"{log_prefix} Truncating scraped_text from {len(scraped_text)} to {max_chars} chars.")
+            text_for_prompt = scraped_text[:max_chars]
+        else:
+            text_for_prompt = scraped_text
+
+        formatted_prompt = prompt_template.replace("{{SCRAPED_WEBSITE_TEXT_PLACEHOLDER}}", text_for_prompt)
+
+    except FileNotFoundError:
+        logger.error(f"{log_prefix} Prompt template file not found: {prompt_template_path}")
+        return None, None, f"Error: Prompt template file not found: {prompt_template_path}", token_stats
+    except AttributeError as e_attr:
+        logger.error(f"{log_prefix} Configuration error: {e_attr}")
+        return None, None, f"Error: Configuration error - {str(e_attr)}", token_stats
+    except Exception as e:
+        logger.error(f"{log_prefix} Failed to load/format combined summary/attributes prompt: {e}", exc_info=True)
+        return None, None, f"Error: Failed to load/format prompt - {str(e)}", token_stats
+
+    s_file_id_prefix = sanitize_filename_component(file_identifier_prefix, max_len=15)
+    s_row_id = sanitize_filename_component(str(triggering_input_row_id), max_len=8)
+    s_comp_name = sanitize_filename_component(triggering_company_name, max_len=config.filename_company_name_max_len if config.filename_company_name_max_len is not None and config.filename_company_name_max_len <= 20 else 20)
+
+    prompt_filename_base = f"{s_file_id_prefix}_rid{s_row_id}_comp{s_comp_name}"
+    prompt_filename_with_suffix = f"{prompt_filename_base}_summary_attributes_prompt.txt"
+    try:
+        save_llm_artifact(
+            content=formatted_prompt,
+            directory=llm_context_dir,
+            filename=prompt_filename_with_suffix,
+            log_prefix=log_prefix
+        )
+    except Exception as e_save_prompt:
+         logger.error(f"{log_prefix} Failed to save formatted prompt artifact '{prompt_filename_with_suffix}': {e_save_prompt}", exc_info=True)
+
+    try:
+        max_tokens_val = config.llm_max_tokens_summary if config.llm_max_tokens_summary is not None else config.llm_max_tokens
+        response_schema = adapt_schema_for_gemini(WebsiteSummaryAndAttributes)
+
+        generation_config_dict = {
+            "response_mime_type": "application/json",
+            "response_schema": response_schema,
+            "candidate_count": 1,
+            "max_output_tokens": max_tokens_val,
+            "temperature": config.llm_temperature_extraction,
+        }
+        if config.llm_top_k is not None:
+            generation_config_dict["top_k"] = config.llm_top_k
+        if config.llm_top_p is not None:
+            generation_config_dict["top_p"] = config.llm_top_p
+
+        generation_config = genai_types.GenerationConfig(**generation_config_dict)
+    except AttributeError as e_attr_config:
+        logger.error(f"{log_prefix} Configuration error for generation_config: {e_attr_config}")
+        return None, None, f"Error: Configuration error for generation_config - {str(e_attr_config)}", token_stats
+    except Exception as e_gen_config:
+        logger.error(f"{log_prefix} Error creating generation_config: {e_gen_config}", exc_info=True)
+        return None, None, f"Error: Creating generation_config - {str(e_gen_config)}", token_stats
+
+    system_instruction_text = (
+        "You are a data extraction and summarization assistant. Your entire response MUST be a single, "
+        "valid JSON object conforming to the provided response schema. Use `null` for optional fields "
+        "if the information is not present in the text. Ensure the summary is concise and captures key information."
+    )
+
+    contents_for_api: List[genai_types.ContentDict] = [
+        {"role": "user", "parts": [{"text": formatted_prompt}]}
+    ]
+
+    request_payload_to_log = {
+        "model_name": config.llm_model_name,
+        "system_instruction": system_instruction_text,
+        "user_contents": contents_for_api,
+        "generation_config": generation_config_dict
+    }
+    request_payload_filename = f"{prompt_filename_base}_summary_attributes_request_payload.json"
+    try:
+        save_llm_artifact(
+            content=json.dumps(request_payload_to_log, indent=2),
+            directory=llm_requests_dir,
+            filename=request_payload_filename,
+            log_prefix=log_prefix
+        )
+    except Exception as e_save_payload:
+        logger.error(f"{log_prefix} Failed to save request payload artifact: {e_save_payload}", exc_info=True)
+
+    raw_llm_response_str_current_call: Optional[str] = None
+    try:
+        response = await gemini_client.generate_content_async(
+            contents=contents_for_api,
+            generation_config=generation_config,
+            system_instruction=system_instruction_text,
+            file_identifier_prefix=file_identifier_prefix,
+            triggering_input_row_id=triggering_input_row_id,
+            triggering_company_name=triggering_company_name
+        )
+
+        if not response:
+            logger.error(f"{log_prefix} No response object returned from GeminiClient for combined summary/attributes.")
+            return None, None, "Error: No response object from GeminiClient.", token_stats
+
+        try:
+            raw_llm_response_str_current_call = response.text
+        except Exception as e_text_access:
+            logger.error(f"{log_prefix} Error accessing response.text: {e_text_access}", exc_info=True)
+            raw_llm_response_str_current_call = f"Error accessing response text: {str(e_text_access)}"
+
+        if hasattr(response, 'usage_metadata') and response.usage_metadata:
+            token_stats["prompt_tokens"] = response.usage_metadata.prompt_token_count or 0
+            token_stats["completion_tokens"] = response.usage_metadata.candidates_token_count or 0
+            token_stats["total_tokens"] = response.usage_metadata.total_token_count or 0
+        else:
+            logger.warning(f"{log_prefix} LLM usage metadata not found or incomplete in response.")
+
+        gemini_client.record_cache_stats(response, token_stats)
+
+        logger.info(f"{log_prefix} LLM usage: {token_stats}")
+
+        if raw_llm_response_str_current_call:
+            try:
+                save_llm_artifact(
+                    content=raw_llm_response_str_current_call,
+                    directory=llm_context_dir,
+                    filename=f"{prompt_filename_base}_summary_attributes_response.txt",
+                    log_prefix=log_prefix
+                )
+            except Exception as e_save_resp:
+                logger.error(f"{log_prefix} Failed to save raw LLM response artifact: {e_save_resp}", exc_info=True)
+
+        raw_llm_response_str = raw_llm_response_str_current_call
+        if not response.candidates:
+            logger.warning(f"{log_prefix} No candidates in Gemini response for combined summary/attributes. Raw: '{raw_llm_response_str[:200] if raw_llm_response_str else 'N/A'}'")
+            return None, None, raw_llm_response_str, token_stats
+        if not raw_llm_response_str or not raw_llm_response_str.strip():
+            logger.warning(f"{log_prefix} LLM response text is empty or whitespace only.")
+            return None, None, raw_llm_response_str, token_stats
+
+        try:
+            parsed_json_object = json.loads(raw_llm_response_str)
+        except json.JSONDecodeError:
+            # Structured output should be plain JSON; fall back to extraction for wrapped responses.
+            json_string_from_text = extract_json_from_text(raw_llm_response_str)
+            if not json_string_from_text:
+                logger.error(f"{log_prefix} Failed to extract JSON from combined summary/attributes response. Raw: '{raw_llm_response_str[:500]}'")
+                return None, None, raw_llm_response_str, token_stats
+            parsed_json_object = json.loads(json_string_from_text)
+
+        combined_output = WebsiteSummaryAndAttributes(**parsed_json_object)
+        website_summary, detailed_attributes = combined_output.to_summary_and_attributes(original_url)
+        logger.info(f"{log_prefix} Successfully parsed and validated combined WebsiteTextSummary and DetailedCompanyAttributes.")
+        return website_summary, detailed_attributes, raw_llm_response_str, token_stats
+
+    except google_exceptions.GoogleAPIError as e_api:
+        logger.error(f"{log_prefix} Gemini API error during combined summary/attributes generation: {e_api}", exc_info=True)
+        error_msg = getattr(e_api, 'message', str(e_api))
+        raw_llm_response_str = json.dumps({"error": f"Gemini API error: {error_msg}", "type": type(e_api).__name__})
+        return None, None, raw_llm_response_str, token_stats
+    except json.JSONDecodeError as e_json:
+        logger.error(f"{log_prefix} Failed to parse JSON for combined summary/attributes: {e_json}. Raw: '{raw_llm_response_str_current_call[:200] if raw_llm_response_str_current_call else 'N/A'}'")
+        return None, None, raw_llm_response_str_current_call, token_stats
+    except PydanticValidationError as e_pydantic:
+        logger.error(f"{log_prefix} Pydantic validation failed for WebsiteSummaryAndAttributes: {e_pydantic}. Raw: '{raw_llm_response_str_current_call[:500] if raw_llm_response_str_current_call else 'N/A'}'")
+        return None, None, raw_llm_response_str_current_call, token_stats
+    except Exception as e_gen:
+        logger.error(f"{log_prefix} Unexpected error during combined summary/attributes generation: {e_gen}", exc_info=True)
+        if raw_llm_response_str_current_call:
+            raw_llm_response_str = raw_llm_response_str_current_call
+        else:
+            raw_llm_response_str = json.dumps({"error": f"Unexpected error: {str(e_gen)}", "type": type(e_gen).__name__})
+        return None, None, raw_llm_response_str, token_stats
@@ -21,7 +21,7 @@ from ...utils.llm_processing_helpers import (
 
 logger = logging.getLogger(__name__)
 
-def generate_website_summary(
+async def generate_website_summary(
     gemini_client: GeminiClient,
     config: AppConfig,
     original_url: str,
@@ -175,7 +175,7 @@ def generate_website_summary(
 
     raw_llm_response_str_current_call: Optional[str] = None
     try:
-        response = gemini_client.generate_content_with_retry(
+        response = await gemini_client.generate_content_async(
             contents=contents_for_api,
             generation_config=generation_config,
             system_instruction=system_instruction_text,
@@ -198,6 +198,8 @@ def generate_website_summary(
                 token_stats["total_tokens"] = response.usage_metadata.total_token_count or 0
             else:
                 logger.warning(f"{log_prefix} LLM usage metadata not found or incomplete in response.")
+
+            gemini_client.record_cache_stats(response, token_stats)
             
             logger.info(f"{log_prefix} LLM usage: {token_stats}")
 
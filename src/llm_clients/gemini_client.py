@@ -11,18 +11,28 @@ Key functionalities include:
 - Generation of content using specified models, prompts, and generation parameters.
 - Automatic retries for retryable API exceptions.
 - Support for overriding default model names and providing system instructions.
+- `AsyncGeminiClient`, an async variant for concurrent callers with per-model
+  requests/tokens-per-minute rate limiting (see `rate_limiter.py`).
+- Optional persistent caching of responses (see `response_cache.py`), so re-runs
+  with unchanged prompts are served from disk instead of calling the API.
 """
+import asyncio
 import logging
-from typing import Optional, Any, Union, Iterable
+import threading
+from typing import Optional, Any, Dict, Union, Iterable, Tuple
 
 from google.generativeai.client import configure # Specific import for configure
 from google.generativeai.generative_models import GenerativeModel # Specific import for GenerativeModel
 from google.generativeai import types as genai_types # Explicitly alias types
 from google.api_core import exceptions as google_api_core_exceptions
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from tenacity import AsyncRetrying, retry, stop_after_attempt, wait_exponential, wait_random_exponential, retry_if_exception_type
 
 # AppConfig is located in src/core/config.py, so use a relative import
 from ..core.config import AppConfig
+from .rate_limiter import RateLimiterRegistry
+from .response_cache import (
+    CACHE_MODE_BYPASS, CACHE_MODE_USE, CACHE_MODES, CachedGeminiResponse, LLMResponseCache, build_cache_key
+)
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +79,58 @@ class GeminiClient:
             logger.error(f"GeminiClient: Failed during configure: {e}", exc_info=True)
             raise RuntimeError(f"Failed to configure Gemini client with API key: {e}") from e
 
+        # GenerativeModel instances are reused per (model name, system instruction).
+        self._models: Dict[Tuple[str, Optional[str]], GenerativeModel] = {}
+        self._models_lock = threading.Lock()
+
+        self.cache_mode: str = (self.config.llm_cache_mode or CACHE_MODE_USE).lower()
+        if self.cache_mode not in CACHE_MODES:
+            logger.warning(f"GeminiClient: Unknown LLM cache mode '{self.cache_mode}'. Falling back to '{CACHE_MODE_USE}'.")
+            self.cache_mode = CACHE_MODE_USE
+        self.response_cache: Optional[LLMResponseCache] = None
+        if self.config.llm_cache_enabled and self.cache_mode != CACHE_MODE_BYPASS:
+            try:
+                self.response_cache = LLMResponseCache(
+                    db_path=self.config.llm_cache_path,
+                    ttl_seconds=self.config.llm_cache_ttl_seconds,
+                    max_entries=self.config.llm_cache_max_entries
+                )
+                logger.info(f"GeminiClient: LLM response cache enabled (mode: {self.cache_mode}).")
+            except Exception as e:
+                logger.error(f"GeminiClient: Could not open LLM response cache at {self.config.llm_cache_path}: {e}. Continuing without cache.")
+                self.response_cache = None
+
+    def cache_status_for(self, response: Any) -> Optional[str]:
+        """
+        Returns "hit" if `response` was served from the response cache, "miss" if the
+        cache is active but the response came from the API, or None if caching is off.
+        """
+        if isinstance(response, CachedGeminiResponse):
+            return "hit"
+        if self.response_cache is not None:
+            return "miss"
+        return None
+
+    def record_cache_stats(self, response: Any, token_stats: Dict[str, Any]) -> Optional[str]:
+        """
+        Adds the response cache outcome of `response` to a task's `token_stats`
+        ("cache_hits" and "cached_total_tokens", or "cache_misses").
+        Returns the status from `cache_status_for`.
+        """
+        cache_status = self.cache_status_for(response)
+        if cache_status == "hit":
+            token_stats["cache_hits"] = 1
+            token_stats["cached_total_tokens"] = response.cached_usage.get("total_tokens", 0)
+        elif cache_status == "miss":
+            token_stats["cache_misses"] = 1
+        return cache_status
+
+    def close(self) -> None:
+        """Releases resources held by the client (the response cache, if open)."""
+        if self.response_cache is not None:
+            self.response_cache.close()
+            self.response_cache = None
+
     @retry(
         stop=stop_after_attempt(3),  # Total 3 attempts: 1 initial + 2 retries
         wait=wait_exponential(multiplier=1, min=2, max=10),  # Waits 2s, then 4s (max wait 10s between retries)
@@ -84,7 +146,7 @@ class GeminiClient:
         triggering_company_name: str,
         model_name_override: Optional[str] = None,
         system_instruction: Optional[str] = None  # New parameter
-    ) -> genai_types.GenerateContentResponse: # Use aliased types
+    ) -> Union[genai_types.GenerateContentResponse, CachedGeminiResponse]: # Use aliased types
         """
         Generates content using the Gemini API with retry logic.
 
@@ -92,6 +154,11 @@ class GeminiClient:
         model instantiation and incorporating retry mechanisms for transient errors
         as defined in `RETRYABLE_GEMINI_EXCEPTIONS`.
 
+        When the response cache is enabled, a cached response for the same model,
+        system instruction, contents and generation config is returned instead of
+        calling the API (in "use" mode), and successful API responses are stored
+        (in "use" and "refresh" modes).
+
         Args:
             contents (Union[str, Iterable[genai_types.ContentDict]]): The prompt or content to send to the model.
                 This can be a simple string for a basic prompt, or an iterable of
@@ -122,6 +189,8 @@ class GeminiClient:
         Returns:
             genai_types.GenerateContentResponse: The raw response object from the Gemini API,
                 containing the generated content, prompt feedback, and other metadata.
+                On a cache hit, a `CachedGeminiResponse` exposing the same attributes
+                (with zero billed tokens in `usage_metadata`).
 
         Raises:
             google_api_core_exceptions.GoogleAPIError: If the API call fails after all retries
@@ -129,47 +198,264 @@ class GeminiClient:
             ValueError: If no LLM model name is available (neither in `AppConfig` nor as an override).
             Exception: For other unexpected errors during the API call.
         """
-        effective_model_name = model_name_override if model_name_override else self.config.llm_model_name
-        if not effective_model_name:
-            log_err_context = f"[{file_identifier_prefix}, RowID: {triggering_input_row_id}, Company: {triggering_company_name}]"
-            logger.error(f"{log_err_context} No LLM model name configured in AppConfig or provided via model_name_override.")
-            raise ValueError("LLM model name must be configured or provided as an override.")
-
-        # The client.models.generate_content() expects model names like "models/gemini-pro".
-        # Ensure the "models/" prefix is present.
-        if not effective_model_name.startswith("models/"):
-            qualified_model_name = f"models/{effective_model_name}"
-        else:
-            qualified_model_name = effective_model_name
-
+        qualified_model_name = self._qualify_model_name(
+            model_name_override, file_identifier_prefix, triggering_input_row_id, triggering_company_name
+        )
         log_context = f"[{file_identifier_prefix}, RowID: {triggering_input_row_id}, Company: {triggering_company_name}, Model: {qualified_model_name}]"
 
+        cache_key, cached_response = self._lookup_cache(qualified_model_name, system_instruction, contents, generation_config, log_context)
+        if cached_response is not None:
+            return cached_response
+
         logger.info(f"{log_context} Attempting Gemini API call with GenerativeModel('{qualified_model_name}').generate_content")
         
         try:
-            # Instantiate the model directly
-            model = GenerativeModel(
-                model_name=qualified_model_name,
-                system_instruction=system_instruction # Pass system_instruction
-            )
+            model = self._get_model(qualified_model_name, system_instruction)
             response = model.generate_content(
                 contents=contents,
                 generation_config=generation_config
                 # safety_settings can be added here if needed, e.g., from AppConfig
             )
-            
-            # Log if the content was blocked or if there are no candidates.
-            if response and response.prompt_feedback and response.prompt_feedback.block_reason:
-                logger.warning(f"{log_context} Gemini content generation was blocked. Reason: {response.prompt_feedback.block_reason.name}. This is typically not retried by network-level retries.")
-            
-            if not response.candidates:
-                 logger.warning(f"{log_context} Gemini API call returned no candidates. This might be due to safety filters or other reasons. Review response.prompt_feedback if available. Full response parts: {len(response.parts) if response.parts else 'N/A'}")
-
-            logger.info(f"{log_context} Gemini API call successful.")
+            self._log_response_outcome(response, log_context)
+            if cache_key is not None:
+                self._store_in_cache(cache_key, qualified_model_name, response, log_context)
             return response
         except google_api_core_exceptions.GoogleAPIError as api_error:
             logger.error(f"{log_context} Gemini API error: {api_error}", exc_info=True)
             raise # Handled by tenacity for retries or reraised if non-retryable/exhausted.
         except Exception as e:
             logger.error(f"{log_context} Unexpected error during Gemini API call: {e}", exc_info=True)
-            raise
\ No newline at end of file
+            raise
+
+    async def generate_content_async(
+        self,
+        contents: Union[str, Iterable[genai_types.ContentDict]],
+        generation_config: genai_types.GenerationConfig,
+        file_identifier_prefix: str,
+        triggering_input_row_id: Any,
+        triggering_company_name: str,
+        model_name_override: Optional[str] = None,
+        system_instruction: Optional[str] = None
+    ) -> Union[genai_types.GenerateContentResponse, CachedGeminiResponse]:
+        """
+        Awaitable version of `generate_content_with_retry`.
+
+        The synchronous client runs the blocking call in a worker thread;
+        `AsyncGeminiClient` overrides this with a native async implementation.
+        Arguments, return value and exceptions are the same as for
+        `generate_content_with_retry`.
+        """
+        return await asyncio.to_thread(
+            self.generate_content_with_retry,
+            contents=contents,
+            generation_config=generation_config,
+            file_identifier_prefix=file_identifier_prefix,
+            triggering_input_row_id=triggering_input_row_id,
+            triggering_company_name=triggering_company_name,
+            model_name_override=model_name_override,
+            system_instruction=system_instruction
+        )
+
+    def get_rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns per-model rate limiter statistics. The synchronous client does not rate limit."""
+        return {}
+
+    def _qualify_model_name(
+        self,
+        model_name_override: Optional[str],
+        file_identifier_prefix: str,
+        triggering_input_row_id: Any,
+        triggering_company_name: str
+    ) -> str:
+        """Returns the effective model name with the "models/" prefix the API expects."""
+        effective_model_name = model_name_override if model_name_override else self.config.llm_model_name
+        if not effective_model_name:
+            log_err_context = f"[{file_identifier_prefix}, RowID: {triggering_input_row_id}, Company: {triggering_company_name}]"
+            logger.error(f"{log_err_context} No LLM model name configured in AppConfig or provided via model_name_override.")
+            raise ValueError("LLM model name must be configured or provided as an override.")
+
+        # The client.models.generate_content() expects model names like "models/gemini-pro".
+        # Ensure the "models/" prefix is present.
+        if not effective_model_name.startswith("models/"):
+            return f"models/{effective_model_name}"
+        return effective_model_name
+
+    def _get_model(self, qualified_model_name: str, system_instruction: Optional[str]) -> GenerativeModel:
+        """Returns a cached `GenerativeModel` for (model name, system instruction), creating it on first use."""
+        model_key = (qualified_model_name, system_instruction)
+        with self._models_lock:
+            model = self._models.get(model_key)
+            if model is None:
+                model = GenerativeModel(
+                    model_name=qualified_model_name,
+                    system_instruction=system_instruction
+                )
+                self._models[model_key] = model
+        return model
+
+    def _lookup_cache(
+        self,
+        qualified_model_name: str,
+        system_instruction: Optional[str],
+        contents: Any,
+        generation_config: Any,
+        log_context: str
+    ) -> Tuple[Optional[str], Optional[CachedGeminiResponse]]:
+        """Returns (cache key, cached response). The key is None when caching is off; the response is None on a miss."""
+        if self.response_cache is None:
+            return None, None
+        cache_key = build_cache_key(qualified_model_name, system_instruction, contents, generation_config)
+        if self.cache_mode != CACHE_MODE_USE:
+            return cache_key, None
+        cached_response = self.response_cache.get(cache_key)
+        if cached_response is not None:
+            logger.info(f"{log_context} Gemini response served from cache (key: {cache_key[:12]}).")
+        return cache_key, cached_response
+
+    def _log_response_outcome(self, response: Any, log_context: str) -> None:
+        """Logs blocked prompts and responses without candidates."""
+        if response and response.prompt_feedback and response.prompt_feedback.block_reason:
+            logger.warning(f"{log_context} Gemini content generation was blocked. Reason: {response.prompt_feedback.block_reason.name}. This is typically not retried by network-level retries.")
+        
+        if not response.candidates:
+             logger.warning(f"{log_context} Gemini API call returned no candidates. This might be due to safety filters or other reasons. Review response.prompt_feedback if available. Full response parts: {len(response.parts) if response.parts else 'N/A'}")
+
+        logger.info(f"{log_context} Gemini API call successful.")
+
+    def _store_in_cache(self, cache_key: str, model_name: str, response: Any, log_context: str) -> None:
+        """Stores a successful, non-empty response in the response cache. Cache errors are logged, not raised."""
+        if self.response_cache is None or not response or not response.candidates:
+            return
+        try:
+            response_text = response.text
+        except ValueError:  # .text raises if the candidate has no text parts (e.g. blocked)
+            return
+        if not response_text:
+            return
+        usage = {}
+        if response.usage_metadata:
+            usage = {
+                "prompt_tokens": response.usage_metadata.prompt_token_count or 0,
+                "completion_tokens": response.usage_metadata.candidates_token_count or 0,
+                "total_tokens": response.usage_metadata.total_token_count or 0,
+            }
+        try:
+            self.response_cache.put(cache_key, model_name, response_text, usage)
+        except Exception as e:
+            logger.warning(f"{log_context} Could not store Gemini response in cache: {e}")
+
+
+def _estimate_request_tokens(contents: Any, system_instruction: Optional[str], generation_config: Any) -> int:
+    """
+    Roughly estimates the tokens a request will use (about 4 characters per token for the
+    prompt, plus the maximum output tokens), for reserving rate-limit capacity before the call.
+    """
+    prompt_chars = len(system_instruction or "")
+    if isinstance(contents, str):
+        prompt_chars += len(contents)
+    else:
+        for content_item in contents or []:
+            parts = content_item.get("parts", []) if isinstance(content_item, dict) else []
+            for part in parts:
+                if isinstance(part, dict):
+                    prompt_chars += len(part.get("text", "") or "")
+                elif isinstance(part, str):
+                    prompt_chars += len(part)
+    max_output_tokens = getattr(generation_config, "max_output_tokens", None) or 0
+    return prompt_chars // 4 + max_output_tokens
+
+
+class AsyncGeminiClient(GeminiClient):
+    """
+    Gemini client for use from many concurrent coroutines.
+
+    `generate_content_async` calls the API natively with `generate_content_async`
+    and passes every request through a per-model `AsyncRateLimiter` that enforces
+    requests-per-minute and tokens-per-minute limits and admits callers in FIFO
+    order. A `ResourceExhausted` (429) response pauses all callers of that model
+    before the request is retried with jittered exponential backoff.
+
+    The synchronous `generate_content_with_retry` is inherited unchanged.
+    """
+
+    def __init__(self, config: AppConfig):
+        super().__init__(config)
+        self.rate_limiters = RateLimiterRegistry(
+            requests_per_minute=self.config.llm_rate_limit_rpm,
+            tokens_per_minute=self.config.llm_rate_limit_tpm
+        )
+        logger.info(
+            f"AsyncGeminiClient: rate limits per model: {self.config.llm_rate_limit_rpm} requests/min, "
+            f"{self.config.llm_rate_limit_tpm} tokens/min (0 = unlimited)."
+        )
+
+    async def generate_content_async(
+        self,
+        contents: Union[str, Iterable[genai_types.ContentDict]],
+        generation_config: genai_types.GenerationConfig,
+        file_identifier_prefix: str,
+        triggering_input_row_id: Any,
+        triggering_company_name: str,
+        model_name_override: Optional[str] = None,
+        system_instruction: Optional[str] = None
+    ) -> Union[genai_types.GenerateContentResponse, CachedGeminiResponse]:
+        """
+        Generates content with the Gemini API, respecting the per-model rate limits.
+
+        Arguments, return value and exceptions are the same as for
+        `GeminiClient.generate_content_with_retry`. Retryable API errors are retried
+        up to `llm_max_retries` times in total.
+        """
+        qualified_model_name = self._qualify_model_name(
+            model_name_override, file_identifier_prefix, triggering_input_row_id, triggering_company_name
+        )
+        log_context = f"[{file_identifier_prefix}, RowID: {triggering_input_row_id}, Company: {triggering_company_name}, Model: {qualified_model_name}]"
+
+        # The response cache is SQLite; keep its disk I/O off the event loop
+        cache_key, cached_response = await asyncio.to_thread(
+            self._lookup_cache, qualified_model_name, system_instruction, contents, generation_config, log_context
+        )
+        if cached_response is not None:
+            return cached_response
+
+        limiter = self.rate_limiters.get(qualified_model_name)
+        model = self._get_model(qualified_model_name, system_instruction)
+        estimated_tokens = _estimate_request_tokens(contents, system_instruction, generation_config)
+
+        async for attempt in AsyncRetrying(
+            stop=stop_after_attempt(max(1, self.config.llm_max_retries)),
+            wait=wait_random_exponential(multiplier=1, min=2, max=30),
+            retry=retry_if_exception_type(RETRYABLE_GEMINI_EXCEPTIONS),
+            reraise=True
+        ):
+            with attempt:
+                reserved_tokens = await limiter.acquire(estimated_tokens)
+                logger.info(f"{log_context} Attempting async Gemini API call (attempt {attempt.retry_state.attempt_number}).")
+                try:
+                    response = await model.generate_content_async(
+                        contents=contents,
+                        generation_config=generation_config
+                    )
+                except BaseException as call_error:
+                    # Failed, rejected and cancelled requests do not consume tokens
+                    limiter.record_usage(reserved_tokens, 0)
+                    if isinstance(call_error, google_api_core_exceptions.ResourceExhausted):
+                        limiter.pause(self.config.llm_rate_limit_cooldown_seconds)
+                        logger.warning(f"{log_context} Gemini quota exceeded: {call_error}")
+                    elif isinstance(call_error, google_api_core_exceptions.GoogleAPIError):
+                        logger.error(f"{log_context} Gemini API error: {call_error}", exc_info=True)
+                    elif isinstance(call_error, Exception):
+                        logger.error(f"{log_context} Unexpected error during async Gemini API call: {call_error}", exc_info=True)
+                    raise
+
+                actual_tokens = response.usage_metadata.total_token_count if response and response.usage_metadata else None
+                limiter.record_usage(reserved_tokens, actual_tokens)
+                self._log_response_outcome(response, log_context)
+                if cache_key is not None:
+                    await asyncio.to_thread(self._store_in_cache, cache_key, qualified_model_name, response, log_context)
+                return response
+        raise RuntimeError("Unreachable: AsyncRetrying either returns or reraises.")
+
+    def get_rate_limit_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns {model name: rate limiter statistics} for every model used."""
+        return self.rate_limiters.get_stats()
@@ -0,0 +1,165 @@
+"""
+Async rate limiting for Gemini API calls.
+
+Gemini enforces per-model quotas on requests per minute (RPM) and tokens per
+minute (TPM). When many rows call the API concurrently and only back off after
+a `429 ResourceExhausted`, every caller retries at about the same moment and
+the quota is exceeded again (a thundering herd).
+
+`AsyncRateLimiter` keeps one token bucket for requests and one for tokens.
+Callers wait in FIFO order: the caller at the head of the queue holds the lock
+while it sleeps until both buckets have capacity, so later callers cannot jump
+ahead of it. Token usage is reserved from an estimate before the call and
+corrected with the actual usage afterwards. A 429 pauses the whole limiter for
+the backoff period instead of only the caller that received it.
+
+`RateLimiterRegistry` hands out one limiter per model name, because quotas are
+tracked per model.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _TokenBucket:
+    """A token bucket refilled continuously at `capacity` units per minute. Capacity 0 means unlimited."""
+
+    def __init__(self, capacity_per_minute: int):
+        self.capacity = max(0, capacity_per_minute)
+        self.refill_per_second = self.capacity / 60.0
+        self.level = float(self.capacity)
+        self._last_refill = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._last_refill) * self.refill_per_second)
+        self._last_refill = now
+
+    def seconds_until_available(self, amount: float) -> float:
+        """Returns how long to wait until `amount` units can be taken (0 if available now)."""
+        if not self.capacity:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)  # A single oversized request only needs a full bucket
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.refill_per_second
+
+    def consume(self, amount: float) -> None:
+        """Takes `amount` units. The level may go negative (debt) when actual usage exceeds the estimate."""
+        if not self.capacity:
+            return
+        self._refill()
+        self.level -= amount
+
+    def refund(self, amount: float) -> None:
+        """Returns unused units, without exceeding capacity."""
+        if not self.capacity:
+            return
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class AsyncRateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limiter with FIFO queueing.
+
+    Usage:
+        reserved = await limiter.acquire(estimated_tokens)
+        response = await model.generate_content_async(...)
+        limiter.record_usage(reserved, actual_total_tokens)
+    """
+
+    def __init__(self, name: str, requests_per_minute: int, tokens_per_minute: int):
+        """
+        Args:
+            name (str): Name used in log messages (usually the model name).
+            requests_per_minute (int): Maximum requests per minute (0 = unlimited).
+            tokens_per_minute (int): Maximum prompt + completion tokens per minute (0 = unlimited).
+        """
+        self.name = name
+        self._requests = _TokenBucket(requests_per_minute)
+        self._tokens = _TokenBucket(tokens_per_minute)
+        self._lock = asyncio.Lock()  # Waiters are woken in FIFO order
+        self._paused_until = 0.0
+        self._stats: Dict[str, Any] = {
+            "requests_per_minute_limit": requests_per_minute,
+            "tokens_per_minute_limit": tokens_per_minute,
+            "requests_admitted": 0,
+            "requests_delayed": 0,
+            "wait_seconds_total": 0.0,
+            "max_wait_seconds": 0.0,
+            "rate_limit_errors": 0,
+        }
+
+    async def acquire(self, estimated_tokens: int) -> int:
+        """
+        Waits until one request and `estimated_tokens` tokens are available and reserves them.
+
+        Returns:
+            int: The number of tokens reserved, to be passed to `record_usage`.
+        """
+        wait_start = time.monotonic()
+        async with self._lock:
+            while True:
+                wait_seconds = max(
+                    self._paused_until - time.monotonic(),
+                    self._requests.seconds_until_available(1),
+                    self._tokens.seconds_until_available(estimated_tokens),
+                )
+                if wait_seconds <= 0:
+                    break
+                await asyncio.sleep(wait_seconds)
+            self._requests.consume(1)
+            self._tokens.consume(estimated_tokens)
+        waited = time.monotonic() - wait_start
+        self._stats["requests_admitted"] += 1
+        if waited > 0.01:
+            self._stats["requests_delayed"] += 1
+            self._stats["wait_seconds_total"] += waited
+            self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], waited)
+        return estimated_tokens
+
+    def record_usage(self, reserved_tokens: int, actual_tokens: Optional[int]) -> None:
+        """Corrects the token bucket once the actual usage of a call is known."""
+        if actual_tokens is None:
+            return
+        difference = actual_tokens - reserved_tokens
+        if difference > 0:
+            self._tokens.consume(difference)
+        elif difference < 0:
+            self._tokens.refund(-difference)
+
+    def pause(self, seconds: float) -> None:
+        """Stops admitting requests for `seconds`, e.g. after the API returned 429."""
+        self._stats["rate_limit_errors"] += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        logger.warning(f"RateLimiter[{self.name}]: quota exceeded; pausing all callers for {seconds:.1f}s.")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns limiter statistics suitable for `run_metrics`."""
+        return dict(self._stats)
+
+
+class RateLimiterRegistry:
+    """Creates and holds one `AsyncRateLimiter` per model name."""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._limiters: Dict[str, AsyncRateLimiter] = {}
+
+    def get(self, model_name: str) -> AsyncRateLimiter:
+        """Returns the limiter for `model_name`, creating it on first use."""
+        limiter = self._limiters.get(model_name)
+        if limiter is None:
+            limiter = AsyncRateLimiter(model_name, self.requests_per_minute, self.tokens_per_minute)
+            self._limiters[model_name] = limiter
+        return limiter
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns {model_name: limiter stats} for every model used."""
+        return {model_name: limiter.get_stats() for model_name, limiter in self._limiters.items()}
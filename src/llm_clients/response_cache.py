@@ -0,0 +1,187 @@
+"""
+Persistent on-disk cache of Gemini responses.
+
+Re-running a batch after changing one prompt would otherwise re-bill every LLM
+stage. `LLMResponseCache` stores the text and token usage of successful Gemini
+responses in a SQLite database, keyed by a SHA-256 hash of everything that
+determines the response: model name, system instruction, full request contents
+and generation config.
+
+Entries expire after a TTL and the least recently used entries are evicted when
+the cache grows beyond a maximum number of entries. The cache is safe to use
+from the worker threads that run the (synchronous) Gemini calls.
+
+Cache modes (`LLM_CACHE_MODE` / `--llm-cache`):
+- "use": read cached responses and store new ones.
+- "refresh": ignore cached responses but store the new ones, overwriting old entries.
+- "bypass": neither read nor write the cache.
+"""
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODE_USE = "use"
+CACHE_MODE_REFRESH = "refresh"
+CACHE_MODE_BYPASS = "bypass"
+CACHE_MODES = (CACHE_MODE_USE, CACHE_MODE_REFRESH, CACHE_MODE_BYPASS)
+
+
+class CachedGeminiResponse:
+    """
+    Stand-in for a `GenerateContentResponse` rebuilt from a cache entry.
+
+    Exposes the attributes the LLM tasks read (`text`, `candidates`,
+    `prompt_feedback`, `usage_metadata`). Token counts in `usage_metadata` are
+    zero because a cached response is not billed; the original usage is kept in
+    `cached_usage`.
+    """
+
+    def __init__(self, text: str, prompt_tokens: int, completion_tokens: int, total_tokens: int):
+        self.text = text
+        self.candidates = [text]  # Only responses with candidates are cached
+        self.prompt_feedback = None
+        self.usage_metadata = SimpleNamespace(prompt_token_count=0, candidates_token_count=0, total_token_count=0)
+        self.cached_usage: Dict[str, int] = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": total_tokens,
+        }
+
+
+def _to_jsonable(value: Any) -> Any:
+    """Converts request parts (dataclasses, schemas, protobuf-like objects) into JSON-serializable data."""
+    if isinstance(value, type) and hasattr(value, "model_json_schema"):
+        return value.model_json_schema()  # Pydantic response schemas: key on their structure, not their name
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {k: _to_jsonable(v) for k, v in dataclasses.asdict(value).items()}
+    if isinstance(value, dict):
+        return {str(k): _to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def build_cache_key(model_name: str, system_instruction: Optional[str], contents: Any, generation_config: Any) -> str:
+    """Returns the SHA-256 cache key for a Gemini request."""
+    key_material = json.dumps(
+        {
+            "model": model_name,
+            "system_instruction": system_instruction,
+            "contents": _to_jsonable(contents),
+            "generation_config": _to_jsonable(generation_config),
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(key_material.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed cache of Gemini response texts with TTL and LRU size eviction."""
+
+    def __init__(self, db_path: str, ttl_seconds: int, max_entries: int):
+        """
+        Args:
+            db_path (str): Path to the SQLite database file (its directory is created if needed).
+            ttl_seconds (int): Entries older than this are treated as missing and purged (0 = no expiry).
+            max_entries (int): Maximum number of entries kept; least recently used are evicted (0 = unlimited).
+        """
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.db_path = db_path
+        self.ttl_seconds = max(0, ttl_seconds)
+        self.max_entries = max(0, max_entries)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_responses ("
+                " cache_key TEXT PRIMARY KEY,"
+                " model_name TEXT,"
+                " response_text TEXT NOT NULL,"
+                " prompt_tokens INTEGER NOT NULL DEFAULT 0,"
+                " completion_tokens INTEGER NOT NULL DEFAULT 0,"
+                " total_tokens INTEGER NOT NULL DEFAULT 0,"
+                " created_at REAL NOT NULL,"
+                " last_accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_responses_last_accessed ON llm_responses (last_accessed_at)"
+            )
+            self._conn.commit()
+        self._purge_expired()
+        logger.info(f"LLM response cache opened at {db_path} (ttl={self.ttl_seconds}s, max_entries={self.max_entries}).")
+
+    def get(self, cache_key: str) -> Optional[CachedGeminiResponse]:
+        """Returns the cached response for `cache_key`, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response_text, prompt_tokens, completion_tokens, total_tokens, created_at"
+                " FROM llm_responses WHERE cache_key = ?",
+                (cache_key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response_text, prompt_tokens, completion_tokens, total_tokens, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_responses WHERE cache_key = ?", (cache_key,))
+                self._conn.commit()
+                return None
+            self._conn.execute(
+                "UPDATE llm_responses SET last_accessed_at = ? WHERE cache_key = ?", (now, cache_key)
+            )
+            self._conn.commit()
+        return CachedGeminiResponse(response_text, prompt_tokens, completion_tokens, total_tokens)
+
+    def put(self, cache_key: str, model_name: str, response_text: str, usage: Dict[str, int]) -> None:
+        """Stores (or replaces) a response and evicts entries beyond `max_entries`."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses"
+                " (cache_key, model_name, response_text, prompt_tokens, completion_tokens, total_tokens,"
+                "  created_at, last_accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    cache_key, model_name, response_text,
+                    usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0), usage.get("total_tokens", 0),
+                    now, now
+                )
+            )
+            if self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM llm_responses WHERE cache_key IN ("
+                    " SELECT cache_key FROM llm_responses ORDER BY last_accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _purge_expired(self) -> None:
+        if not self.ttl_seconds:
+            return
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM llm_responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+            self._conn.commit()
+        if deleted:
+            logger.info(f"LLM response cache: purged {deleted} expired entries.")
@@ -2,6 +2,7 @@
 This package contains modules for processing data within the contact pipeline.
 
 Modules:
+    checkpoint_store: Persists per-row progress so interrupted runs can be resumed.
     outcome_analyzer: Analyzes outcomes of processing steps.
     pipeline_flow: Manages the overall flow of the contact processing pipeline.
     url_processor: Handles processing of URLs.
@@ -0,0 +1,142 @@
+"""
+Durable per-row checkpoint store for pipeline runs.
+
+The pipeline keeps its outputs (match outputs, failure records, domain journey
+data) in memory until reports are generated at the end of a run. This module
+persists each row's progress to a SQLite database inside the run's output
+directory as the row moves through the pipeline stages, so that an interrupted
+run can be resumed with `python main_pipeline.py --resume <run_id>`.
+
+For every input row (identified by its position in the input DataFrame) the
+store keeps the last stage the row finished together with a JSON snapshot of
+its row result. On resume, rows at `STAGE_COMPLETE` are replayed without any
+scraping or LLM calls, and rows at an intermediate stage restart from the next
+stage. URLs already scraped by finished scrape stages are stored as well so
+the scraper's cross-row de-duplication survives a restart.
+"""
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Stages a row can be checkpointed at, in pipeline order.
+STAGE_SCRAPED = "scraped"
+STAGE_SUMMARIZED = "summarized"
+STAGE_EXTRACTED = "extracted"
+STAGE_COMPLETE = "complete"
+CHECKPOINT_STAGES = (STAGE_SCRAPED, STAGE_SUMMARIZED, STAGE_EXTRACTED, STAGE_COMPLETE)
+
+
+def get_checkpoint_db_path(run_output_dir: str, run_id: str) -> str:
+    """Returns the path of the checkpoint database for a run."""
+    return os.path.join(run_output_dir, f"pipeline_checkpoint_{run_id}.sqlite")
+
+
+class PipelineCheckpointStore:
+    """
+    SQLite-backed store of per-row pipeline progress for a single run.
+
+    All writes are committed immediately so that a crash loses at most the
+    stage that was in flight. The store is only used from the pipeline's event
+    loop thread.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Opens (or creates) the checkpoint database.
+
+        Args:
+            db_path (str): Path to the SQLite database file.
+        """
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS row_checkpoints ("
+            " position INTEGER PRIMARY KEY,"
+            " input_row_id TEXT,"
+            " stage TEXT NOT NULL,"
+            " state_json TEXT NOT NULL,"
+            " updated_at TEXT NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS processed_urls (url TEXT PRIMARY KEY)")
+        self._conn.commit()
+        logger.info(f"Checkpoint store opened at {db_path}")
+
+    def save_row(self, position: int, input_row_id: Any, stage: str, state: Dict[str, Any]) -> None:
+        """
+        Records that the row at `position` finished `stage`, replacing any earlier checkpoint.
+
+        Args:
+            position (int): 0-based position of the row in the input DataFrame.
+            input_row_id (Any): The DataFrame index of the row (stored for inspection only).
+            stage (str): One of `CHECKPOINT_STAGES`.
+            state (Dict[str, Any]): JSON-serializable snapshot of the row result.
+        """
+        if stage not in CHECKPOINT_STAGES:
+            raise ValueError(f"Unknown checkpoint stage: {stage}")
+        self._conn.execute(
+            "INSERT OR REPLACE INTO row_checkpoints (position, input_row_id, stage, state_json, updated_at)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (position, str(input_row_id), stage, json.dumps(state, default=str), datetime.now().isoformat())
+        )
+        self._conn.commit()
+
+    def add_processed_urls(self, urls: Iterable[str]) -> None:
+        """Persists URLs that the scraper has already processed in this run."""
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO processed_urls (url) VALUES (?)",
+            [(url,) for url in urls if url]
+        )
+        self._conn.commit()
+
+    def load_rows(self) -> Dict[int, Tuple[str, Dict[str, Any]]]:
+        """Returns {position: (stage, state)} for every checkpointed row."""
+        rows: Dict[int, Tuple[str, Dict[str, Any]]] = {}
+        for position, stage, state_json in self._conn.execute(
+            "SELECT position, stage, state_json FROM row_checkpoints"
+        ):
+            try:
+                rows[position] = (stage, json.loads(state_json))
+            except json.JSONDecodeError as e:
+                logger.warning(f"Ignoring unreadable checkpoint for row position {position}: {e}")
+        return rows
+
+    def load_processed_urls(self) -> Set[str]:
+        """Returns the set of URLs already processed by finished scrape stages."""
+        return {url for (url,) in self._conn.execute("SELECT url FROM processed_urls")}
+
+    def count_rows_by_stage(self) -> Dict[str, int]:
+        """Returns the number of checkpointed rows per stage, for logging."""
+        return {
+            stage: count for stage, count in self._conn.execute(
+                "SELECT stage, COUNT(*) FROM row_checkpoints GROUP BY stage"
+            )
+        }
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        try:
+            self._conn.close()
+        except sqlite3.Error as e:
+            logger.error(f"Error closing checkpoint store {self.db_path}: {e}")
+
+
+def open_checkpoint_store(run_output_dir: str, run_id: str) -> Optional[PipelineCheckpointStore]:
+    """
+    Opens the checkpoint store for a run, returning None if it cannot be opened.
+
+    A store that fails to open should not stop the pipeline; the run simply
+    cannot be resumed later.
+    """
+    db_path = get_checkpoint_db_path(run_output_dir, run_id)
+    try:
+        return PipelineCheckpointStore(db_path)
+    except sqlite3.Error as e:
+        logger.error(f"Could not open checkpoint store at {db_path}: {e}. Continuing without checkpoints.")
+        return None
@@ -12,6 +12,25 @@ This module orchestrates the main data processing pipeline, which involves:
         golden partner profiles.
 5.  Collecting metrics, logging failures, and preparing outputs.
 
+Two execution modes are available (`PIPELINE_EXECUTION_MODE`):
+-   "row": a bounded pool of row workers (`PIPELINE_MAX_CONCURRENT_ROWS`) each
+    runs all stages of a row back-to-back.
+-   "staged": scraping and each LLM call run as independent stages with their
+    own worker counts, connected by bounded queues. Scraping and LLM calls for
+    different rows overlap, and the bounded queues apply back-pressure so that
+    scraped text does not pile up in memory when the LLM stages fall behind.
+
+In both modes everything runs on a single asyncio event loop. Scraping is
+awaited directly, while the synchronous Gemini calls are dispatched to worker
+threads. Each row produces a self-contained "row result" that is merged into
+the shared aggregates on the event loop thread, so failure logging and metrics
+are identical regardless of the mode or concurrency settings.
+
+When a `PipelineCheckpointStore` is supplied, each row is checkpointed after
+every stage it finishes and once more when its result is merged. Resuming a run
+replays merged rows from the store and restarts unfinished rows at the first
+stage they had not yet completed.
+
 The pipeline is designed to be resilient, handling errors at each stage and
 continuing processing for other rows where possible. It also tracks various
 data points for reporting and analysis, such as scraper statuses and LLM
@@ -19,11 +38,13 @@ call statistics.
 """
 import pandas as pd
 import asyncio
+import contextlib
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
-from typing import List, Dict, Set, Optional, Any, Tuple
+from typing import List, Dict, Set, Optional, Any, Tuple, Iterator
 from collections import Counter
 
 from src.core.config import AppConfig
@@ -33,11 +54,22 @@ from src.core.schemas import (
 from src.data_handling.consolidator import get_canonical_base_url
 from src.llm_clients.gemini_client import GeminiClient
 from src.scraper import scrape_website
+from src.scraper.browser_pool import BrowserPool
+from src.scraper.page_handler import networkidle_policy
+from src.scraper.scraper_logic import (
+    robots_cache, page_cache, dns_resolver, preflight_dns, resource_blocker, sitemap_discoverer, host_limiter, get_crawl_stats,
+    get_dns_fallback_stats, close_artifact_sinks, create_http_client
+)
 from src.extractors.llm_tasks.summarize_task import generate_website_summary
 from src.extractors.llm_tasks.extract_attributes_task import extract_detailed_attributes
 from src.extractors.llm_tasks.generate_insights_task import generate_sales_insights
-from src.utils.helpers import log_row_failure, sanitize_filename_component
+from src.extractors.llm_tasks.summarize_and_extract_task import generate_summary_and_attributes
+from src.data_handling.partner_ranker import GoldenPartnerRanker
+from src.utils.helpers import log_row_failure, sanitize_filename_component, get_input_canonical_url, plan_domain_groups
 from src.processing.url_processor import process_input_url
+from src.processing.checkpoint_store import (
+    PipelineCheckpointStore, STAGE_SCRAPED, STAGE_SUMMARIZED, STAGE_EXTRACTED, STAGE_COMPLETE
+)
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +96,7 @@ def execute_pipeline_flow(
     failure_writer: Any,  # csv.writer object
     run_metrics: Dict[str, Any],
     golden_partner_summaries: List[Dict[str, Any]],
+    checkpoint_store: Optional[PipelineCheckpointStore] = None,
 ) -> PipelineOutput:
     """
     Executes the core data processing flow of the pipeline.
@@ -76,6 +109,14 @@ def execute_pipeline_flow(
     5. LLM - Compare & Sales Line: Attributes are compared to golden partner profiles,
        and sales insights are generated by an LLM.
 
+    In "row" mode up to `app_config.pipeline_max_concurrent_rows` rows are
+    processed at once. In "staged" mode each step runs in its own worker pool
+    (`pipeline_scrape_workers`, `pipeline_summarize_workers`, ...) and rows move
+    between steps through queues bounded by `pipeline_stage_queue_size`.
+    In both modes rows that share an input canonical domain are scraped one after
+    another, in input order, so that the shared `globally_processed_urls` set
+    behaves exactly as in a sequential run.
+
     Failures at any step are logged, and the pipeline attempts to continue with the next row.
 
     Args:
@@ -91,6 +132,11 @@ def execute_pipeline_flow(
         run_metrics: A dictionary that will be updated with various processing metrics.
         golden_partner_summaries: A list of dictionaries, where each dictionary
                                   contains the name and summary of a "golden partner."
+        checkpoint_store: Optional store that records per-row progress. If it already
+                          holds checkpoints (a resumed run), finished rows are replayed
+                          from it and unfinished rows continue from their last completed
+                          stage. Token and duration metrics only cover work done in this
+                          process.
 
     Returns:
         A tuple containing:
@@ -110,357 +156,214 @@ def execute_pipeline_flow(
         - row_level_failure_counts (Dict[str, int]): A summary count of failures
           by type.
     """
-    globally_processed_urls: Set[str] = set()  # Tracks URLs to avoid re-scraping
-    # Stores scraper status for each specific pathful URL attempted
-    canonical_site_pathful_scraper_status: Dict[str, str] = {}
-    # Maps original input URL to its determined canonical true base domain
-    input_to_canonical_map: Dict[str, Optional[str]] = {}
+    return asyncio.run(_execute_pipeline_flow_async(
+        df=df,
+        app_config=app_config,
+        gemini_client=gemini_client,
+        run_output_dir=run_output_dir,
+        llm_context_dir=llm_context_dir,
+        llm_requests_dir=llm_requests_dir,
+        run_id=run_id,
+        failure_writer=failure_writer,
+        run_metrics=run_metrics,
+        golden_partner_summaries=golden_partner_summaries,
+        checkpoint_store=checkpoint_store
+    ))
 
-    all_golden_partner_match_outputs: List[GoldenPartnerMatchOutput] = []
-    attrition_data_list: List[Dict[str, Any]] = [] # For detailed failure logging
-    row_level_failure_counts: Dict[str, int] = Counter()
-
-    # Data structures for Canonical Domain Journey Report
-    # Tracks processing details per unique canonical domain encountered
-    canonical_domain_journey_data: Dict[str, Dict[str, Any]] = {}
 
-    pipeline_loop_start_time = time.time()
-    rows_processed_count = 0
-    rows_failed_count = 0
+async def _execute_pipeline_flow_async(
+    df: pd.DataFrame,
+    app_config: AppConfig,
+    gemini_client: GeminiClient,
+    run_output_dir: str,
+    llm_context_dir: str,
+    llm_requests_dir: str,
+    run_id: str,
+    failure_writer: Any,
+    run_metrics: Dict[str, Any],
+    golden_partner_summaries: List[Dict[str, Any]],
+    checkpoint_store: Optional[PipelineCheckpointStore] = None,
+) -> PipelineOutput:
+    """Async implementation of `execute_pipeline_flow`; see that function for details."""
+    execution_mode = app_config.pipeline_execution_mode
+    max_concurrent_rows = max(1, app_config.pipeline_max_concurrent_rows)
+    if execution_mode == "staged":
+        llm_thread_count = (
+            max(1, app_config.pipeline_summarize_workers)
+            + max(1, app_config.pipeline_extract_workers)
+            + max(1, app_config.pipeline_insights_workers)
+        )
+    else:
+        llm_thread_count = max_concurrent_rows
+    # The Gemini client is synchronous; give every concurrent LLM call its own thread.
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=llm_thread_count, thread_name_prefix="pipeline_llm")
+    )
 
     # Pre-fetch company name and URL column names from AppConfig
     active_profile = app_config.INPUT_COLUMN_PROFILES.get(
         app_config.input_file_profile_name,
         app_config.INPUT_COLUMN_PROFILES['default']
     )
-    company_name_col_key = active_profile.get('CompanyName', 'CompanyName')
-    url_col_key = active_profile.get('GivenURL', 'GivenURL')
-
-    for i, (index, row_series) in enumerate(df.iterrows()):
-        rows_processed_count += 1
-        row: pd.Series = row_series
-        company_name_str: str = str(row.get(company_name_col_key, f"MissingCompanyName_Row_{index}"))
-        given_url_original: Optional[str] = row.get(url_col_key)
-        given_url_original_str: str = str(given_url_original) if given_url_original else "MissingURL"
-
-        current_row_number_for_log: int = i + 1  # 1-based for logging
-        log_identifier = f"[RowID: {index}, Company: {company_name_str}, URL: {given_url_original_str}]"
-        logger.info(f"{log_identifier} --- Processing row {current_row_number_for_log}/{len(df)} ---")
-
-        current_row_scraper_status: str = "Not_Run"
-        final_canonical_entry_url: Optional[str] = None  # Pathful canonical URL from scraper
-        true_base_domain_for_row: Optional[str] = None  # True base domain
-
-        website_summary_obj: Optional[WebsiteTextSummary] = None
-        detailed_attributes_obj: Optional[DetailedCompanyAttributes] = None
-        final_match_output: Optional[GoldenPartnerMatchOutput] = None
-
-        # --- 1. URL Processing ---
-        processed_url, url_status = process_input_url(
-            given_url_original, app_config.url_probing_tlds, log_identifier
-        )
-        if url_status == "InvalidURL":
-            df.at[index, 'ScrapingStatus'] = 'InvalidURL'
-            current_row_scraper_status = 'InvalidURL'
-            run_metrics["scraping_stats"]["scraping_failure_invalid_url"] += 1
-            log_row_failure(
-                failure_writer, index, company_name_str, given_url_original_str,
-                "URL_Validation_InvalidOrMissing",
-                f"Invalid or missing URL: {processed_url}", datetime.now().isoformat(),
-                json.dumps({"original_url": given_url_original_str, "processed_url": processed_url})
-            )
-            row_level_failure_counts["URL_Validation_InvalidOrMissing"] += 1
-            rows_failed_count += 1
-            all_golden_partner_match_outputs.append(
-                GoldenPartnerMatchOutput(
-                    analyzed_company_url=given_url_original_str,
-                    analyzed_company_attributes=DetailedCompanyAttributes(
-                        input_summary_url=given_url_original_str
-                    ),
-                    match_rationale_features=[f"Failed at URL Validation: {url_status}"]
-                )
-            )
-            continue
-        # --- End URL Processing ---
 
-        try:
-            assert processed_url is not None
-            run_metrics["scraping_stats"]["urls_processed_for_scraping"] += 1
-            scrape_task_start_time = time.time()
-
-            # --- 2. Scrape Website ---
-            logger.info(f"{log_identifier} Starting website scraping for: {processed_url}")
-            # scraped_pages_details: List[Tuple[str, str, str]]  # (content_file, source_url, page_type)
-            # scraper_status: str
-            # collected_summary_text: Optional[str]
-            
-            # scrape_website returns:
-            # (scraped_pages_details, scraper_status, final_canonical_entry_url, collected_summary_text)
-            _, scraper_status, final_canonical_entry_url, collected_summary_text = asyncio.run(
-                scrape_website(processed_url, run_output_dir, company_name_str, globally_processed_urls, index)
+    resume_checkpoints: Dict[int, Tuple[str, Dict[str, Any]]] = {}
+    globally_processed_urls: Set[str] = set()
+    if checkpoint_store:
+        resume_checkpoints = checkpoint_store.load_rows()
+        globally_processed_urls = checkpoint_store.load_processed_urls()
+        if resume_checkpoints:
+            logger.info(
+                f"Resuming from checkpoint: {len(resume_checkpoints)} rows have saved progress "
+                f"{checkpoint_store.count_rows_by_stage()}, {len(globally_processed_urls)} URLs already processed."
             )
-            run_metrics["tasks"].setdefault("scrape_website_total_duration_seconds", 0)
-            run_metrics["tasks"]["scrape_website_total_duration_seconds"] += (time.time() - scrape_task_start_time)
-
-            df.at[index, 'ScrapingStatus'] = scraper_status
-            true_base_domain_for_row = get_canonical_base_url(final_canonical_entry_url) \
-                if final_canonical_entry_url else None
-            df.at[index, 'CanonicalEntryURL'] = true_base_domain_for_row # Store true_base
-            current_row_scraper_status = scraper_status
-            # Store status for the specific pathful URL that was the entry point for scraping
-            canonical_site_pathful_scraper_status[
-                final_canonical_entry_url if final_canonical_entry_url else processed_url
-            ] = scraper_status
-
-            if current_row_scraper_status != "Success":
-                logger.warning(f"{log_identifier} Scraping failed or was skipped. Status: {current_row_scraper_status}")
-                log_row_failure(
-                    failure_writer, index, company_name_str, given_url_original_str,
-                    f"Scraping_{current_row_scraper_status}",
-                    f"Scraper status: {current_row_scraper_status}", datetime.now().isoformat(),
-                    json.dumps({
-                        "pathful_canonical_url": final_canonical_entry_url,
-                        "true_base_domain": true_base_domain_for_row
-                    }),
-                    associated_pathful_canonical_url=final_canonical_entry_url
-                )
-                row_level_failure_counts[f"Scraping_{current_row_scraper_status}"] += 1
-                rows_failed_count += 1
-                all_golden_partner_match_outputs.append(
-                    GoldenPartnerMatchOutput(
-                        analyzed_company_url=given_url_original_str,
-                        analyzed_company_attributes=DetailedCompanyAttributes(
-                            input_summary_url=given_url_original_str
-                        ),
-                        match_rationale_features=[f"Failed at Scraping: {current_row_scraper_status}"]
-                    )
-                )
-                continue
 
-            if not collected_summary_text or not collected_summary_text.strip():
-                logger.warning(f"{log_identifier} No text collected from scraped pages. Skipping LLM calls.")
-                log_row_failure(
-                    failure_writer, index, company_name_str, given_url_original_str,
-                    "LLM_Input_NoScrapedText", "No text content available after scraping.",
-                    datetime.now().isoformat(),
-                    json.dumps({"pathful_canonical_url": final_canonical_entry_url})
-                )
-                row_level_failure_counts["LLM_Input_NoScrapedText"] += 1
-                rows_failed_count += 1
-                all_golden_partner_match_outputs.append(
-                    GoldenPartnerMatchOutput(
-                        analyzed_company_url=given_url_original_str,
-                        analyzed_company_attributes=DetailedCompanyAttributes(
-                            input_summary_url=given_url_original_str
-                        ),
-                        match_rationale_features=["No text collected from website scraping"]
-                    )
-                )
-                continue
-            
-            logger.info(f"{log_identifier} Collected {len(collected_summary_text)} characters for LLM processing.")
+    flow_state: Dict[str, Any] = {
+        "df": df,
+        "app_config": app_config,
+        "gemini_client": gemini_client,
+        "run_output_dir": run_output_dir,
+        "llm_context_dir": llm_context_dir,
+        "llm_requests_dir": llm_requests_dir,
+        "run_id": run_id,
+        "failure_writer": failure_writer,
+        "run_metrics": run_metrics,
+        "golden_partner_summaries": golden_partner_summaries,
+        "company_name_col_key": active_profile.get('CompanyName', 'CompanyName'),
+        "url_col_key": active_profile.get('GivenURL', 'GivenURL'),
+        "total_rows": len(df),
+        "globally_processed_urls": globally_processed_urls,  # Tracks URLs to avoid re-scraping
+        # Stores scraper status for each specific pathful URL attempted
+        "canonical_site_pathful_scraper_status": {},
+        # Maps original input URL to its determined canonical true base domain
+        "input_to_canonical_map": {},
+        # Tracks processing details per unique canonical domain encountered
+        "canonical_domain_journey_data": {},
+        "attrition_data_list": [],  # For detailed failure logging
+        "row_level_failure_counts": Counter(),
+        "outputs_by_position": {},
+        "rows_processed_count": 0,
+        "rows_failed_count": 0,
+        # Serializes rows that share an input canonical domain (see execute_pipeline_flow)
+        "domain_locks": {},
+        "checkpoint_store": checkpoint_store,
+        # Position -> (stage, state) for rows with saved progress; consumed as rows are reached
+        "resume_checkpoints": resume_checkpoints,
+        "rows_resumed_count": 0,
+    }
 
-            # --- 3. LLM Call 1: Generate Website Summary ---
-            llm_file_prefix_row = sanitize_filename_component(
-                f"Row{index}_{company_name_str[:20]}_{str(time.time())[-5:]}", max_len=50
-            )
+    # Leader position -> follower positions for rows sharing an input canonical domain
+    domain_followers: Dict[int, List[int]] = {}
+    if app_config.pipeline_deduplicate_domains:
+        domain_followers = plan_domain_groups(df, app_config)
+        follower_count = sum(len(followers) for followers in domain_followers.values())
+        logger.info(
+            f"Domain deduplication: {follower_count} rows reuse the results of "
+            f"{len(domain_followers)} group leader rows."
+        )
+        run_metrics["data_processing_stats"]["domain_dedup"] = {
+            "groups_with_duplicates": len(domain_followers),
+            "rows_deduplicated": 0, "scrape_calls_saved": 0, "llm_calls_saved": 0, "llm_tokens_saved": 0
+        }
+    flow_state["domain_followers"] = domain_followers
 
-            summary_obj_tuple = generate_website_summary(
-                gemini_client=gemini_client,
-                config=app_config,
-                original_url=given_url_original_str,
-                scraped_text=collected_summary_text,
-                llm_context_dir=llm_context_dir,
-                llm_requests_dir=llm_requests_dir,
-                file_identifier_prefix=llm_file_prefix_row,
-                triggering_input_row_id=index,
-                triggering_company_name=company_name_str
-            )
-            website_summary_obj = summary_obj_tuple[0]
-            if summary_obj_tuple[2]:  # token_stats
-                run_metrics["llm_processing_stats"]["total_llm_prompt_tokens"] += \
-                    summary_obj_tuple[2].get("prompt_tokens", 0)
-                run_metrics["llm_processing_stats"]["total_llm_completion_tokens"] += \
-                    summary_obj_tuple[2].get("completion_tokens", 0)
-                run_metrics["llm_processing_stats"]["total_llm_tokens_overall"] += \
-                    summary_obj_tuple[2].get("total_tokens", 0)
-                run_metrics["llm_processing_stats"]["llm_calls_summary_generation"] = \
-                    run_metrics["llm_processing_stats"].get("llm_calls_summary_generation", 0) + 1
-
-            if not website_summary_obj or not website_summary_obj.summary:
-                logger.warning(f"{log_identifier} LLM Call 1 (Summarization) failed. Raw: {summary_obj_tuple[1]}")
-                log_row_failure(
-                    failure_writer, index, company_name_str, given_url_original_str,
-                    "LLM_Summarization_Failed", "Failed to generate website summary.",
-                    datetime.now().isoformat(),
-                    json.dumps({"raw_response": summary_obj_tuple[1] or "N/A"})
-                )
-                row_level_failure_counts["LLM_Summarization_Failed"] += 1
-                rows_failed_count += 1
-                all_golden_partner_match_outputs.append(
-                    GoldenPartnerMatchOutput(
-                        analyzed_company_url=given_url_original_str,
-                        analyzed_company_attributes=DetailedCompanyAttributes(
-                            input_summary_url=given_url_original_str
-                        ),
-                        match_rationale_features=["LLM Summarization Failed"]
-                    )
-                )
-                continue
-            logger.info(f"{log_identifier} LLM Call 1 (Summarization) successful.")
-
-            # --- 4. LLM Call 2: Extract Detailed Attributes ---
-            attributes_obj_tuple = extract_detailed_attributes(
-                gemini_client=gemini_client,
-                config=app_config,
-                summary_obj=website_summary_obj,
-                llm_context_dir=llm_context_dir,
-                llm_requests_dir=llm_requests_dir,
-                file_identifier_prefix=llm_file_prefix_row,
-                triggering_input_row_id=index,
-                triggering_company_name=company_name_str
-            )
-            detailed_attributes_obj = attributes_obj_tuple[0]
-            if attributes_obj_tuple[2]:  # token_stats
-                run_metrics["llm_processing_stats"]["total_llm_prompt_tokens"] += \
-                    attributes_obj_tuple[2].get("prompt_tokens", 0)
-                run_metrics["llm_processing_stats"]["total_llm_completion_tokens"] += \
-                    attributes_obj_tuple[2].get("completion_tokens", 0)
-                run_metrics["llm_processing_stats"]["total_llm_tokens_overall"] += \
-                    attributes_obj_tuple[2].get("total_tokens", 0)
-                run_metrics["llm_processing_stats"]["llm_calls_attribute_extraction"] = \
-                    run_metrics["llm_processing_stats"].get("llm_calls_attribute_extraction", 0) + 1
-
-            if not detailed_attributes_obj:
-                logger.warning(f"{log_identifier} LLM Call 2 (Attribute Extraction) failed. Raw: {attributes_obj_tuple[1]}")
-                log_row_failure(
-                    failure_writer, index, company_name_str, given_url_original_str,
-                    "LLM_AttributeExtraction_Failed", "Failed to extract detailed attributes.",
-                    datetime.now().isoformat(),
-                    json.dumps({"raw_response": attributes_obj_tuple[1] or "N/A"})
-                )
-                row_level_failure_counts["LLM_AttributeExtraction_Failed"] += 1
-                rows_failed_count += 1
-                all_golden_partner_match_outputs.append(
-                    GoldenPartnerMatchOutput(
-                        analyzed_company_url=given_url_original_str,
-                        analyzed_company_attributes=DetailedCompanyAttributes(
-                            input_summary_url=website_summary_obj.original_url
-                            if website_summary_obj else given_url_original_str
-                        ),
-                        match_rationale_features=["LLM Attribute Extraction Failed"]
-                    )
-                )
-                continue
-            logger.info(f"{log_identifier} LLM Call 2 (Attribute Extraction) successful.")
-
-            # --- 5. LLM Call 3: Generate Sales Insights & Compare ---
-            sales_insights_obj_tuple = generate_sales_insights(
-                gemini_client=gemini_client,
-                config=app_config,
-                target_attributes=detailed_attributes_obj,
-                website_summary_obj=website_summary_obj,
-                golden_partner_summaries=golden_partner_summaries,
-                llm_context_dir=llm_context_dir,
-                llm_requests_dir=llm_requests_dir,
-                file_identifier_prefix=llm_file_prefix_row,
-                triggering_input_row_id=index,
-                triggering_company_name=company_name_str
-            )
-            final_match_output = sales_insights_obj_tuple[0]
-            if sales_insights_obj_tuple[2]:  # token_stats
-                run_metrics["llm_processing_stats"]["total_llm_prompt_tokens"] += \
-                    sales_insights_obj_tuple[2].get("prompt_tokens", 0)
-                run_metrics["llm_processing_stats"]["total_llm_completion_tokens"] += \
-                    sales_insights_obj_tuple[2].get("completion_tokens", 0)
-                run_metrics["llm_processing_stats"]["total_llm_tokens_overall"] += \
-                    sales_insights_obj_tuple[2].get("total_tokens", 0)
-                run_metrics["llm_processing_stats"]["llm_calls_sales_insights"] = \
-                    run_metrics["llm_processing_stats"].get("llm_calls_sales_insights", 0) + 1
-
-            if not final_match_output:
-                logger.warning(f"{log_identifier} LLM Call 3 (Sales Insights) failed. Raw: {sales_insights_obj_tuple[1]}")
-                log_row_failure(
-                    failure_writer, index, company_name_str, given_url_original_str,
-                    "LLM_SalesInsights_Failed", "Failed to generate sales insights.",
-                    datetime.now().isoformat(),
-                    json.dumps({"raw_response": sales_insights_obj_tuple[1] or "N/A"})
-                )
-                row_level_failure_counts["LLM_SalesInsights_Failed"] += 1
-                # Still add a partial output if attributes were extracted
-                all_golden_partner_match_outputs.append(
-                    GoldenPartnerMatchOutput(
-                        analyzed_company_url=detailed_attributes_obj.input_summary_url,
-                        analyzed_company_attributes=detailed_attributes_obj,
-                        match_rationale_features=["LLM Sales Insights Generation Failed"]
-                    )
-                )
-            else:
-                logger.info(f"{log_identifier} LLM Call 3 (Sales Insights) successful.")
-                all_golden_partner_match_outputs.append(final_match_output)
-            # --- End of LLM Flow for a row ---
-
-            input_to_canonical_map[given_url_original_str] = true_base_domain_for_row
-
-            if true_base_domain_for_row:
-                if true_base_domain_for_row not in canonical_domain_journey_data:
-                    canonical_domain_journey_data[true_base_domain_for_row] = {
-                        "Input_Row_IDs": set(), "Input_CompanyNames": set(),
-                        "Input_GivenURLs": set(), "Pathful_URLs_Attempted_List": set(),
-                        "Overall_Scraper_Status_For_Domain": "Unknown",
-                        "LLM_Stages_Attempted": 0, "LLM_Stages_Succeeded": 0
-                    }
-                journey_entry = canonical_domain_journey_data[true_base_domain_for_row]
-                journey_entry["Input_Row_IDs"].add(index)
-                journey_entry["Input_CompanyNames"].add(company_name_str)
-                journey_entry["Input_GivenURLs"].add(given_url_original_str)
-                if final_canonical_entry_url:
-                    journey_entry["Pathful_URLs_Attempted_List"].add(final_canonical_entry_url)
-                # This status might be overwritten by subsequent rows for the same domain;
-                # A more robust aggregation might be needed if per-row status varies widely.
-                journey_entry["Overall_Scraper_Status_For_Domain"] = current_row_scraper_status
-                
-                journey_entry["LLM_Stages_Attempted"] = 3 # Assumes all 3 are attempted if scraping succeeds
-                current_succeeded_stages = 0
-                if website_summary_obj: current_succeeded_stages +=1
-                if detailed_attributes_obj: current_succeeded_stages +=1
-                if final_match_output: current_succeeded_stages +=1
-                # Maximize succeeded stages if multiple rows hit the same domain
-                journey_entry["LLM_Stages_Succeeded"] = max(
-                    journey_entry.get("LLM_Stages_Succeeded", 0), current_succeeded_stages
-                )
-
-            logger.info(f"{log_identifier} Row {current_row_number_for_log} processing complete.")
-
-        except Exception as e_row_processing:
-            logger.error(
-                f"{log_identifier} Unhandled error for row {current_row_number_for_log}: {e_row_processing}",
-                exc_info=True
-            )
-            run_metrics["errors_encountered"].append(
-                f"Row error for {company_name_str} (URL: {given_url_original_str}): {str(e_row_processing)}"
-            )
-            log_row_failure(
-                failure_writer, index, company_name_str, given_url_original_str,
-                "RowProcessing_UnhandledException", "Unhandled exception in main loop",
-                datetime.now().isoformat(),
-                json.dumps({
-                    "exception_type": type(e_row_processing).__name__,
-                    "exception_message": str(e_row_processing)
-                }),
-                associated_pathful_canonical_url=final_canonical_entry_url
-            )
-            row_level_failure_counts["RowProcessing_UnhandledException"] += 1
-            rows_failed_count += 1
-            all_golden_partner_match_outputs.append(
-                GoldenPartnerMatchOutput(
-                    analyzed_company_url=given_url_original_str,
-                    analyzed_company_attributes=DetailedCompanyAttributes(
-                        input_summary_url=given_url_original_str
-                    ),
-                    match_rationale_features=[f"Unhandled Exception: {str(e_row_processing)}"]
-                )
+    # Built once per run; selects the golden partners included in each sales-insights prompt
+    partner_ranker: Optional[GoldenPartnerRanker] = None
+    if app_config.golden_partner_ranking_enabled and golden_partner_summaries:
+        partner_ranker = GoldenPartnerRanker(golden_partner_summaries)
+        run_metrics["llm_processing_stats"]["golden_partner_ranking"] = {
+            "partners_available": len(golden_partner_summaries),
+            "max_partners_in_prompt": app_config.MAX_GOLDEN_PARTNERS_IN_PROMPT,
+            "prompts_reduced": 0, "partners_omitted_total": 0, "prompt_tokens_saved": 0
+        }
+    flow_state["partner_ranker"] = partner_ranker
+    follower_positions: Set[int] = {position for followers in domain_followers.values() for position in followers}
+
+    pipeline_loop_start_time = time.time()
+    # Followers are not processed themselves; they are filled in when their leader is merged
+    row_iterator: Iterator[Tuple[int, Tuple[Any, pd.Series]]] = (
+        (position, row_item) for position, row_item in enumerate(df.iterrows())
+        if position not in follower_positions
+    )
+
+    # Resolve all input hosts up front; rows with dead domains then fail fast in scrape_website.
+    # Rows resumed past the scrape stage are not scraped again and need no lookup.
+    if flow_state["url_col_key"] in df.columns:
+        scraped_positions: Set[int] = {
+            position for position, (stage, _) in resume_checkpoints.items()
+            if stage in _RESUME_STAGE_INDEX or stage == STAGE_COMPLETE
+        }
+        dns_preflight_summary = await preflight_dns(
+            given_url for position, given_url in enumerate(df[flow_state["url_col_key"]])
+            if position not in follower_positions and position not in scraped_positions
+        )
+        if dns_preflight_summary:
+            run_metrics["scraping_stats"]["dns_preflight"] = dns_preflight_summary
+
+    scrape_concurrency = app_config.pipeline_scrape_workers if execution_mode == "staged" else max_concurrent_rows
+    browser_pool = await _start_browser_pool(app_config, scrape_concurrency)
+    flow_state["browser_pool"] = browser_pool
+    # One pooled HTTP client for the run, so connections and TLS sessions are reused across rows
+    http_client = create_http_client()
+    flow_state["http_client"] = http_client
+    try:
+        if execution_mode == "staged":
+            logger.info(
+                f"Starting staged processing for {len(df)} rows "
+                f"(scrape={app_config.pipeline_scrape_workers}, summarize={app_config.pipeline_summarize_workers}, "
+                f"extract={app_config.pipeline_extract_workers}, insights={app_config.pipeline_insights_workers}, "
+                f"queue size={app_config.pipeline_stage_queue_size})."
             )
+            await _run_staged_flow(flow_state, row_iterator)
+        else:
+            logger.info(f"Starting main processing loop for {len(df)} rows with up to {max_concurrent_rows} rows in flight.")
+
+            async def _row_worker() -> None:
+                # Workers share one iterator; picking a row and taking its domain lock happen
+                # without an intervening await, so same-domain rows keep their input order.
+                for position, (index, row_series) in row_iterator:
+                    row_result = _new_row_result(flow_state, position, index, row_series)
+                    resumed_stage = _restore_row_result(flow_state, row_result)
+                    if resumed_stage == STAGE_COMPLETE:
+                        _merge_row_result(flow_state, row_result, replayed=True)
+                        continue
+                    async with _domain_lock_for_row(flow_state, row_result):
+                        await _process_row(flow_state, row_result, resumed_stage)
+                    _merge_row_result(flow_state, row_result)
+
+            workers = [asyncio.create_task(_row_worker()) for _ in range(max_concurrent_rows)]
+            await asyncio.gather(*workers)
+    finally:
+        if browser_pool:
+            run_metrics["scraping_stats"]["browser_pool"] = browser_pool.get_stats()
+            await browser_pool.close()
+        await http_client.aclose()
+        run_metrics["scraping_stats"]["robots_cache"] = robots_cache.get_stats()
+        run_metrics["scraping_stats"]["summary_crawl"] = get_crawl_stats()
+        run_metrics["scraping_stats"]["host_politeness"] = host_limiter.get_stats()
+        run_metrics["scraping_stats"]["dns_fallbacks"] = get_dns_fallback_stats()
+        run_metrics["scraping_stats"]["artifact_store"] = close_artifact_sinks()
+        if networkidle_policy:
+            run_metrics["scraping_stats"]["networkidle_policy"] = networkidle_policy.get_stats()
+        if sitemap_discoverer:
+            run_metrics["scraping_stats"]["sitemap_discovery"] = sitemap_discoverer.get_stats()
+        robots_cache.save()
+        if page_cache:
+            run_metrics["scraping_stats"]["page_cache"] = page_cache.get_stats()
+            page_cache.close()
+        if resource_blocker:
+            run_metrics["scraping_stats"]["resource_blocking"] = resource_blocker.get_stats()
+        if dns_resolver:
+            run_metrics["scraping_stats"].setdefault("dns_preflight", {})["resolver"] = dns_resolver.get_stats()
+            dns_resolver.close()
+        rate_limit_stats = gemini_client.get_rate_limit_stats()
+        if rate_limit_stats:
+            run_metrics["llm_processing_stats"]["rate_limiter"] = rate_limit_stats
+
+    rows_processed_count = flow_state["rows_processed_count"]
+    if checkpoint_store:
+        run_metrics["data_processing_stats"]["rows_resumed_from_checkpoint"] = flow_state["rows_resumed_count"]
+    rows_failed_count = flow_state["rows_failed_count"]
+    row_level_failure_counts = flow_state["row_level_failure_counts"]
 
     run_metrics["tasks"]["pipeline_main_loop_duration_seconds"] = time.time() - pipeline_loop_start_time
     run_metrics["data_processing_stats"]["rows_successfully_processed_main_flow"] = \
@@ -469,12 +372,16 @@ def execute_pipeline_flow(
     run_metrics["data_processing_stats"]["row_level_failure_summary"] = dict(row_level_failure_counts)
     logger.info(f"Main processing loop complete. Processed {rows_processed_count} rows.")
 
+    all_golden_partner_match_outputs: List[GoldenPartnerMatchOutput] = []
+    for position in sorted(flow_state["outputs_by_position"]):
+        all_golden_partner_match_outputs.extend(flow_state["outputs_by_position"][position])
+
     true_base_scraper_status: Dict[str, str] = {}
     true_base_to_pathful_map: Dict[str, List[str]] = {}
 
     # Populate true_base_scraper_status and true_base_to_pathful_map
     # This aggregates status from individual pathful URL scrapes to their true base domain.
-    for pathful_url, status in canonical_site_pathful_scraper_status.items():
+    for pathful_url, status in flow_state["canonical_site_pathful_scraper_status"].items():
         true_base = get_canonical_base_url(pathful_url)
         if true_base:
             true_base_to_pathful_map.setdefault(true_base, []).append(pathful_url)
@@ -489,14 +396,730 @@ def execute_pipeline_flow(
             # If both are errors, the last one processed for that true_base will stick.
 
     logger.info("Pipeline flow execution finished.")
-    
+
     return (
         df,
         all_golden_partner_match_outputs,
-        attrition_data_list,
-        canonical_domain_journey_data,
+        flow_state["attrition_data_list"],
+        flow_state["canonical_domain_journey_data"],
         true_base_scraper_status,
         true_base_to_pathful_map,
-        input_to_canonical_map,
+        flow_state["input_to_canonical_map"],
         dict(row_level_failure_counts)
-    )
\ No newline at end of file
+    )
+
+
+async def _start_browser_pool(app_config: AppConfig, scrape_concurrency: int) -> Optional[BrowserPool]:
+    """
+    Starts the run-wide browser pool, or returns None if it is disabled or fails to start.
+
+    Without a pool, `scrape_website` launches a browser per row as before.
+    """
+    if not app_config.browser_pool_enabled:
+        return None
+    pool_size = app_config.browser_pool_size if app_config.browser_pool_size > 0 else scrape_concurrency
+    browser_pool = BrowserPool(
+        app_config,
+        size=pool_size,
+        max_pages_per_browser=app_config.browser_pool_max_pages_per_browser,
+        max_memory_mb=app_config.browser_pool_max_memory_mb
+    )
+    try:
+        await browser_pool.start()
+    except Exception as e_pool:
+        logger.error(f"Failed to start browser pool: {e_pool}. Falling back to one browser per row.", exc_info=True)
+        await browser_pool.close()
+        return None
+    return browser_pool
+
+
+def _domain_lock_for_row(flow_state: Dict[str, Any], row_result: Dict[str, Any]) -> Any:
+    """Returns the lock for the row's input canonical domain, or a no-op context if it has none."""
+    input_canonical = get_input_canonical_url(row_result["given_url_raw"])
+    if not input_canonical:
+        return contextlib.nullcontext()
+    return flow_state["domain_locks"].setdefault(input_canonical, asyncio.Lock())
+
+
+def _new_row_result(flow_state: Dict[str, Any], position: int, index: Any, row: pd.Series) -> Dict[str, Any]:
+    """Creates the result record that the pipeline stages fill in for one input row."""
+    flow_state["rows_processed_count"] += 1
+    company_name_str: str = str(row.get(flow_state["company_name_col_key"], f"MissingCompanyName_Row_{index}"))
+    given_url_original: Optional[str] = row.get(flow_state["url_col_key"])
+    given_url_original_str: str = str(given_url_original) if given_url_original else "MissingURL"
+    return {
+        "position": position,
+        "index": index,
+        "company_name": company_name_str,
+        "given_url": given_url_original_str,
+        "given_url_raw": given_url_original,
+        "log_identifier": f"[RowID: {index}, Company: {company_name_str}, URL: {given_url_original_str}]",
+        "df_updates": {},             # Column -> value to set on df.at[index, column]
+        "pathful_scraper_status": None,  # (pathful_url, scraper_status) once scraping ran
+        "failures": [],               # Pending log_row_failure calls
+        "failed": False,              # Counts towards rows_failed_main_flow
+        "outputs": [],                # GoldenPartnerMatchOutput objects for this row
+        "journey_update": None,       # Canonical domain journey contribution
+        # Data handed from one stage to the next
+        "processed_url": None,
+        "scraper_status": "Not_Run",
+        "final_canonical_entry_url": None,  # Pathful canonical URL from scraper
+        "true_base_domain": None,
+        "collected_summary_text": None,     # Released once the summary stage has run
+        "llm_file_prefix": None,
+        "website_summary_obj": None,
+        "detailed_attributes_obj": None,
+        "final_match_output": None,
+        "llm_calls": 0,               # LLM calls made for this row
+        "llm_tokens": 0,              # Total tokens used by those calls
+        "deduplicated_from": None,    # Index of the group leader if results were reused from it
+    }
+
+
+def _add_row_failure(
+    row_result: Dict[str, Any],
+    stage_of_failure: str,
+    error_reason: str,
+    error_details: str,
+    associated_pathful_canonical_url: Optional[str] = None,
+    count_as_failed_row: bool = True
+) -> None:
+    """Queues a failure-log entry for the row; it is written when the row result is merged."""
+    row_result["failures"].append({
+        "stage_of_failure": stage_of_failure,
+        "error_reason": error_reason,
+        "log_timestamp": datetime.now().isoformat(),
+        "error_details": error_details,
+        "associated_pathful_canonical_url": associated_pathful_canonical_url,
+    })
+    if count_as_failed_row:
+        row_result["failed"] = True
+
+
+def _add_placeholder_output(row_result: Dict[str, Any], match_rationale: str, input_summary_url: Optional[str] = None) -> None:
+    """Appends the minimal GoldenPartnerMatchOutput used for rows that did not reach the final LLM stage."""
+    row_result["outputs"].append(
+        GoldenPartnerMatchOutput(
+            analyzed_company_url=row_result["given_url"],
+            analyzed_company_attributes=DetailedCompanyAttributes(
+                input_summary_url=input_summary_url or row_result["given_url"]
+            ),
+            match_rationale_features=[match_rationale]
+        )
+    )
+
+
+def _accumulate_token_stats(
+    run_metrics: Dict[str, Any],
+    token_stats: Optional[Dict[str, int]],
+    call_counter_key: str,
+    row_result: Optional[Dict[str, Any]] = None
+) -> None:
+    """Adds the token usage of one LLM call to the run-level LLM statistics and, if given, to the row."""
+    if row_result is not None:
+        row_result["llm_calls"] += 1
+        row_result["llm_tokens"] += (token_stats or {}).get("total_tokens", 0)
+    if not token_stats:
+        return
+    llm_stats = run_metrics["llm_processing_stats"]
+    llm_stats["total_llm_prompt_tokens"] += token_stats.get("prompt_tokens", 0)
+    llm_stats["total_llm_completion_tokens"] += token_stats.get("completion_tokens", 0)
+    llm_stats["total_llm_tokens_overall"] += token_stats.get("total_tokens", 0)
+    llm_stats[call_counter_key] = llm_stats.get(call_counter_key, 0) + 1
+    if "cache_hits" in token_stats or "cache_misses" in token_stats:
+        cache_stats = llm_stats.setdefault("llm_cache_stats", {}).setdefault(
+            call_counter_key, {"hits": 0, "misses": 0, "tokens_saved": 0}
+        )
+        cache_stats["hits"] += token_stats.get("cache_hits", 0)
+        cache_stats["misses"] += token_stats.get("cache_misses", 0)
+        cache_stats["tokens_saved"] += token_stats.get("cached_total_tokens", 0)
+    if token_stats.get("partners_omitted"):
+        ranking_stats = llm_stats.get("golden_partner_ranking")
+        if ranking_stats is not None:
+            ranking_stats["prompts_reduced"] += 1
+            ranking_stats["partners_omitted_total"] += token_stats["partners_omitted"]
+            ranking_stats["prompt_tokens_saved"] += token_stats.get("partner_prompt_tokens_saved", 0)
+
+
+# Fields of a row result that are saved in checkpoints. Pydantic objects are stored as dicts.
+_CHECKPOINT_FIELDS = (
+    "df_updates", "pathful_scraper_status", "failures", "failed", "journey_update",
+    "processed_url", "scraper_status", "final_canonical_entry_url", "true_base_domain",
+    "collected_summary_text", "llm_file_prefix", "llm_calls", "llm_tokens",
+)
+_CHECKPOINT_MODEL_FIELDS = {
+    "website_summary_obj": WebsiteTextSummary,
+    "detailed_attributes_obj": DetailedCompanyAttributes,
+    "final_match_output": GoldenPartnerMatchOutput,
+}
+
+
+def _checkpoint_row(flow_state: Dict[str, Any], row_result: Dict[str, Any], stage: str) -> None:
+    """Saves a snapshot of the row result as having finished `stage`, if checkpointing is enabled."""
+    checkpoint_store: Optional[PipelineCheckpointStore] = flow_state["checkpoint_store"]
+    if not checkpoint_store:
+        return
+    state: Dict[str, Any] = {field: row_result[field] for field in _CHECKPOINT_FIELDS}
+    for field in _CHECKPOINT_MODEL_FIELDS:
+        model_obj = row_result[field]
+        state[field] = model_obj.model_dump(mode="json") if model_obj is not None else None
+    state["outputs"] = [output.model_dump(mode="json") for output in row_result["outputs"]]
+    try:
+        checkpoint_store.save_row(row_result["position"], row_result["index"], stage, state)
+    except Exception as e_checkpoint:
+        logger.error(f"{row_result['log_identifier']} Failed to save checkpoint at stage '{stage}': {e_checkpoint}")
+
+
+def _restore_row_result(flow_state: Dict[str, Any], row_result: Dict[str, Any]) -> Optional[str]:
+    """
+    Restores a row result from the resume checkpoints, if the row has one.
+
+    Returns:
+        The stage the row had finished, or None if the row has no saved progress.
+    """
+    checkpoint = flow_state["resume_checkpoints"].pop(row_result["position"], None)
+    if checkpoint is None:
+        return None
+    stage, state = checkpoint
+    if stage not in _RESUME_STAGE_INDEX and stage != STAGE_COMPLETE:
+        logger.warning(f"{row_result['log_identifier']} Ignoring checkpoint with unknown stage '{stage}'.")
+        return None
+    for field in _CHECKPOINT_FIELDS:
+        if field in state:
+            row_result[field] = state[field]
+    if row_result["pathful_scraper_status"]:
+        row_result["pathful_scraper_status"] = tuple(row_result["pathful_scraper_status"])
+    for field, model_cls in _CHECKPOINT_MODEL_FIELDS.items():
+        if state.get(field) is not None:
+            row_result[field] = model_cls.model_validate(state[field])
+    row_result["outputs"] = [GoldenPartnerMatchOutput.model_validate(output) for output in state.get("outputs", [])]
+    flow_state["rows_resumed_count"] += 1
+    return stage
+
+
+async def _run_stage(stage_fn: Any, flow_state: Dict[str, Any], row_result: Dict[str, Any]) -> bool:
+    """
+    Runs one stage function for a row, converting unhandled exceptions into a row failure.
+
+    Returns:
+        True if the row should continue to the next stage, False otherwise.
+    """
+    try:
+        continue_row = await stage_fn(flow_state, row_result)
+        if continue_row and stage_fn in _STAGE_CHECKPOINTS:
+            _checkpoint_row(flow_state, row_result, _STAGE_CHECKPOINTS[stage_fn])
+        return continue_row
+    except Exception as e_row_processing:
+        log_identifier = row_result["log_identifier"]
+        logger.error(
+            f"{log_identifier} Unhandled error for row {row_result['position'] + 1}: {e_row_processing}",
+            exc_info=True
+        )
+        flow_state["run_metrics"]["errors_encountered"].append(
+            f"Row error for {row_result['company_name']} (URL: {row_result['given_url']}): {str(e_row_processing)}"
+        )
+        _add_row_failure(
+            row_result, "RowProcessing_UnhandledException", "Unhandled exception in main loop",
+            json.dumps({
+                "exception_type": type(e_row_processing).__name__,
+                "exception_message": str(e_row_processing)
+            }),
+            associated_pathful_canonical_url=row_result["final_canonical_entry_url"]
+        )
+        _add_placeholder_output(row_result, f"Unhandled Exception: {str(e_row_processing)}")
+        row_result["collected_summary_text"] = None
+        return False
+
+
+async def _process_row(flow_state: Dict[str, Any], row_result: Dict[str, Any], resumed_stage: Optional[str] = None) -> None:
+    """
+    Runs URL validation, scraping and the three LLM stages for a single input row.
+
+    If `resumed_stage` is given, the row was restored from a checkpoint and only
+    the stages after it are run.
+
+    Shared aggregates are not touched here (apart from run metrics counters); all
+    per-row outcomes are recorded in `row_result` and applied by `_merge_row_result`.
+    """
+    logger.info(f"{row_result['log_identifier']} --- Processing row {row_result['position'] + 1}/{flow_state['total_rows']} ---")
+    stage_fns = [_stage_scrape, _stage_summarize, _stage_extract_attributes, _stage_sales_insights]
+    if resumed_stage:
+        stage_fns = stage_fns[_RESUME_STAGE_INDEX[resumed_stage]:]
+        logger.info(f"{row_result['log_identifier']} Resuming after checkpointed stage '{resumed_stage}'.")
+    elif not _stage_validate_url(flow_state, row_result):
+        return
+    for stage_fn in stage_fns:
+        if not await _run_stage(stage_fn, flow_state, row_result):
+            return
+
+
+async def _run_staged_flow(flow_state: Dict[str, Any], row_iterator: Iterator[Tuple[int, Tuple[Any, pd.Series]]]) -> None:
+    """
+    Runs the pipeline as independent stages connected by bounded queues.
+
+    Scrape workers pull rows from `row_iterator` and push rows that need LLM
+    processing onto the summarize queue. Each LLM stage has its own worker pool
+    and hands successful rows to the next stage's queue. Because the queues are
+    bounded, a slow stage blocks the stage in front of it instead of letting
+    scraped text accumulate. Rows that end at any stage are merged immediately.
+    """
+    app_config: AppConfig = flow_state["app_config"]
+    queue_size = max(1, app_config.pipeline_stage_queue_size)
+    summarize_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    extract_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    insights_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    # Rows restored from a checkpoint enter the pipeline at the stage after their last finished one
+    resume_queues = {
+        STAGE_SCRAPED: summarize_queue,
+        STAGE_SUMMARIZED: extract_queue,
+        STAGE_EXTRACTED: insights_queue,
+    }
+
+    async def _scrape_worker() -> None:
+        for position, (index, row_series) in row_iterator:
+            row_result = _new_row_result(flow_state, position, index, row_series)
+            resumed_stage = _restore_row_result(flow_state, row_result)
+            if resumed_stage == STAGE_COMPLETE:
+                _merge_row_result(flow_state, row_result, replayed=True)
+                continue
+            if resumed_stage:
+                logger.info(f"{row_result['log_identifier']} Resuming after checkpointed stage '{resumed_stage}'.")
+                await resume_queues[resumed_stage].put(row_result)
+                continue
+            logger.info(f"{row_result['log_identifier']} --- Scraping row {position + 1}/{flow_state['total_rows']} ---")
+            if not _stage_validate_url(flow_state, row_result):
+                _merge_row_result(flow_state, row_result)
+                continue
+            async with _domain_lock_for_row(flow_state, row_result):
+                continue_row = await _run_stage(_stage_scrape, flow_state, row_result)
+            if continue_row:
+                await summarize_queue.put(row_result)
+            else:
+                _merge_row_result(flow_state, row_result)
+
+    async def _llm_worker(stage_fn: Any, in_queue: asyncio.Queue, out_queue: Optional[asyncio.Queue]) -> None:
+        while True:
+            row_result = await in_queue.get()
+            if row_result is None:  # Shutdown sentinel
+                break
+            continue_row = await _run_stage(stage_fn, flow_state, row_result)
+            if continue_row and out_queue is not None:
+                await out_queue.put(row_result)
+            else:
+                _merge_row_result(flow_state, row_result)
+
+    async def _run_pool(worker_count: int, worker_factory: Any, next_queue: Optional[asyncio.Queue], next_worker_count: int) -> None:
+        # Wait for this stage's workers, then tell the next stage's workers to stop.
+        # Sentinels are sent even if a worker raised, so downstream stages never wait forever.
+        try:
+            await asyncio.gather(*[asyncio.create_task(worker_factory()) for _ in range(max(1, worker_count))])
+        finally:
+            if next_queue is not None:
+                for _ in range(max(1, next_worker_count)):
+                    await next_queue.put(None)
+
+    await asyncio.gather(
+        _run_pool(app_config.pipeline_scrape_workers, _scrape_worker,
+                  summarize_queue, app_config.pipeline_summarize_workers),
+        _run_pool(app_config.pipeline_summarize_workers,
+                  lambda: _llm_worker(_stage_summarize, summarize_queue, extract_queue),
+                  extract_queue, app_config.pipeline_extract_workers),
+        _run_pool(app_config.pipeline_extract_workers,
+                  lambda: _llm_worker(_stage_extract_attributes, extract_queue, insights_queue),
+                  insights_queue, app_config.pipeline_insights_workers),
+        _run_pool(app_config.pipeline_insights_workers,
+                  lambda: _llm_worker(_stage_sales_insights, insights_queue, None),
+                  None, 0),
+    )
+
+
+def _stage_validate_url(flow_state: Dict[str, Any], row_result: Dict[str, Any]) -> bool:
+    """Stage 1: URL validation. Returns True if the row has a usable URL."""
+    processed_url, url_status = process_input_url(
+        row_result["given_url_raw"], flow_state["app_config"].url_probing_tlds, row_result["log_identifier"]
+    )
+    row_result["processed_url"] = processed_url
+    if url_status == "InvalidURL":
+        row_result["df_updates"]['ScrapingStatus'] = 'InvalidURL'
+        flow_state["run_metrics"]["scraping_stats"]["scraping_failure_invalid_url"] += 1
+        _add_row_failure(
+            row_result, "URL_Validation_InvalidOrMissing",
+            f"Invalid or missing URL: {processed_url}",
+            json.dumps({"original_url": row_result["given_url"], "processed_url": processed_url})
+        )
+        _add_placeholder_output(row_result, f"Failed at URL Validation: {url_status}")
+        return False
+    return True
+
+
+async def _stage_scrape(flow_state: Dict[str, Any], row_result: Dict[str, Any]) -> bool:
+    """Stage 2: scrape the website. Returns True if text was collected for the LLM stages."""
+    run_metrics: Dict[str, Any] = flow_state["run_metrics"]
+    log_identifier = row_result["log_identifier"]
+    processed_url = row_result["processed_url"]
+    assert processed_url is not None
+    run_metrics["scraping_stats"]["urls_processed_for_scraping"] += 1
+    scrape_task_start_time = time.time()
+
+    logger.info(f"{log_identifier} Starting website scraping for: {processed_url}")
+    # scrape_website returns:
+    # (scraped_pages_details, scraper_status, final_canonical_entry_url, collected_summary_text)
+    scraped_pages_details, scraper_status, final_canonical_entry_url, collected_summary_text = await scrape_website(
+        processed_url, flow_state["run_output_dir"], row_result["company_name"],
+        flow_state["globally_processed_urls"], row_result["index"],
+        browser_pool=flow_state["browser_pool"], http_client=flow_state["http_client"]
+    )
+    checkpoint_store: Optional[PipelineCheckpointStore] = flow_state["checkpoint_store"]
+    if checkpoint_store and scraped_pages_details:
+        # Details are (cleaned_page_filepath, landed_url, page_type) tuples
+        checkpoint_store.add_processed_urls(landed_url for _, landed_url, _ in scraped_pages_details)
+    run_metrics["tasks"].setdefault("scrape_website_total_duration_seconds", 0)
+    run_metrics["tasks"]["scrape_website_total_duration_seconds"] += (time.time() - scrape_task_start_time)
+
+    true_base_domain_for_row = get_canonical_base_url(final_canonical_entry_url) \
+        if final_canonical_entry_url else None
+    row_result["scraper_status"] = scraper_status
+    row_result["final_canonical_entry_url"] = final_canonical_entry_url
+    row_result["true_base_domain"] = true_base_domain_for_row
+    row_result["df_updates"]['ScrapingStatus'] = scraper_status
+    row_result["df_updates"]['CanonicalEntryURL'] = true_base_domain_for_row  # Store true_base
+    # Store status for the specific pathful URL that was the entry point for scraping
+    row_result["pathful_scraper_status"] = (
+        final_canonical_entry_url if final_canonical_entry_url else processed_url,
+        scraper_status
+    )
+
+    if scraper_status != "Success":
+        logger.warning(f"{log_identifier} Scraping failed or was skipped. Status: {scraper_status}")
+        _add_row_failure(
+            row_result, f"Scraping_{scraper_status}",
+            f"Scraper status: {scraper_status}",
+            json.dumps({
+                "pathful_canonical_url": final_canonical_entry_url,
+                "true_base_domain": true_base_domain_for_row
+            }),
+            associated_pathful_canonical_url=final_canonical_entry_url
+        )
+        _add_placeholder_output(row_result, f"Failed at Scraping: {scraper_status}")
+        return False
+
+    if not collected_summary_text or not collected_summary_text.strip():
+        logger.warning(f"{log_identifier} No text collected from scraped pages. Skipping LLM calls.")
+        _add_row_failure(
+            row_result, "LLM_Input_NoScrapedText", "No text content available after scraping.",
+            json.dumps({"pathful_canonical_url": final_canonical_entry_url})
+        )
+        _add_placeholder_output(row_result, "No text collected from website scraping")
+        return False
+
+    logger.info(f"{log_identifier} Collected {len(collected_summary_text)} characters for LLM processing.")
+    row_result["collected_summary_text"] = collected_summary_text
+    row_result["llm_file_prefix"] = sanitize_filename_component(
+        f"Row{row_result['index']}_{row_result['company_name'][:20]}_{str(time.time())[-5:]}", max_len=50
+    )
+    return True
+
+
+async def _stage_summarize(flow_state: Dict[str, Any], row_result: Dict[str, Any]) -> bool:
+    """
+    Stage 3: LLM Call 1, generate the website summary. Returns True on success.
+
+    In combined mode (`llm_combined_summary_extraction`) this single call also
+    extracts the detailed attributes, and stage 4 is skipped.
+    """
+    log_identifier = row_result["log_identifier"]
+    collected_summary_text = row_result["collected_summary_text"]
+    row_result["collected_summary_text"] = None  # The raw text is not needed past this stage
+
+    if flow_state["app_config"].llm_combined_summary_extraction:
+        return await _summarize_and_extract_combined(flow_state, row_result, collected_summary_text)
+
+    summary_obj_tuple = await generate_website_summary(
+        gemini_client=flow_state["gemini_client"],
+        config=flow_state["app_config"],
+        original_url=row_result["given_url"],
+        scraped_text=collected_summary_text,
+        llm_context_dir=flow_state["llm_context_dir"],
+        llm_requests_dir=flow_state["llm_requests_dir"],
+        file_identifier_prefix=row_result["llm_file_prefix"],
+        triggering_input_row_id=row_result["index"],
+        triggering_company_name=row_result["company_name"]
+    )
+    website_summary_obj = summary_obj_tuple[0]
+    row_result["website_summary_obj"] = website_summary_obj
+    _accumulate_token_stats(flow_state["run_metrics"], summary_obj_tuple[2], "llm_calls_summary_generation", row_result)
+
+    if not website_summary_obj or not website_summary_obj.summary:
+        logger.warning(f"{log_identifier} LLM Call 1 (Summarization) failed. Raw: {summary_obj_tuple[1]}")
+        _add_row_failure(
+            row_result, "LLM_Summarization_Failed", "Failed to generate website summary.",
+            json.dumps({"raw_response": summary_obj_tuple[1] or "N/A"})
+        )
+        _add_placeholder_output(row_result, "LLM Summarization Failed")
+        return False
+    logger.info(f"{log_identifier} LLM Call 1 (Summarization) successful.")
+    return True
+
+
+async def _summarize_and_extract_combined(
+    flow_state: Dict[str, Any], row_result: Dict[str, Any], collected_summary_text: str
+) -> bool:
+    """Stage 3 in combined mode: one structured-output call for the summary and the detailed attributes."""
+    log_identifier = row_result["log_identifier"]
+    website_summary_obj, detailed_attributes_obj, raw_response, token_stats = await generate_summary_and_attributes(
+        gemini_client=flow_state["gemini_client"],
+        config=flow_state["app_config"],
+        original_url=row_result["given_url"],
+        scraped_text=collected_summary_text,
+        llm_context_dir=flow_state["llm_context_dir"],
+        llm_requests_dir=flow_state["llm_requests_dir"],
+        file_identifier_prefix=row_result["llm_file_prefix"],
+        triggering_input_row_id=row_result["index"],
+        triggering_company_name=row_result["company_name"]
+    )
+    _accumulate_token_stats(flow_state["run_metrics"], token_stats, "llm_calls_summary_and_attributes", row_result)
+
+    if not website_summary_obj or not website_summary_obj.summary or not detailed_attributes_obj:
+        logger.warning(f"{log_identifier} LLM Call 1+2 (Combined Summary and Attribute Extraction) failed. Raw: {raw_response}")
+        _add_row_failure(
+            row_result, "LLM_SummaryAndAttributes_Failed", "Failed to generate website summary and attributes.",
+            json.dumps({"raw_response": raw_response or "N/A"})
+        )
+        _add_placeholder_output(row_result, "LLM Summary and Attribute Extraction Failed")
+        return False
+    row_result["website_summary_obj"] = website_summary_obj
+    row_result["detailed_attributes_obj"] = detailed_attributes_obj
+    logger.info(f"{log_identifier} LLM Call 1+2 (Combined Summary and Attribute Extraction) successful.")
+    return True
+
+
+async def _stage_extract_attributes(flow_state: Dict[str, Any], row_result: Dict[str, Any]) -> bool:
+    """Stage 4: LLM Call 2, extract detailed attributes from the summary. Returns True on success."""
+    log_identifier = row_result["log_identifier"]
+    if row_result["detailed_attributes_obj"] is not None:
+        return True  # Already extracted by the combined call in stage 3
+    website_summary_obj: WebsiteTextSummary = row_result["website_summary_obj"]
+
+    attributes_obj_tuple = await extract_detailed_attributes(
+        gemini_client=flow_state["gemini_client"],
+        config=flow_state["app_config"],
+        summary_obj=website_summary_obj,
+        llm_context_dir=flow_state["llm_context_dir"],
+        llm_requests_dir=flow_state["llm_requests_dir"],
+        file_identifier_prefix=row_result["llm_file_prefix"],
+        triggering_input_row_id=row_result["index"],
+        triggering_company_name=row_result["company_name"]
+    )
+    detailed_attributes_obj = attributes_obj_tuple[0]
+    row_result["detailed_attributes_obj"] = detailed_attributes_obj
+    _accumulate_token_stats(flow_state["run_metrics"], attributes_obj_tuple[2], "llm_calls_attribute_extraction", row_result)
+
+    if not detailed_attributes_obj:
+        logger.warning(f"{log_identifier} LLM Call 2 (Attribute Extraction) failed. Raw: {attributes_obj_tuple[1]}")
+        _add_row_failure(
+            row_result, "LLM_AttributeExtraction_Failed", "Failed to extract detailed attributes.",
+            json.dumps({"raw_response": attributes_obj_tuple[1] or "N/A"})
+        )
+        _add_placeholder_output(
+            row_result, "LLM Attribute Extraction Failed",
+            input_summary_url=website_summary_obj.original_url if website_summary_obj else None
+        )
+        return False
+    logger.info(f"{log_identifier} LLM Call 2 (Attribute Extraction) successful.")
+    return True
+
+
+async def _stage_sales_insights(flow_state: Dict[str, Any], row_result: Dict[str, Any]) -> bool:
+    """Stage 5: LLM Call 3, generate sales insights and compare against golden partners."""
+    log_identifier = row_result["log_identifier"]
+    website_summary_obj: WebsiteTextSummary = row_result["website_summary_obj"]
+    detailed_attributes_obj: DetailedCompanyAttributes = row_result["detailed_attributes_obj"]
+
+    sales_insights_obj_tuple = await generate_sales_insights(
+        gemini_client=flow_state["gemini_client"],
+        config=flow_state["app_config"],
+        target_attributes=detailed_attributes_obj,
+        website_summary_obj=website_summary_obj,
+        golden_partner_summaries=flow_state["golden_partner_summaries"],
+        llm_context_dir=flow_state["llm_context_dir"],
+        llm_requests_dir=flow_state["llm_requests_dir"],
+        file_identifier_prefix=row_result["llm_file_prefix"],
+        triggering_input_row_id=row_result["index"],
+        triggering_company_name=row_result["company_name"],
+        partner_ranker=flow_state["partner_ranker"]
+    )
+    final_match_output = sales_insights_obj_tuple[0]
+    row_result["final_match_output"] = final_match_output
+    _accumulate_token_stats(flow_state["run_metrics"], sales_insights_obj_tuple[2], "llm_calls_sales_insights", row_result)
+
+    if not final_match_output:
+        logger.warning(f"{log_identifier} LLM Call 3 (Sales Insights) failed. Raw: {sales_insights_obj_tuple[1]}")
+        _add_row_failure(
+            row_result, "LLM_SalesInsights_Failed", "Failed to generate sales insights.",
+            json.dumps({"raw_response": sales_insights_obj_tuple[1] or "N/A"}),
+            count_as_failed_row=False
+        )
+        # Still add a partial output if attributes were extracted
+        row_result["outputs"].append(
+            GoldenPartnerMatchOutput(
+                analyzed_company_url=detailed_attributes_obj.input_summary_url,
+                analyzed_company_attributes=detailed_attributes_obj,
+                match_rationale_features=["LLM Sales Insights Generation Failed"]
+            )
+        )
+    else:
+        logger.info(f"{log_identifier} LLM Call 3 (Sales Insights) successful.")
+        row_result["outputs"].append(final_match_output)
+    # --- End of LLM Flow for a row ---
+
+    current_succeeded_stages = 0
+    if website_summary_obj: current_succeeded_stages += 1
+    if detailed_attributes_obj: current_succeeded_stages += 1
+    if final_match_output: current_succeeded_stages += 1
+    row_result["journey_update"] = {
+        "true_base_domain": row_result["true_base_domain"],
+        "final_canonical_entry_url": row_result["final_canonical_entry_url"],
+        "scraper_status": row_result["scraper_status"],
+        "llm_stages_succeeded": current_succeeded_stages,
+    }
+
+    logger.info(f"{log_identifier} Row {row_result['position'] + 1} processing complete.")
+    return True
+
+
+# Checkpoint stage recorded when each stage function succeeds. The sales-insights
+# stage is checkpointed as STAGE_COMPLETE when the row result is merged.
+_STAGE_CHECKPOINTS = {
+    _stage_scrape: STAGE_SCRAPED,
+    _stage_summarize: STAGE_SUMMARIZED,
+    _stage_extract_attributes: STAGE_EXTRACTED,
+}
+# Index into the row's stage list at which a row checkpointed at a given stage resumes
+_RESUME_STAGE_INDEX = {
+    STAGE_SCRAPED: 1,
+    STAGE_SUMMARIZED: 2,
+    STAGE_EXTRACTED: 3,
+}
+
+
+def _merge_row_result(flow_state: Dict[str, Any], row_result: Dict[str, Any], replayed: bool = False) -> None:
+    """
+    Applies one row result, and the results fanned out to its domain followers, to the shared state.
+
+    Always called on the event loop thread, so no locking is required. For rows
+    `replayed` from a checkpoint the failures were already written to the failure
+    CSV by the earlier run, so they are only counted. Their followers' savings
+    were also made by the earlier run and are not counted again.
+    """
+    _apply_row_result(flow_state, row_result, replayed)
+    for follower_position in flow_state["domain_followers"].pop(row_result["position"], []):
+        follower_result = _follower_row_result(flow_state, row_result, follower_position)
+        _apply_row_result(flow_state, follower_result, replayed)
+        if not replayed:
+            _record_dedup_savings(flow_state, row_result)
+
+
+def _follower_row_result(flow_state: Dict[str, Any], leader_result: Dict[str, Any], position: int) -> Dict[str, Any]:
+    """
+    Builds the row result of a domain follower from its group leader's result.
+
+    Failures and outputs are copied, with the leader's input URL replaced by the
+    follower's so that reports match them to the follower row.
+    """
+    df: pd.DataFrame = flow_state["df"]
+    follower_result = _new_row_result(flow_state, position, df.index[position], df.iloc[position])
+    follower_result["deduplicated_from"] = leader_result["index"]
+    leader_url = leader_result["given_url"]
+    follower_url = follower_result["given_url"]
+    logger.info(f"{follower_result['log_identifier']} Reusing results of RowID {leader_result['index']} (same input domain).")
+
+    for field in ("pathful_scraper_status", "failed", "scraper_status", "final_canonical_entry_url", "true_base_domain"):
+        follower_result[field] = leader_result[field]
+    follower_result["df_updates"] = dict(leader_result["df_updates"])
+    follower_result["failures"] = [dict(failure) for failure in leader_result["failures"]]
+    if leader_result["journey_update"] is not None:
+        follower_result["journey_update"] = dict(leader_result["journey_update"])
+    for leader_output in leader_result["outputs"]:
+        follower_output = leader_output.model_copy(deep=True)
+        if follower_output.analyzed_company_url == leader_url:
+            follower_output.analyzed_company_url = follower_url
+        if follower_output.analyzed_company_attributes.input_summary_url == leader_url:
+            follower_output.analyzed_company_attributes.input_summary_url = follower_url
+        follower_result["outputs"].append(follower_output)
+    return follower_result
+
+
+def _record_dedup_savings(flow_state: Dict[str, Any], leader_result: Dict[str, Any]) -> None:
+    """Counts the scrape and LLM work one follower row did not have to repeat."""
+    dedup_stats = flow_state["run_metrics"]["data_processing_stats"]["domain_dedup"]
+    dedup_stats["rows_deduplicated"] += 1
+    if leader_result["pathful_scraper_status"]:
+        dedup_stats["scrape_calls_saved"] += 1
+    dedup_stats["llm_calls_saved"] += leader_result["llm_calls"]
+    dedup_stats["llm_tokens_saved"] += leader_result["llm_tokens"]
+
+
+def _apply_row_result(flow_state: Dict[str, Any], row_result: Dict[str, Any], replayed: bool = False) -> None:
+    """Applies one row result to the DataFrame, the failure log and the shared aggregates."""
+    df: pd.DataFrame = flow_state["df"]
+    index = row_result["index"]
+    company_name_str = row_result["company_name"]
+    given_url_original_str = row_result["given_url"]
+
+    for column_name, value in row_result["df_updates"].items():
+        df.at[index, column_name] = value
+
+    if row_result["pathful_scraper_status"]:
+        pathful_url, scraper_status = row_result["pathful_scraper_status"]
+        flow_state["canonical_site_pathful_scraper_status"][pathful_url] = scraper_status
+
+    for failure in row_result["failures"]:
+        if not replayed:
+            log_row_failure(
+                flow_state["failure_writer"], index, company_name_str, given_url_original_str,
+                failure["stage_of_failure"], failure["error_reason"], failure["log_timestamp"],
+                failure["error_details"],
+                associated_pathful_canonical_url=failure["associated_pathful_canonical_url"]
+            )
+        flow_state["row_level_failure_counts"][failure["stage_of_failure"]] += 1
+    if not replayed and row_result["deduplicated_from"] is None:
+        # Written right after the failure CSV rows so a resumed run does not log them twice.
+        # Followers are not checkpointed; they are rebuilt from their leader on resume.
+        _checkpoint_row(flow_state, row_result, STAGE_COMPLETE)
+    if row_result["failed"]:
+        flow_state["rows_failed_count"] += 1
+
+    flow_state["outputs_by_position"][row_result["position"]] = row_result["outputs"]
+
+    journey_update = row_result["journey_update"]
+    if journey_update is None:
+        return
+
+    true_base_domain_for_row = journey_update["true_base_domain"]
+    flow_state["input_to_canonical_map"][given_url_original_str] = true_base_domain_for_row
+    if not true_base_domain_for_row:
+        return
+
+    canonical_domain_journey_data = flow_state["canonical_domain_journey_data"]
+    if true_base_domain_for_row not in canonical_domain_journey_data:
+        canonical_domain_journey_data[true_base_domain_for_row] = {
+            "Input_Row_IDs": set(), "Input_CompanyNames": set(),
+            "Input_GivenURLs": set(), "Pathful_URLs_Attempted_List": set(),
+            "Overall_Scraper_Status_For_Domain": "Unknown",
+            "LLM_Stages_Attempted": 0, "LLM_Stages_Succeeded": 0
+        }
+    journey_entry = canonical_domain_journey_data[true_base_domain_for_row]
+    journey_entry["Input_Row_IDs"].add(index)
+    journey_entry["Input_CompanyNames"].add(company_name_str)
+    journey_entry["Input_GivenURLs"].add(given_url_original_str)
+    if journey_update["final_canonical_entry_url"]:
+        journey_entry["Pathful_URLs_Attempted_List"].add(journey_update["final_canonical_entry_url"])
+    # This status might be overwritten by subsequent rows for the same domain;
+    # A more robust aggregation might be needed if per-row status varies widely.
+    journey_entry["Overall_Scraper_Status_For_Domain"] = journey_update["scraper_status"]
+
+    journey_entry["LLM_Stages_Attempted"] = 3  # Assumes all 3 are attempted if scraping succeeds
+    # Maximize succeeded stages if multiple rows hit the same domain
+    journey_entry["LLM_Stages_Succeeded"] = max(
+        journey_entry.get("LLM_Stages_Succeeded", 0), journey_update["llm_stages_succeeded"]
+    )
@@ -120,6 +120,15 @@ def write_run_metrics(
                     "invalid URL, scraping failure, or critical processing exceptions for that row, "
                     "preventing LLM processing or final data consolidation for that specific input.)\n")
             f.write(f"- **Unique True Base Domains Consolidated:** {stats.get('unique_true_base_domains_consolidated', 0)}\n")
+            dedup_stats = stats.get('domain_dedup')
+            if dedup_stats:
+                f.write(f"- **Domain Deduplication:** {dedup_stats.get('rows_deduplicated', 0)} rows reused results from "
+                        f"{dedup_stats.get('groups_with_duplicates', 0)} domain group leaders\n")
+                f.write(f"  - *Scrape Calls Saved:* {dedup_stats.get('scrape_calls_saved', 0)}\n")
+                f.write(f"  - *LLM Calls Saved:* {dedup_stats.get('llm_calls_saved', 0)}\n")
+                f.write(f"  - *LLM Tokens Saved:* {dedup_stats.get('llm_tokens_saved', 0)}\n")
+            if 'rows_resumed_from_checkpoint' in stats:
+                f.write(f"- **Rows Restored From Checkpoint (Resumed Run):** {stats['rows_resumed_from_checkpoint']}\n")
             f.write("\n")
 
             # --- Input Data Duplicate Analysis ---
@@ -180,6 +189,107 @@ def write_run_metrics(
                     f.write(f"  - *{page_type.replace('_', ' ').title()}:* {count}\n")
             else:
                 f.write("  - No page type data recorded.\n")
+
+            crawl_stats = stats.get("summary_crawl")
+            if crawl_stats:
+                mode_label = "summary-driven" if crawl_stats.get("summary_driven_crawl_enabled") else "full"
+                f.write(f"- **Pages Crawled vs. Used for Summary ({mode_label} crawl):**\n")
+                f.write(f"  - *Entry Point Crawls:* {crawl_stats.get('entry_crawls', 0)}\n")
+                f.write(f"  - *Pages Crawled / Used for Summary / Not Used:* {crawl_stats.get('pages_crawled', 0)} / {crawl_stats.get('pages_used_for_summary', 0)} / {crawl_stats.get('pages_not_used_for_summary', 0)}\n")
+                f.write(f"  - *Crawls Stopped Early / Queued URLs Skipped:* {crawl_stats.get('crawls_stopped_early', 0)} / {crawl_stats.get('queued_urls_skipped_by_early_stop', 0)}\n")
+                f.write(f"  - *Pages Extracted in Browser (no DOM transfer):* {crawl_stats.get('pages_extracted_in_browser', 0)}\n")
+
+            politeness_stats = stats.get("host_politeness")
+            if politeness_stats:
+                batch_stats = crawl_stats or {}
+                f.write("- **Concurrent Page Fetching:**\n")
+                f.write(f"  - *Concurrent Batches / Pages Fetched in Batches:* {batch_stats.get('concurrent_fetch_batches', 0)} / {batch_stats.get('pages_fetched_concurrently', 0)}\n")
+                f.write(f"  - *Fetches / Hosts:* {politeness_stats.get('fetches', 0)} / {politeness_stats.get('hosts', 0)}\n")
+                f.write(f"  - *Fetches Delayed for Politeness / Total Delay:* {politeness_stats.get('fetches_delayed', 0)} / {politeness_stats.get('politeness_delay_seconds', 0.0):.2f}s\n")
+                f.write(f"  - *Max Concurrent Fetches per Host:* {politeness_stats.get('max_in_flight_per_host', 0)}\n")
+
+            artifact_stats = stats.get("artifact_store")
+            if artifact_stats:
+                f.write(f"- **Scraped Content Store ({artifact_stats.get('store', 'N/A')}):**\n")
+                f.write(f"  - *Pages Written:* {artifact_stats.get('pages_written', 0)}\n")
+                if artifact_stats.get('store') == 'packed':
+                    f.write(f"  - *Store File:* {artifact_stats.get('path', 'N/A')} ({artifact_stats.get('compression', 'none')})\n")
+                    f.write(f"  - *Bytes Uncompressed / Written (Ratio):* {artifact_stats.get('bytes_uncompressed', 0)} / {artifact_stats.get('bytes_written', 0)} ({artifact_stats.get('compression_ratio', 0.0)}x)\n")
+                else:
+                    f.write(f"  - *Files Created / Bytes Written:* {artifact_stats.get('files_created', 0)} / {artifact_stats.get('bytes_written', 0)}\n")
+
+            networkidle_stats = stats.get("networkidle_policy")
+            if networkidle_stats:
+                f.write("- **Adaptive Network-Idle Waiting:**\n")
+                f.write(f"  - *Waits Performed / Timed Out:* {networkidle_stats.get('waits_performed', 0)} / {networkidle_stats.get('waits_timed_out', 0)} ({networkidle_stats.get('wait_seconds', 0.0):.2f}s)\n")
+                f.write(f"  - *Waits Skipped / Wait Time Avoided:* {networkidle_stats.get('waits_skipped', 0)} / {networkidle_stats.get('wait_seconds_avoided', 0.0):.2f}s\n")
+                f.write(f"  - *Domains Waiting / Skipping / Still Learning:* {networkidle_stats.get('domains_waiting', 0)} / {networkidle_stats.get('domains_skipping', 0)} / {networkidle_stats.get('domains_learning', 0)}\n")
+
+            fallback_stats = stats.get("dns_fallbacks")
+            if fallback_stats and (fallback_stats.get("entry_dns_errors") or fallback_stats.get("fallback_probe_rounds")):
+                f.write("- **DNS Fallback Probing:**\n")
+                f.write(f"  - *Entry Navigations Failed with DNS Error:* {fallback_stats.get('entry_dns_errors', 0)} ({fallback_stats.get('dns_error_navigation_seconds', 0.0):.2f}s)\n")
+                f.write(f"  - *Probe Rounds / Candidates Probed:* {fallback_stats.get('fallback_probe_rounds', 0)} / {fallback_stats.get('candidates_probed', 0)}\n")
+                f.write(f"  - *Live Fallback Found (Win Rate):* {fallback_stats.get('fallback_wins', 0)} ({fallback_stats.get('fallback_win_rate', 0.0):.1%})\n")
+                f.write(f"  - *Browser Navigations Avoided / Est. Time Saved:* {fallback_stats.get('navigations_avoided', 0)} / {fallback_stats.get('estimated_seconds_saved', 0.0):.2f}s\n")
+
+            sitemap_stats = stats.get("sitemap_discovery")
+            if sitemap_stats:
+                f.write("- **Sitemap Discovery:**\n")
+                f.write(f"  - *Sites Checked / With Sitemap URLs:* {sitemap_stats.get('sites_checked', 0)} / {sitemap_stats.get('sites_with_sitemap', 0)}\n")
+                f.write(f"  - *Sitemap Files Fetched / Errors:* {sitemap_stats.get('sitemaps_fetched', 0)} / {sitemap_stats.get('sitemap_errors', 0)}\n")
+                f.write(f"  - *Page URLs Found / Queued as Seeds:* {sitemap_stats.get('page_urls_found', 0)} / {sitemap_stats.get('seed_urls_queued', 0)}\n")
+
+            robots_stats = stats.get("robots_cache")
+            if robots_stats:
+                f.write("- **robots.txt Cache:**\n")
+                f.write(f"  - *Lookups / Cache Hits:* {robots_stats.get('lookups', 0)} / {robots_stats.get('cache_hits', 0)}\n")
+                f.write(f"  - *Downloads:* {robots_stats.get('fetches', 0)}\n")
+                f.write(f"  - *Lookups Sharing an In-Flight Download:* {robots_stats.get('in_flight_shared', 0)}\n")
+                f.write(f"  - *Origins Cached:* {robots_stats.get('origins_cached', 0)}\n")
+
+            dns_stats = stats.get("dns_preflight")
+            if dns_stats:
+                f.write("- **DNS Pre-flight:**\n")
+                f.write(f"  - *Hosts Checked / Unresolvable:* {dns_stats.get('hosts_checked', 0)} / {dns_stats.get('hosts_unresolvable', 0)}\n")
+                f.write(f"  - *Duration:* {dns_stats.get('duration_seconds', 0.0):.2f} seconds\n")
+                resolver_stats = dns_stats.get("resolver", {})
+                if resolver_stats:
+                    f.write(f"  - *Lookups / Cache Hits:* {resolver_stats.get('lookups', 0)} / {resolver_stats.get('cache_hits', 0)}\n")
+                    f.write(f"  - *Timeouts / Temporary Failures:* {resolver_stats.get('timeouts', 0)}\n")
+
+            page_cache_stats = stats.get("page_cache")
+            if page_cache_stats:
+                f.write("- **Page Cache:**\n")
+                f.write(f"  - *Lookups / Hit Rate:* {page_cache_stats.get('lookups', 0)} / {page_cache_stats.get('hit_rate', 0.0):.1%}\n")
+                f.write(f"  - *Hits (304 Not Modified / Unchanged Content):* {page_cache_stats.get('hits_not_modified', 0)} / {page_cache_stats.get('hits_unchanged_content', 0)}\n")
+                f.write(f"  - *Misses / Changed / Revalidation Errors:* {page_cache_stats.get('misses', 0)} / {page_cache_stats.get('revalidated_changed', 0)} / {page_cache_stats.get('revalidation_errors', 0)}\n")
+                f.write(f"  - *Pages Stored:* {page_cache_stats.get('pages_stored', 0)}\n")
+                f.write(f"  - *Bytes Saved:* {page_cache_stats.get('bytes_saved', 0)}\n")
+
+            blocking_stats = stats.get("resource_blocking")
+            if blocking_stats:
+                f.write("- **Browser Resource Blocking:**\n")
+                f.write(f"  - *Contexts Profiled / Allowlisted:* {blocking_stats.get('contexts_profiled', 0)} / {blocking_stats.get('contexts_allowlisted', 0)}\n")
+                f.write(f"  - *Requests Blocked / Continued:* {blocking_stats.get('requests_blocked_total', 0)} / {blocking_stats.get('requests_continued', 0)}\n")
+                f.write(f"  - *Tracker Requests Blocked:* {blocking_stats.get('requests_blocked_tracker', 0)}\n")
+                for resource_type, count in sorted(blocking_stats.get("requests_blocked_by_type", {}).items()):
+                    f.write(f"  - *Blocked {resource_type.title()} Requests:* {count}\n")
+
+            pool_stats = stats.get("browser_pool")
+            if pool_stats:
+                f.write("- **Browser Pool:**\n")
+                f.write(f"  - *Pool Size:* {pool_stats.get('pool_size', 0)}\n")
+                f.write(f"  - *Leases (Rows Scraped):* {pool_stats.get('leases_total', 0)}\n")
+                f.write(f"  - *Peak Leases In Use:* {pool_stats.get('peak_leases_in_use', 0)}\n")
+                f.write(f"  - *Utilisation:* {pool_stats.get('utilisation_ratio', 0.0):.1%}\n")
+                f.write(f"  - *Average Lease Wait:* {pool_stats.get('avg_lease_wait_seconds', 0.0):.2f} seconds\n")
+                f.write(f"  - *Pages Loaded:* {pool_stats.get('pages_loaded_total', 0)}\n")
+                f.write(f"  - *Browser Launches:* {pool_stats.get('browser_launches', 0)}\n")
+                f.write(f"  - *Recycles (Page Limit / Memory Limit / Disconnected):* "
+                        f"{pool_stats.get('browser_recycles_page_limit', 0)} / "
+                        f"{pool_stats.get('browser_recycles_memory_limit', 0)} / "
+                        f"{pool_stats.get('browser_recycles_disconnected', 0)}\n")
             f.write("\n")
 
             # --- Regex Extraction Statistics ---
@@ -202,6 +312,28 @@ def write_run_metrics(
             f.write(f"- **Total LLM Prompt Tokens:** {stats.get('total_llm_prompt_tokens', 0)}\n")
             f.write(f"- **Total LLM Completion Tokens:** {stats.get('total_llm_completion_tokens', 0)}\n")
             f.write(f"- **Total LLM Tokens Overall:** {stats.get('total_llm_tokens_overall', 0)}\n")
+            cache_stats = stats.get('llm_cache_stats', {})
+            if cache_stats:
+                f.write("- **LLM Response Cache (per task):**\n")
+                for call_key, task_cache_stats in cache_stats.items():
+                    f.write(f"  - {call_key}: {task_cache_stats.get('hits', 0)} hits, {task_cache_stats.get('misses', 0)} misses, "
+                            f"{task_cache_stats.get('tokens_saved', 0)} tokens saved\n")
+            ranking_stats = stats.get('golden_partner_ranking')
+            if ranking_stats:
+                f.write("- **Golden Partner Pre-Ranking:**\n")
+                f.write(f"  - *Partners Available / Max in Prompt:* {ranking_stats.get('partners_available', 0)} / {ranking_stats.get('max_partners_in_prompt', 0)}\n")
+                f.write(f"  - *Sales-Insights Prompts Reduced:* {ranking_stats.get('prompts_reduced', 0)}\n")
+                f.write(f"  - *Partner Summaries Omitted (Total):* {ranking_stats.get('partners_omitted_total', 0)}\n")
+                f.write(f"  - *Prompt Tokens Saved (Estimated from Measured Prompt Tokens):* {ranking_stats.get('prompt_tokens_saved', 0)}\n")
+            rate_limit_stats = stats.get('rate_limiter', {})
+            for model_name, limiter_stats in rate_limit_stats.items():
+                f.write(f"- **Rate Limiter ({model_name}):**\n")
+                f.write(f"  - *Limits:* {limiter_stats.get('requests_per_minute_limit', 0)} requests/min, "
+                        f"{limiter_stats.get('tokens_per_minute_limit', 0)} tokens/min (0 = unlimited)\n")
+                f.write(f"  - *Requests Admitted / Delayed:* {limiter_stats.get('requests_admitted', 0)} / {limiter_stats.get('requests_delayed', 0)}\n")
+                f.write(f"  - *Total Wait:* {limiter_stats.get('wait_seconds_total', 0.0):.2f} seconds "
+                        f"(max {limiter_stats.get('max_wait_seconds', 0.0):.2f} seconds)\n")
+                f.write(f"  - *Quota Errors (429):* {limiter_stats.get('rate_limit_errors', 0)}\n")
 
             successful_calls_for_avg = stats.get('llm_successful_calls_with_token_data', 0)
             if successful_calls_for_avg > 0:
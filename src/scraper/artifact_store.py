@@ -0,0 +1,279 @@
+"""
+Storage of scraped page text ("artifacts").
+
+The scraper used to write one `*_cleaned.txt` file per page into a directory
+per source domain. On large runs that means hundreds of thousands of small
+files. Pages are now handed to an `ArtifactSink`:
+
+- `DirectoryArtifactSink` keeps the old one-file-per-page layout.
+- `PackedArtifactSink` appends all pages of a run to a single file,
+  `scraped_content/pages.jsonl.zst` (or `.jsonl.gz`). Each page is one JSON
+  record compressed as its own zstd frame (gzip member), so the file is a
+  valid compressed JSONL stream (`zstd -dc pages.jsonl.zst` or `zcat`) and
+  any record can also be read on its own. A sidecar index
+  (`pages.jsonl.zst.idx`, one JSON line per page with url, offset and length)
+  gives random access by normalized URL through `PackedArtifactReader`.
+
+Both files are append-only, so a resumed run keeps writing to the same store;
+for a URL written twice, the later record wins.
+
+Command line:
+    python -m src.scraper.artifact_store get <store> <url>
+    python -m src.scraper.artifact_store export <store> <output_dir>
+
+`export` recreates the old directory layout from a packed store.
+"""
+import argparse
+import gzip
+import json
+import logging
+import os
+import re
+import sys
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+try:
+    import zstandard  # Optional: smaller and faster than gzip
+except ImportError:
+    zstandard = None
+
+from .scraper_utils import get_safe_filename
+
+logger = logging.getLogger(__name__)
+
+STORE_DIRECTORY = "directory"
+STORE_PACKED = "packed"
+PACKED_STORE_BASENAME = "pages.jsonl"
+INDEX_SUFFIX = ".idx"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _source_dir_name(landed_url: str) -> str:
+    """Directory name of the old layout for a page: its domain without 'www.', sanitized, max 50 chars."""
+    source_domain = urlparse(landed_url).netloc
+    safe_source_name = re.sub(r'^www\.', '', source_domain)
+    safe_source_name = re.sub(r'[^\w.-]', '_', safe_source_name)
+    return safe_source_name[:50]
+
+
+def directory_layout_path(base_dir: str, company_safe_name: str, landed_url: str) -> str:
+    """Returns the path of a page's text file in the one-file-per-page layout."""
+    landed_url_safe_name = get_safe_filename(landed_url, for_url=True)
+    return os.path.join(base_dir, _source_dir_name(landed_url), f"{company_safe_name}__{landed_url_safe_name}_cleaned.txt")
+
+
+class ArtifactSink(ABC):
+    """Destination for the cleaned text of scraped pages."""
+
+    @abstractmethod
+    def write_page(self, company_safe_name: str, landed_url: str, page_type: str, text: str) -> str:
+        """Stores the text of one page. Returns a reference to the stored artifact."""
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns storage statistics suitable for `run_metrics`."""
+
+    def close(self) -> None:
+        """Flushes and closes the sink."""
+
+
+class DirectoryArtifactSink(ArtifactSink):
+    """Writes one text file per page, in a directory per source domain."""
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        self._created_dirs: Set[str] = set()
+        self._stats: Dict[str, Any] = {"store": STORE_DIRECTORY, "pages_written": 0, "files_created": 0, "bytes_written": 0}
+
+    def write_page(self, company_safe_name: str, landed_url: str, page_type: str, text: str) -> str:
+        file_path = directory_layout_path(self.base_dir, company_safe_name, landed_url)
+        page_dir = os.path.dirname(file_path)
+        if page_dir not in self._created_dirs:
+            os.makedirs(page_dir, exist_ok=True)
+            self._created_dirs.add(page_dir)
+        if not os.path.exists(file_path):
+            self._stats["files_created"] += 1
+        with open(file_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        self._stats["pages_written"] += 1
+        self._stats["bytes_written"] += len(text.encode('utf-8'))
+        return file_path
+
+    def get_stats(self) -> Dict[str, Any]:
+        return dict(self._stats)
+
+
+def resolve_compression(requested: str) -> str:
+    """Returns "zstd", "gzip" or "none"; "zstd" falls back to "gzip" if `zstandard` is not installed."""
+    compression = (requested or "zstd").strip().lower()
+    if compression == "zstd" and zstandard is None:
+        logger.warning("ArtifactStore: 'zstandard' is not installed; using gzip compression instead.")
+        return "gzip"
+    if compression not in ("zstd", "gzip", "none"):
+        logger.warning(f"ArtifactStore: unknown compression '{compression}'; using gzip.")
+        return "gzip"
+    return compression
+
+
+def packed_store_path(base_dir: str, compression: str) -> str:
+    """Returns the path of the packed store in `base_dir` for a (resolved) compression."""
+    suffix = {"zstd": ".zst", "gzip": ".gz"}.get(compression, "")
+    return os.path.join(base_dir, PACKED_STORE_BASENAME + suffix)
+
+
+class PackedArtifactSink(ArtifactSink):
+    """Appends pages to a single compressed JSONL file with an offset index."""
+
+    def __init__(self, store_path: str, compression: str, compression_level: int = 3):
+        """
+        Args:
+            store_path (str): Path of the store file; the index is written next to it.
+            compression (str): "zstd", "gzip" or "none" (see `resolve_compression`).
+            compression_level (int): zstd level (gzip uses level 6).
+        """
+        self.store_path = store_path
+        self.index_path = store_path + INDEX_SUFFIX
+        self.compression = compression
+        self._compressor = zstandard.ZstdCompressor(level=compression_level) if compression == "zstd" else None
+        store_dir = os.path.dirname(store_path)
+        if store_dir:
+            os.makedirs(store_dir, exist_ok=True)
+        self._store_file = open(store_path, "ab")
+        self._index_file = open(self.index_path, "a", encoding="utf-8")
+        self._stats: Dict[str, Any] = {
+            "store": STORE_PACKED,
+            "compression": compression,
+            "path": store_path,
+            "pages_written": 0,
+            "bytes_uncompressed": 0,
+            "bytes_written": 0,
+        }
+
+    def _compress(self, data: bytes) -> bytes:
+        if self._compressor is not None:
+            return self._compressor.compress(data)
+        if self.compression == "gzip":
+            return gzip.compress(data, compresslevel=6)
+        return data
+
+    def write_page(self, company_safe_name: str, landed_url: str, page_type: str, text: str) -> str:
+        record = {
+            "url": landed_url,
+            "company": company_safe_name,
+            "page_type": page_type,
+            "written_at": round(time.time(), 3),
+            "text": text,
+        }
+        data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        payload = self._compress(data)
+        offset = self._store_file.tell()
+        self._store_file.write(payload)
+        self._store_file.flush()
+        # The index entry is only written once its record is in the store
+        self._index_file.write(json.dumps({"url": landed_url, "offset": offset, "length": len(payload)}) + "\n")
+        self._index_file.flush()
+        self._stats["pages_written"] += 1
+        self._stats["bytes_uncompressed"] += len(data)
+        self._stats["bytes_written"] += len(payload)
+        return f"{self.store_path}#{offset}"
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats["compression_ratio"] = round(stats["bytes_uncompressed"] / stats["bytes_written"], 2) if stats["bytes_written"] else 0.0
+        return stats
+
+    def close(self) -> None:
+        if not self._store_file.closed:
+            self._store_file.close()
+            self._index_file.close()
+
+
+class PackedArtifactReader:
+    """Random access to the records of a packed store by normalized URL."""
+
+    def __init__(self, store_path: str):
+        self.store_path = store_path
+        self._index: Dict[str, Tuple[int, int]] = {}
+        with open(store_path + INDEX_SUFFIX, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # Torn last line of an interrupted run
+                self._index[entry["url"]] = (entry["offset"], entry["length"])
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._index
+
+    def urls(self) -> Iterator[str]:
+        """Yields the URLs in the store (latest record per URL)."""
+        return iter(self._index)
+
+    def _decode(self, payload: bytes) -> Dict[str, Any]:
+        if payload.startswith(_ZSTD_MAGIC):
+            if zstandard is None:
+                raise RuntimeError("Reading a zstd-compressed store requires the 'zstandard' package.")
+            payload = zstandard.ZstdDecompressor().decompress(payload)
+        elif payload.startswith(b"\x1f\x8b"):
+            payload = gzip.decompress(payload)
+        return json.loads(payload.decode("utf-8"))
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Returns the record stored for `url` (url, company, page_type, written_at, text), or None."""
+        location = self._index.get(url)
+        if location is None:
+            return None
+        offset, length = location
+        with open(self.store_path, "rb") as f:
+            f.seek(offset)
+            return self._decode(f.read(length))
+
+    def iter_records(self) -> Iterator[Dict[str, Any]]:
+        """Yields the latest record of every URL, in store order."""
+        with open(self.store_path, "rb") as f:
+            for offset, length in sorted(self._index.values()):
+                f.seek(offset)
+                yield self._decode(f.read(length))
+
+
+def export_to_directory(store_path: str, output_dir: str) -> int:
+    """Writes every page of a packed store into the one-file-per-page layout. Returns the page count."""
+    sink = DirectoryArtifactSink(output_dir)
+    for record in PackedArtifactReader(store_path).iter_records():
+        sink.write_page(record["company"], record["url"], record.get("page_type", ""), record["text"])
+    return sink.get_stats()["pages_written"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Read or export a packed scrape artifact store.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    get_parser = subparsers.add_parser("get", help="Print the text stored for a normalized URL.")
+    get_parser.add_argument("store", help="Path of pages.jsonl.zst / pages.jsonl.gz")
+    get_parser.add_argument("url")
+    export_parser = subparsers.add_parser("export", help="Recreate the one-file-per-page directory layout.")
+    export_parser.add_argument("store", help="Path of pages.jsonl.zst / pages.jsonl.gz")
+    export_parser.add_argument("output_dir")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)  # get_safe_filename logs every file name
+
+    if args.command == "get":
+        record = PackedArtifactReader(args.store).get(args.url)
+        if record is None:
+            print(f"No page stored for {args.url}", file=sys.stderr)
+            sys.exit(1)
+        print(record["text"])
+    else:
+        count = export_to_directory(args.store, args.output_dir)
+        print(f"Exported {count} page(s) to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Long-lived Playwright browser pool shared by all rows of a pipeline run.
+
+Launching Chromium for every input row costs roughly a second and a few
+hundred MB of memory churn per company. `BrowserPool` keeps a fixed number of
+browsers alive for the whole run and leases a fresh browser context per row
+(one lease per browser at a time), so cookies and storage stay isolated between
+companies while the browser process is reused.
+
+A browser is recycled (closed and relaunched) when it has loaded more than
+`max_pages_per_browser` pages, or when the combined memory of the browser
+processes exceeds `max_memory_mb` (requires the optional `psutil` package).
+Utilisation statistics are available through `get_stats()`.
+"""
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+
+from ..core.config import AppConfig
+
+try:
+    import psutil  # Optional: only needed for memory-based recycling
+except ImportError:
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+BROWSER_LAUNCH_ARGS = ['--no-sandbox', '--disable-setuid-sandbox', '--disable-dev-shm-usage']
+
+
+class _BrowserSlot:
+    """One pooled browser and the counters used to decide when to recycle it."""
+
+    def __init__(self, slot_id: int):
+        self.slot_id = slot_id
+        self.browser: Optional[Browser] = None
+        self.pages_loaded = 0
+        self.leases = 0
+
+
+class BrowserPool:
+    """
+    A fixed-size pool of Chromium browsers that leases one browser context per caller.
+
+    Usage:
+        pool = BrowserPool(config, size=4)
+        await pool.start()
+        async with pool.lease_context(log_prefix) as context:
+            page = await context.new_page()
+            ...
+        await pool.close()
+    """
+
+    def __init__(
+        self,
+        config: AppConfig,
+        size: int,
+        max_pages_per_browser: int = 0,
+        max_memory_mb: int = 0
+    ):
+        """
+        Args:
+            config (AppConfig): Application configuration (user agent for new contexts).
+            size (int): Number of browsers kept alive; also the maximum number of concurrent leases.
+            max_pages_per_browser (int): Recycle a browser after it has loaded this many pages (0 = never).
+            max_memory_mb (int): Recycle a browser when the pool's browser processes use more than this
+                                 much resident memory in total (0 = never; ignored without psutil).
+        """
+        self.config = config
+        self.size = max(1, size)
+        self.max_pages_per_browser = max(0, max_pages_per_browser)
+        self.max_memory_mb = max(0, max_memory_mb)
+        if self.max_memory_mb and psutil is None:
+            logger.warning("BrowserPool: memory-based recycling requested but psutil is not installed; it is disabled.")
+            self.max_memory_mb = 0
+
+        self._playwright: Optional[Playwright] = None
+        self._slots: List[_BrowserSlot] = [_BrowserSlot(slot_id) for slot_id in range(self.size)]
+        self._idle_slots: "asyncio.Queue[_BrowserSlot]" = asyncio.Queue()
+        self._started_at: Optional[float] = None
+        self._leases_in_use = 0
+        self._stats: Dict[str, Any] = {
+            "pool_size": self.size,
+            "leases_total": 0,
+            "lease_wait_seconds_total": 0.0,
+            "lease_busy_seconds_total": 0.0,
+            "peak_leases_in_use": 0,
+            "pages_loaded_total": 0,
+            "browser_launches": 0,
+            "browser_recycles_page_limit": 0,
+            "browser_recycles_memory_limit": 0,
+            "browser_recycles_disconnected": 0,
+        }
+
+    async def start(self) -> None:
+        """Starts Playwright and launches all browsers of the pool."""
+        self._playwright = await async_playwright().start()
+        self._started_at = time.time()
+        for slot in self._slots:
+            await self._launch(slot)
+            self._idle_slots.put_nowait(slot)
+        logger.info(f"BrowserPool started with {self.size} browser(s).")
+
+    async def close(self) -> None:
+        """Closes all browsers and stops Playwright."""
+        for slot in self._slots:
+            await self._close_browser(slot)
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+        logger.info(f"BrowserPool closed. Stats: {self.get_stats()}")
+
+    @contextlib.asynccontextmanager
+    async def lease_context(self, log_prefix: str = "") -> AsyncIterator[BrowserContext]:
+        """
+        Leases a fresh browser context on an idle pooled browser.
+
+        Waits until a browser is free. The context is closed when the lease ends,
+        and the browser is recycled afterwards if it passed a recycling threshold.
+        """
+        wait_start = time.time()
+        slot = await self._idle_slots.get()
+        lease_start = time.time()
+        self._stats["lease_wait_seconds_total"] += lease_start - wait_start
+        self._stats["leases_total"] += 1
+        self._leases_in_use += 1
+        self._stats["peak_leases_in_use"] = max(self._stats["peak_leases_in_use"], self._leases_in_use)
+        context: Optional[BrowserContext] = None
+        try:
+            if slot.browser is None or not slot.browser.is_connected():
+                logger.warning(f"{log_prefix} BrowserPool: browser {slot.slot_id} is disconnected; relaunching.")
+                self._stats["browser_recycles_disconnected"] += 1
+                await self._launch(slot)
+            assert slot.browser is not None
+            slot.leases += 1
+            context = await slot.browser.new_context(
+                user_agent=self.config.user_agent,
+                java_script_enabled=True,
+                ignore_https_errors=True
+            )
+            context.on("page", lambda page: self._track_page(slot, page))
+            yield context
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as e_close:
+                    logger.debug(f"{log_prefix} BrowserPool: error closing context: {e_close}")
+            self._stats["lease_busy_seconds_total"] += time.time() - lease_start
+            self._leases_in_use -= 1
+            try:
+                await self._recycle_if_needed(slot, log_prefix)
+            finally:
+                self._idle_slots.put_nowait(slot)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns pool utilisation statistics suitable for `run_metrics`."""
+        stats = dict(self._stats)
+        if self._started_at is not None:
+            lifetime_seconds = time.time() - self._started_at
+            stats["pool_lifetime_seconds"] = lifetime_seconds
+            if lifetime_seconds > 0:
+                stats["utilisation_ratio"] = stats["lease_busy_seconds_total"] / (lifetime_seconds * self.size)
+        if stats["leases_total"]:
+            stats["avg_lease_wait_seconds"] = stats["lease_wait_seconds_total"] / stats["leases_total"]
+        return stats
+
+    def _track_page(self, slot: _BrowserSlot, page: Page) -> None:
+        """Counts every main-frame navigation of a page opened in a leased context."""
+        def _on_load(_: Any) -> None:
+            slot.pages_loaded += 1
+            self._stats["pages_loaded_total"] += 1
+        page.on("domcontentloaded", _on_load)
+
+    async def _launch(self, slot: _BrowserSlot) -> None:
+        assert self._playwright is not None, "BrowserPool.start() must be called before use."
+        await self._close_browser(slot)
+        slot.browser = await self._playwright.chromium.launch(headless=True, args=BROWSER_LAUNCH_ARGS)
+        slot.pages_loaded = 0
+        slot.leases = 0
+        self._stats["browser_launches"] += 1
+
+    async def _close_browser(self, slot: _BrowserSlot) -> None:
+        if slot.browser is not None:
+            try:
+                if slot.browser.is_connected():
+                    await slot.browser.close()
+            except Exception as e_close:
+                logger.debug(f"BrowserPool: error closing browser {slot.slot_id}: {e_close}")
+            slot.browser = None
+
+    async def _recycle_if_needed(self, slot: _BrowserSlot, log_prefix: str) -> None:
+        if self.max_pages_per_browser and slot.pages_loaded >= self.max_pages_per_browser:
+            logger.info(f"{log_prefix} BrowserPool: recycling browser {slot.slot_id} after {slot.pages_loaded} pages.")
+            self._stats["browser_recycles_page_limit"] += 1
+            await self._launch(slot)
+            return
+        if self.max_memory_mb:
+            memory_mb = _browser_processes_memory_mb()
+            if memory_mb > self.max_memory_mb:
+                logger.info(
+                    f"{log_prefix} BrowserPool: browser memory {memory_mb:.0f} MB exceeds "
+                    f"{self.max_memory_mb} MB; recycling browser {slot.slot_id}."
+                )
+                self._stats["browser_recycles_memory_limit"] += 1
+                await self._launch(slot)
+
+
+def _browser_processes_memory_mb() -> float:
+    """Returns the resident memory of all child processes (Playwright driver and browsers) in MB."""
+    if psutil is None:
+        return 0.0
+    total_bytes = 0
+    try:
+        for child in psutil.Process(os.getpid()).children(recursive=True):
+            try:
+                total_bytes += child.memory_info().rss
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+    except psutil.Error as e:
+        logger.debug(f"BrowserPool: could not read process memory: {e}")
+    return total_bytes / (1024 * 1024)
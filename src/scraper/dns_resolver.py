@@ -0,0 +1,119 @@
+"""
+Asynchronous, cached DNS resolution for scraper entry points.
+
+Without it, a dead domain is only detected when a full browser navigation
+fails with `net::ERR_NAME_NOT_RESOLVED`, and each DNS fallback variant (hyphen
+simplification, `.de` -> `.com`) costs another navigation. `AsyncDNSResolver`
+resolves many hosts concurrently, caches the answers for the run and shares
+in-flight lookups, so the pipeline can resolve every input host and fallback
+variant in one pre-flight pass and `scrape_website` can start at the first
+candidate that actually resolves.
+
+Lookups use the system resolver (`socket.getaddrinfo`) on a dedicated thread
+pool, so they honour /etc/hosts and local DNS configuration and do not occupy
+the threads reserved for LLM calls.
+"""
+import asyncio
+import logging
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncDNSResolver:
+    """Resolves host names concurrently with a per-run cache and in-flight de-duplication."""
+
+    def __init__(self, concurrency: int, timeout_seconds: float):
+        """
+        Args:
+            concurrency (int): Maximum number of lookups running at the same time.
+            timeout_seconds (float): Per-lookup timeout. A timed-out host is treated as resolvable,
+                so the scraper still tries it.
+        """
+        self.concurrency = max(1, concurrency)
+        self.timeout_seconds = timeout_seconds
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._results: Dict[str, bool] = {}
+        self._in_flight: Dict[str, "asyncio.Task[bool]"] = {}
+        self._stats: Dict[str, Any] = {
+            "lookups": 0,
+            "cache_hits": 0,
+            "hosts_resolved": 0,
+            "hosts_unresolvable": 0,
+            "timeouts": 0,
+        }
+
+    async def is_resolvable(self, host: str) -> bool:
+        """Returns False only if the host definitely does not resolve."""
+        host = host.lower()
+        self._stats["lookups"] += 1
+        cached = self._results.get(host)
+        if cached is not None:
+            self._stats["cache_hits"] += 1
+            return cached
+        in_flight = self._in_flight.get(host)
+        if in_flight is not None:
+            self._stats["cache_hits"] += 1
+        else:
+            # The lookup runs in its own task, so a cancelled caller never cancels it for the others
+            in_flight = asyncio.create_task(self._lookup(host))
+            self._in_flight[host] = in_flight
+            in_flight.add_done_callback(lambda _: self._in_flight.pop(host, None))
+        return await asyncio.shield(in_flight)
+
+    async def resolve_many(self, hosts: Iterable[str]) -> Dict[str, bool]:
+        """Resolves all `hosts` concurrently. Returns {host: resolvable}."""
+        unique_hosts = list(dict.fromkeys(host.lower() for host in hosts if host))
+        results = await asyncio.gather(*(self.is_resolvable(host) for host in unique_hosts))
+        return dict(zip(unique_hosts, results))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns resolver statistics suitable for `run_metrics`."""
+        return dict(self._stats)
+
+    async def _lookup(self, host: str) -> bool:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="dns_resolver")
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        assert self._semaphore is not None
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            try:
+                await asyncio.wait_for(
+                    loop.run_in_executor(self._executor, socket.getaddrinfo, host, None),
+                    timeout=self.timeout_seconds
+                )
+            except socket.gaierror as e:
+                if e.errno == socket.EAI_AGAIN:
+                    # Temporary resolver failure: not cached, the scraper still tries the host
+                    logger.debug(f"DNS: temporary failure resolving '{host}': {e}; assuming resolvable.")
+                    self._stats["timeouts"] += 1
+                    return True
+                logger.debug(f"DNS: '{host}' does not resolve: {e}")
+                self._results[host] = False
+                self._stats["hosts_unresolvable"] += 1
+                return False
+            except UnicodeError as e:  # Host name that cannot be IDNA-encoded
+                logger.debug(f"DNS: '{host}' is not a valid host name: {e}")
+                self._results[host] = False
+                self._stats["hosts_unresolvable"] += 1
+                return False
+            except asyncio.TimeoutError:
+                # Not cached: a slow resolver is not proof that the domain is dead
+                logger.debug(f"DNS: lookup for '{host}' timed out after {self.timeout_seconds}s; assuming resolvable.")
+                self._stats["timeouts"] += 1
+                return True
+        self._results[host] = True
+        self._stats["hosts_resolved"] += 1
+        return True
+
+    def close(self) -> None:
+        """Shuts down the lookup thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._semaphore = None
+
@@ -0,0 +1,129 @@
+"""
+Priority frontier for the website crawler.
+
+The crawl queue used to be a list that was re-sorted by (score desc, depth asc)
+before every dequeue and drained with `pop(0)`, which is O(n log n) per page.
+`CrawlFrontier` keeps the queued URLs in a binary heap instead (O(log n) push
+and pop) with the same ordering: highest score first, then shallowest depth,
+then insertion order for ties, exactly like the previous stable sort.
+
+The frontier also owns the seen-set (a URL is only ever queued once) and the
+per-domain page budget (`SCRAPER_MAX_PAGES_PER_DOMAIN` with the high-priority
+bypass), so that several domains can share one frontier in a multi-domain crawl.
+"""
+import heapq
+import itertools
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+BUDGET_ALLOWED = "allowed"
+BUDGET_BYPASS = "bypass"  # Over the page limit, but admitted as a high-priority page
+BUDGET_EXHAUSTED = "exhausted"
+
+
+class FrontierEntry(NamedTuple):
+    """A URL waiting in the frontier."""
+    url: str
+    depth: int
+    score: int
+
+
+def domain_key(url: str) -> str:
+    """Returns the budget key of `url`: its lower-cased host without a leading 'www.'."""
+    netloc = urlparse(url).netloc.lower()
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+
+class _DomainBudget:
+    """Page counters of one domain."""
+
+    def __init__(self):
+        self.pages_fetched = 0
+        self.high_priority_pages_after_limit = 0
+
+
+class CrawlFrontier:
+    """Heap-ordered crawl frontier with a seen-set and per-domain page budgets."""
+
+    def __init__(
+        self,
+        max_pages_per_domain: int = 0,
+        score_threshold_for_limit_bypass: int = 0,
+        max_high_priority_pages_after_limit: int = 0
+    ):
+        """
+        Args:
+            max_pages_per_domain (int): Pages fetched per domain before the budget applies (0 = no limit).
+            score_threshold_for_limit_bypass (int): Minimum score for a page to be fetched beyond the limit.
+            max_high_priority_pages_after_limit (int): How many such high-priority pages a domain may fetch beyond the limit.
+        """
+        self.max_pages_per_domain = max_pages_per_domain
+        self.score_threshold_for_limit_bypass = score_threshold_for_limit_bypass
+        self.max_high_priority_pages_after_limit = max_high_priority_pages_after_limit
+        self._heap: List[Tuple[int, int, int, FrontierEntry]] = []
+        self._sequence = itertools.count()
+        self._seen: Set[str] = set()
+        self._budgets: Dict[str, _DomainBudget] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+    def __contains__(self, url: object) -> bool:
+        """True if `url` has been queued or marked as seen."""
+        return url in self._seen
+
+    def push(self, url: str, depth: int, score: int) -> bool:
+        """Queues `url` unless it was seen before. Returns True if it was queued."""
+        if url in self._seen:
+            return False
+        self._seen.add(url)
+        heapq.heappush(self._heap, (-score, depth, next(self._sequence), FrontierEntry(url, depth, score)))
+        return True
+
+    def push_many(self, entries: Iterable[Tuple[str, int, int]]) -> int:
+        """Queues several (url, depth, score) entries. Returns how many were queued."""
+        return sum(1 for url, depth, score in entries if self.push(url, depth, score))
+
+    def pop(self) -> FrontierEntry:
+        """Removes and returns the entry with the highest score (then lowest depth, then oldest)."""
+        return heapq.heappop(self._heap)[-1]
+
+    def mark_seen(self, url: str) -> None:
+        """Records `url` as seen without queueing it, e.g. the landed URL after a redirect."""
+        self._seen.add(url)
+
+    def check_budget(self, domain: str, score: int) -> str:
+        """
+        Returns whether a page with `score` may still be fetched from `domain`:
+        `BUDGET_ALLOWED`, `BUDGET_BYPASS` (over the limit but high priority) or `BUDGET_EXHAUSTED`.
+        """
+        if self.max_pages_per_domain <= 0:
+            return BUDGET_ALLOWED
+        budget = self._budgets.get(domain)
+        if budget is None or budget.pages_fetched < self.max_pages_per_domain:
+            return BUDGET_ALLOWED
+        if score < self.score_threshold_for_limit_bypass or \
+           budget.high_priority_pages_after_limit >= self.max_high_priority_pages_after_limit:
+            return BUDGET_EXHAUSTED
+        return BUDGET_BYPASS
+
+    def record_page(self, domain: str, score: int) -> None:
+        """Counts a successfully fetched page with `score` against the budget of `domain`."""
+        budget = self._budgets.setdefault(domain, _DomainBudget())
+        budget.pages_fetched += 1
+        if budget.pages_fetched > self.max_pages_per_domain and score >= self.score_threshold_for_limit_bypass:
+            budget.high_priority_pages_after_limit += 1
+
+    def remaining_pages(self, domain: str) -> Optional[int]:
+        """Returns how many pages `domain` may still fetch before its limit (None if there is no limit)."""
+        if self.max_pages_per_domain <= 0:
+            return None
+        return max(0, self.max_pages_per_domain - self.pages_fetched(domain))
+
+    def pages_fetched(self, domain: str) -> int:
+        """Returns the number of pages recorded for `domain`."""
+        budget = self._budgets.get(domain)
+        return budget.pages_fetched if budget else 0
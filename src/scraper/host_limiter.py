@@ -0,0 +1,75 @@
+"""
+Per-host concurrency cap and politeness delay for page fetches.
+
+`_perform_scrape_for_entry_point` fetches the child pages of a site
+concurrently (`SCRAPER_CHILD_FETCH_CONCURRENCY`). `HostRateLimiter` keeps
+that polite: at most `max_concurrent_per_host` fetches run against one host at
+a time, and consecutive fetches to the same host start at least
+`min_interval_seconds` apart. The limiter is shared by all rows of a run, so
+rows whose sites live on the same host share the same allowance.
+"""
+import asyncio
+import contextlib
+import time
+from typing import Any, AsyncIterator, Dict
+
+
+class _HostState:
+    """Concurrency slots and request spacing of one host."""
+
+    def __init__(self, max_concurrent: int):
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.next_start_time = 0.0
+        self.in_flight = 0
+
+
+class HostRateLimiter:
+    """Caps concurrent fetches per host and spaces their start times."""
+
+    def __init__(self, max_concurrent_per_host: int, min_interval_seconds: float):
+        """
+        Args:
+            max_concurrent_per_host (int): Maximum fetches running against one host at the same time.
+            min_interval_seconds (float): Minimum time between the starts of two fetches to the same host.
+        """
+        self.max_concurrent_per_host = max(1, max_concurrent_per_host)
+        self.min_interval_seconds = max(0.0, min_interval_seconds)
+        self._hosts: Dict[str, _HostState] = {}
+        self._stats: Dict[str, Any] = {
+            "fetches": 0,
+            "fetches_delayed": 0,
+            "politeness_delay_seconds": 0.0,
+            "max_in_flight_per_host": 0,
+        }
+
+    @contextlib.asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[None]:
+        """Waits for a free slot and the politeness delay of `host`, then holds the slot."""
+        host = host.lower()
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.max_concurrent_per_host)
+        async with state.semaphore:
+            now = time.monotonic()
+            start_time = max(now, state.next_start_time)
+            # Reserve the start time before sleeping so concurrent waiters are spaced out too
+            state.next_start_time = start_time + self.min_interval_seconds
+            delay = start_time - now
+            if delay > 0:
+                self._stats["fetches_delayed"] += 1
+                self._stats["politeness_delay_seconds"] += delay
+                await asyncio.sleep(delay)
+            self._stats["fetches"] += 1
+            state.in_flight += 1
+            self._stats["max_in_flight_per_host"] = max(self._stats["max_in_flight_per_host"], state.in_flight)
+            try:
+                yield
+            finally:
+                state.in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns limiter statistics suitable for `run_metrics`."""
+        stats = dict(self._stats)
+        stats["politeness_delay_seconds"] = round(stats["politeness_delay_seconds"], 3)
+        stats["hosts"] = len(self._hosts)
+        return stats
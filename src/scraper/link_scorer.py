@@ -0,0 +1,125 @@
+"""
+Precompiled keyword matching and scoring for internal links.
+
+Link scoring (now `score_internal_links`) used to rescan the target, critical
+and high-priority keyword lists with nested `any(...)` loops for every anchor
+on every page, and rebuilt the derived keyword sets per link.
+`LinkKeywordMatcher` compiles the rules once: a path-segment -> tier-flags dict
+for exact segment matches and one alternation regex per keyword list for
+substring checks.
+
+Scores are identical to the previous implementation. This is verified against
+a golden corpus of (url, anchor text, expected score) cases generated from the
+previous implementation:
+
+    python -m pytest tests/test_link_scorer.py
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Pattern
+from urllib.parse import urlparse
+
+from ..core.config import AppConfig
+
+# Tier flags of an exact path-segment match
+_CRITICAL = 1
+_HIGH = 2
+_OTHER_TARGET = 4  # Target keyword that is neither critical nor high priority
+
+
+def _compile_alternation(keywords: Iterable[str]) -> Optional[Pattern[str]]:
+    """Returns a regex matching any of `keywords` as a substring, or None if there are none."""
+    unique_keywords = sorted({kw for kw in keywords if kw}, key=len, reverse=True)
+    if not unique_keywords:
+        return None
+    return re.compile("|".join(re.escape(kw) for kw in unique_keywords))
+
+
+class LinkKeywordMatcher:
+    """Link filtering and scoring rules compiled from the keyword settings of `AppConfig`."""
+
+    def __init__(
+        self,
+        target_keywords: List[str],
+        critical_keywords: List[str],
+        high_keywords: List[str],
+        exclude_path_patterns: List[str],
+        max_keyword_path_segments: int
+    ):
+        self.max_keyword_path_segments = max_keyword_path_segments
+        self._target_pattern = _compile_alternation(target_keywords)
+        self._exclude_pattern = _compile_alternation(exclude_path_patterns)
+
+        priority_keywords = set(critical_keywords) | set(high_keywords)
+        self._segment_tiers: Dict[str, int] = {}
+        for kw in critical_keywords:
+            self._segment_tiers[kw] = self._segment_tiers.get(kw, 0) | _CRITICAL
+        for kw in high_keywords:
+            self._segment_tiers[kw] = self._segment_tiers.get(kw, 0) | _HIGH
+        for kw in target_keywords:
+            if kw not in priority_keywords:
+                self._segment_tiers[kw] = self._segment_tiers.get(kw, 0) | _OTHER_TARGET
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> "LinkKeywordMatcher":
+        """Builds the matcher from the scraper keyword settings of `config`."""
+        return cls(
+            target_keywords=config.target_link_keywords or [],
+            critical_keywords=config.scraper_critical_priority_keywords or [],
+            high_keywords=config.scraper_high_priority_keywords or [],
+            exclude_path_patterns=config.scraper_exclude_link_path_patterns or [],
+            max_keyword_path_segments=config.scraper_max_keyword_path_segments
+        )
+
+    def matches_target(self, link_text: str, link_href_lower: str) -> bool:
+        """True if a target keyword occurs in the (lower-cased) anchor text or URL."""
+        if self._target_pattern is None:
+            return False
+        return bool(self._target_pattern.search(link_text) or self._target_pattern.search(link_href_lower))
+
+    def is_excluded_path(self, path_lower: str) -> bool:
+        """True if the (lower-cased) URL path contains an excluded pattern."""
+        return self._exclude_pattern is not None and self._exclude_pattern.search(path_lower) is not None
+
+    def score(self, path_segments: List[str], link_text: str) -> int:
+        """
+        Scores a link from its lower-cased, non-empty path segments and lower-cased anchor text.
+
+        Tiers: critical keyword segment (100), high-priority keyword segment (90),
+        position of the first priority keyword segment (80 - 5 per position),
+        other target keyword segment (70), target keyword inside a segment (50),
+        target keyword in the anchor text (40). Deep paths are penalised.
+        """
+        excess_segments = max(0, len(path_segments) - self.max_keyword_path_segments)
+        segment_tiers = [self._segment_tiers.get(seg, 0) for seg in path_segments]
+        score = 0
+
+        if any(tier & _CRITICAL for tier in segment_tiers):
+            score = 100 - min(20, excess_segments * 5)
+        if score < 90 and any(tier & _HIGH for tier in segment_tiers):
+            score = max(score, 90 - min(20, excess_segments * 5))
+        if score < 80:
+            first_priority_index = next(
+                (i for i, tier in enumerate(segment_tiers) if tier & (_CRITICAL | _HIGH)), None
+            )
+            if first_priority_index is not None:
+                score = max(score, 80 - first_priority_index * 5 - min(15, excess_segments * 5))
+        if score < 70 and any(tier & _OTHER_TARGET for tier in segment_tiers):
+            score = max(score, 70 - min(10, excess_segments * 3))
+        if self._target_pattern is not None:
+            if score < 50 and any(self._target_pattern.search(seg) for seg in path_segments):
+                score = max(score, 50)
+            if score < 40 and self._target_pattern.search(link_text):
+                score = max(score, 40)
+        return score
+
+    def score_link(self, normalized_link_url: str, link_text: str) -> Optional[int]:
+        """Applies the full rule set to one link. Returns None if the link is not a target or is excluded."""
+        link_text = link_text.lower().strip()
+        if not self.matches_target(link_text, normalized_link_url.lower()):
+            return None
+        path_lower = urlparse(normalized_link_url).path.lower()
+        if self.is_excluded_path(path_lower):
+            return None
+        path_segments = [seg for seg in path_lower.strip('/').split('/') if seg]
+        return self.score(path_segments, link_text)
+
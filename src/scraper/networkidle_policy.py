@@ -0,0 +1,104 @@
+"""
+Adaptive per-domain policy for the Playwright `networkidle` wait.
+
+After each successful navigation `fetch_page_content` waits up to
+`SCRAPER_NETWORKIDLE_TIMEOUT_MS` for the network to go idle, so late content
+can render. On sites with chat widgets or analytics beacons the network never
+goes idle and every page pays the full timeout for nothing.
+
+`NetworkIdlePolicy` learns per domain whether the wait matters: for the first
+`learning_pages` pages of a domain it compares the page's visible text length
+before and after the wait. If the wait never changed the text length by more
+than `min_text_change_ratio`, later pages on that domain skip the wait. If it
+changed the text once, the domain keeps waiting for the rest of the run.
+"""
+from typing import Any, Dict, List, Optional
+
+DECISION_WAIT = "wait"
+DECISION_SKIP = "skip"
+
+
+class _DomainState:
+    """Learning samples and decision of one domain."""
+
+    def __init__(self):
+        self.wait_seconds: List[float] = []
+        self.decision: Optional[str] = None
+
+
+class NetworkIdlePolicy:
+    """Decides per domain whether waiting for `networkidle` is worth it."""
+
+    def __init__(self, learning_pages: int, min_text_change_ratio: float = 0.02):
+        """
+        Args:
+            learning_pages (int): Pages per domain measured with the wait before a skip decision is made.
+            min_text_change_ratio (float): Relative text length change that counts as "the wait mattered".
+        """
+        self.learning_pages = max(1, learning_pages)
+        self.min_text_change_ratio = min_text_change_ratio
+        self._domains: Dict[str, _DomainState] = {}
+        self._stats: Dict[str, Any] = {
+            "waits_performed": 0,
+            "waits_timed_out": 0,
+            "wait_seconds": 0.0,
+            "waits_skipped": 0,
+            "wait_seconds_avoided": 0.0,
+        }
+
+    def _state(self, domain: str) -> _DomainState:
+        state = self._domains.get(domain)
+        if state is None:
+            state = self._domains[domain] = _DomainState()
+        return state
+
+    def should_wait(self, domain: str) -> bool:
+        """
+        True unless `domain` has learned that the wait does not change its pages.
+        A skipped wait is counted as avoided, with the domain's average measured wait.
+        """
+        state = self._state(domain)
+        if state.decision != DECISION_SKIP:
+            return True
+        self._stats["waits_skipped"] += 1
+        self._stats["wait_seconds_avoided"] += sum(state.wait_seconds) / len(state.wait_seconds)
+        return False
+
+    def record_wait(
+        self,
+        domain: str,
+        wait_seconds: float,
+        timed_out: bool,
+        text_length_before: Optional[int],
+        text_length_after: Optional[int]
+    ) -> Optional[str]:
+        """
+        Records one performed wait and the text length around it (None if it could not be measured).
+        Returns the domain's decision if this sample settled it, otherwise None.
+        """
+        self._stats["waits_performed"] += 1
+        self._stats["wait_seconds"] += wait_seconds
+        if timed_out:
+            self._stats["waits_timed_out"] += 1
+        state = self._state(domain)
+        if state.decision is not None:
+            return None
+        if text_length_before is None or text_length_after is None:
+            return None  # Unmeasured pages neither confirm nor refute the wait
+        state.wait_seconds.append(wait_seconds)
+        text_change = abs(text_length_after - text_length_before)
+        if text_change > self.min_text_change_ratio * max(text_length_before, 1):
+            state.decision = DECISION_WAIT
+        elif len(state.wait_seconds) >= self.learning_pages:
+            state.decision = DECISION_SKIP
+        return state.decision
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns wait statistics suitable for `run_metrics`."""
+        stats = dict(self._stats)
+        stats["wait_seconds"] = round(stats["wait_seconds"], 3)
+        stats["wait_seconds_avoided"] = round(stats["wait_seconds_avoided"], 3)
+        stats["domains_waiting"] = sum(1 for state in self._domains.values() if state.decision == DECISION_WAIT)
+        stats["domains_skipping"] = sum(1 for state in self._domains.values() if state.decision == DECISION_SKIP)
+        stats["domains_learning"] = len(self._domains) - stats["domains_waiting"] - stats["domains_skipping"]
+        return stats
@@ -0,0 +1,250 @@
+"""
+Persistent on-disk cache of scraped pages with conditional revalidation.
+
+Weekly re-runs over the same prospect lists would otherwise download, render
+and parse every page again. `PageCache` stores, per requested URL (in
+`normalize_url` form), the fetched HTML, the extracted text and anchors, the
+response validators (ETag / Last-Modified) and a SHA-256 hash of the raw HTTP
+body in a SQLite database. Pages rendered in the browser are stored without a
+hash: their serialized DOM never matches a raw body, so they are revalidated by
+their validators only.
+
+On the next run a cached page is revalidated with a conditional GET
+(`If-None-Match` / `If-Modified-Since`). If the server answers 304, or answers
+200 with a byte-identical body, the cached text and anchors are reused and the
+page is neither fetched with the browser nor parsed again. A changed 200
+response is handed back to the caller so the page need not be downloaded a
+second time; any other answer falls back to a normal fetch. The new result
+replaces the cache entry.
+
+Writes are committed in batches of `commit_every` pages (and on `close`), so
+the crawl does not wait for a disk sync after every page.
+
+Entries older than the TTL are purged when the cache is opened.
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(html_content: str) -> str:
+    """Returns the SHA-256 hex digest of a page's HTML."""
+    return hashlib.sha256(html_content.encode("utf-8", errors="replace")).hexdigest()
+
+
+class CachedPage:
+    """A page restored from the cache."""
+
+    def __init__(
+        self,
+        url: str,
+        landed_url: str,
+        status_code: int,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        html_hash: str,
+        html_content: str,
+        text: str,
+        anchors: List[Tuple[str, str]]
+    ):
+        self.url = url
+        self.landed_url = landed_url
+        self.status_code = status_code
+        self.etag = etag
+        self.last_modified = last_modified
+        self.html_hash = html_hash
+        self.html_content = html_content
+        self.text = text
+        self.anchors = anchors
+
+
+class PageCache:
+    """SQLite-backed page cache with ETag/Last-Modified/content-hash revalidation."""
+
+    def __init__(self, db_path: str, ttl_seconds: int, commit_every: int = 50):
+        """
+        Args:
+            db_path (str): Path to the SQLite database file (its directory is created on first use).
+            ttl_seconds (int): Entries older than this are purged and fetched normally (0 = no expiry).
+            commit_every (int): Stored pages per SQLite commit.
+        """
+        self.db_path = db_path
+        self.ttl_seconds = max(0, ttl_seconds)
+        self.commit_every = max(1, commit_every)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._uncommitted_writes = 0
+        self._stats: Dict[str, int] = {
+            "lookups": 0,
+            "hits_not_modified": 0,
+            "hits_unchanged_content": 0,
+            "misses": 0,
+            "revalidated_changed": 0,
+            "revalidation_errors": 0,
+            "pages_stored": 0,
+            "bytes_saved": 0,
+        }
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                " url TEXT PRIMARY KEY,"
+                " landed_url TEXT NOT NULL,"
+                " status_code INTEGER NOT NULL,"
+                " etag TEXT,"
+                " last_modified TEXT,"
+                " content_hash TEXT NOT NULL,"
+                " html BLOB NOT NULL,"
+                " text BLOB NOT NULL,"
+                " anchors BLOB NOT NULL,"
+                " fetched_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+            if self.ttl_seconds:
+                deleted = self._conn.execute(
+                    "DELETE FROM pages WHERE fetched_at < ?", (time.time() - self.ttl_seconds,)
+                ).rowcount
+                self._conn.commit()
+                if deleted:
+                    logger.info(f"PageCache: purged {deleted} expired entries.")
+            logger.info(f"PageCache opened at {self.db_path} (ttl={self.ttl_seconds}s).")
+        return self._conn
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        """Returns the cached page for the normalized `url`, or None."""
+        row = self._connection().execute(
+            "SELECT landed_url, status_code, etag, last_modified, content_hash, html, text, anchors"
+            " FROM pages WHERE url = ?",
+            (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        landed_url, status_code, etag, last_modified, html_hash, html_blob, text_blob, anchors_blob = row
+        anchors = [tuple(anchor) for anchor in json.loads(zlib.decompress(anchors_blob).decode("utf-8"))]
+        return CachedPage(
+            url, landed_url, status_code, etag, last_modified, html_hash,
+            zlib.decompress(html_blob).decode("utf-8"), zlib.decompress(text_blob).decode("utf-8"), anchors
+        )
+
+    def put(
+        self,
+        url: str,
+        landed_url: str,
+        status_code: int,
+        response_headers: Dict[str, str],
+        html_content: str,
+        text: str,
+        anchors: List[Tuple[str, str]],
+        html_is_http_body: bool = True
+    ) -> None:
+        """
+        Stores (or replaces) the fetched page for the normalized `url`.
+
+        Only the raw body of an HTTP response (`html_is_http_body`) is hashed for
+        revalidation; HTML serialized by the browser is stored without a hash.
+        """
+        self._connection().execute(
+            "INSERT OR REPLACE INTO pages"
+            " (url, landed_url, status_code, etag, last_modified, content_hash, html, text, anchors, fetched_at)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                url, landed_url, status_code,
+                response_headers.get("etag"), response_headers.get("last-modified"),
+                content_hash(html_content) if html_is_http_body else "",
+                zlib.compress(html_content.encode("utf-8")),
+                zlib.compress(text.encode("utf-8")),
+                zlib.compress(json.dumps(anchors, ensure_ascii=False).encode("utf-8")),
+                time.time()
+            )
+        )
+        self._stats["pages_stored"] += 1
+        self._uncommitted_writes += 1
+        if self._uncommitted_writes >= self.commit_every:
+            self.flush()
+
+    def flush(self) -> None:
+        """Commits the pages stored since the last commit."""
+        if self._conn is not None and self._uncommitted_writes:
+            self._conn.commit()
+            self._uncommitted_writes = 0
+
+    async def revalidate(
+        self,
+        url: str,
+        http_client: httpx.AsyncClient,
+        user_agent: str,
+        timeout_seconds: float,
+        log_prefix: str = ""
+    ) -> Tuple[Optional[CachedPage], Optional[httpx.Response]]:
+        """
+        Revalidates the cached page for `url`.
+
+        A page counts as unchanged on a 304 response to the conditional request,
+        or on a 200 response whose body hashes to the cached content hash.
+
+        Returns:
+            (cached_page, response): cached_page if the server confirms it is
+            unchanged, otherwise None. response is the successful response of a
+            changed page, for the caller to use instead of fetching it again.
+        """
+        self._stats["lookups"] += 1
+        cached_page = self.get(url)
+        if cached_page is None:
+            self._stats["misses"] += 1
+            return None, None
+        if not (cached_page.etag or cached_page.last_modified or cached_page.html_hash):
+            self._stats["misses"] += 1  # Nothing to revalidate against
+            return None, None
+
+        headers = {'User-Agent': user_agent}
+        if cached_page.etag:
+            headers['If-None-Match'] = cached_page.etag
+        if cached_page.last_modified:
+            headers['If-Modified-Since'] = cached_page.last_modified
+        try:
+            response = await http_client.get(url, headers=headers, timeout=timeout_seconds)
+        except httpx.HTTPError as e:
+            self._stats["revalidation_errors"] += 1
+            logger.debug(f"{log_prefix} PageCache: revalidation of {url} failed: {type(e).__name__} - {e}. Fetching normally.")
+            return None, None
+
+        if response.status_code == 304:
+            self._stats["hits_not_modified"] += 1
+            self._stats["bytes_saved"] += len(cached_page.html_content.encode("utf-8"))
+            logger.info(f"{log_prefix} PageCache: {url} not modified (304); reusing cached page.")
+            return cached_page, None
+        if response.is_success and content_hash(response.text) == cached_page.html_hash:
+            self._stats["hits_unchanged_content"] += 1
+            logger.info(f"{log_prefix} PageCache: {url} unchanged (same content hash); reusing cached page.")
+            return cached_page, None
+        self._stats["revalidated_changed"] += 1
+        logger.debug(f"{log_prefix} PageCache: {url} changed (status {response.status_code}); fetching normally.")
+        return None, response if response.is_success else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns cache statistics suitable for `run_metrics`."""
+        stats: Dict[str, Any] = dict(self._stats)
+        hits = stats["hits_not_modified"] + stats["hits_unchanged_content"]
+        stats["hit_rate"] = round(hits / stats["lookups"], 4) if stats["lookups"] else 0.0
+        return stats
+
+    def close(self) -> None:
+        """Commits pending writes and closes the database connection."""
+        if self._conn is not None:
+            self.flush()
+            self._conn.close()
+            self._conn = None
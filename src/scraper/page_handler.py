@@ -1,13 +1,137 @@
 import logging
-from typing import Optional, Tuple, Any
+import re
+import time
+from typing import Optional, Tuple, Any, Dict, List
+from urllib.parse import urlparse
+import httpx
 from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError, Error as PlaywrightError
 
 from ..core.config import AppConfig
+from .scraper_utils import extract_text_and_anchors
+from .networkidle_policy import NetworkIdlePolicy
 
 config_instance = AppConfig()
 logger = logging.getLogger(__name__)
 
-async def fetch_page_content(page: Page, url: str, input_row_id: Any, company_name_or_id: str) -> Tuple[Optional[str], Optional[int]]:
+# Learns per domain whether the networkidle wait changes the page text; shared by all rows.
+networkidle_policy: Optional[NetworkIdlePolicy] = NetworkIdlePolicy(
+    learning_pages=config_instance.scraper_networkidle_learning_pages
+) if config_instance.scraper_adaptive_networkidle_enabled else None
+
+_VISIBLE_TEXT_LENGTH_SCRIPT = "() => document.body ? document.body.innerText.length : 0"
+
+# Response headers used to revalidate cached pages
+VALIDATOR_HEADERS = ('etag', 'last-modified')
+
+# Fetch modes remembered per domain for the rest of a crawl
+FETCH_MODE_HTTP = "http"
+FETCH_MODE_BROWSER = "browser"
+
+# Empty mount points of common client-side frameworks (React, Vue, Angular, Next.js, Nuxt)
+_CLIENT_APP_ROOT_PATTERN = re.compile(
+    r'<(div|app-root)[^>]*\bid=["\'](root|app|__next|__nuxt)["\'][^>]*>\s*</\1>|<app-root[^>]*>\s*</app-root>',
+    re.IGNORECASE
+)
+_NOSCRIPT_JS_REQUIRED_PATTERN = re.compile(r'<noscript[^>]*>[^<]*(enable|aktivieren)[^<]*javascript', re.IGNORECASE)
+
+# Runs in the page and returns what `_parse_html` would extract from `page.content()`: the
+# stripped text nodes outside <script>/<style> (joined with spaces) and the (href, textContent)
+# pairs of all <a href> elements. Only this is sent back instead of the serialized DOM.
+_EXTRACT_TEXT_AND_ANCHORS_SCRIPT = """
+() => {
+    const textParts = [];
+    const root = document.documentElement;
+    if (root) {
+        const walker = document.createTreeWalker(root, NodeFilter.SHOW_ELEMENT | NodeFilter.SHOW_TEXT, {
+            acceptNode(node) {
+                if (node.nodeType === Node.TEXT_NODE) return NodeFilter.FILTER_ACCEPT;
+                const tag = node.localName;
+                return (tag === 'script' || tag === 'style') ? NodeFilter.FILTER_REJECT : NodeFilter.FILTER_SKIP;
+            }
+        });
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            const value = node.nodeValue.trim();
+            if (value) textParts.push(value);
+        }
+    }
+    const anchors = [];
+    for (const link of document.querySelectorAll('a[href]')) {
+        const href = (link.getAttribute('href') || '').trim();
+        if (href) anchors.push([href, link.textContent]);
+    }
+    return {text: textParts.join(' '), anchors: anchors};
+}
+"""
+
+
+async def _visible_text_length(page: Page) -> Optional[int]:
+    """Returns the length of the page's visible text, or None if it cannot be measured."""
+    try:
+        return await page.evaluate(_VISIBLE_TEXT_LENGTH_SCRIPT)
+    except PlaywrightError:
+        return None
+
+
+async def _wait_for_networkidle(page: Page, url: str, input_row_id: Any, company_name_or_id: str) -> None:
+    """
+    Waits up to `scraper_networkidle_timeout_ms` for network idle, unless the adaptive
+    policy has learned that waiting does not change this domain's pages.
+    """
+    timeout_ms = config_instance.scraper_networkidle_timeout_ms
+    domain = urlparse(url).netloc.lower()
+    if domain.startswith("www."):
+        domain = domain[4:]
+    if networkidle_policy and not networkidle_policy.should_wait(domain):
+        logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Skipping networkidle wait on {url}; it does not change pages on '{domain}'.")
+        return
+
+    text_length_before = await _visible_text_length(page) if networkidle_policy else None
+    logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Waiting for networkidle on {url} (timeout: {timeout_ms}ms)...")
+    wait_start = time.monotonic()
+    timed_out = False
+    try:
+        await page.wait_for_load_state('networkidle', timeout=timeout_ms)
+        logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Networkidle achieved for {url}.")
+    except PlaywrightTimeoutError:
+        timed_out = True
+        logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Timeout waiting for networkidle on {url} after {timeout_ms}ms. Proceeding with current DOM content.")
+    if networkidle_policy:
+        wait_seconds = time.monotonic() - wait_start
+        text_length_after = await _visible_text_length(page)
+        decision = networkidle_policy.record_wait(domain, wait_seconds, timed_out, text_length_before, text_length_after)
+        if decision:
+            logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Networkidle policy for '{domain}': {decision} (text length {text_length_before} -> {text_length_after}).")
+
+
+async def extract_in_browser(page: Page) -> Tuple[str, List[Tuple[str, str]]]:
+    """Returns the cleaned text and (href, anchor_text) pairs of the current page, extracted in the browser."""
+    result = await page.evaluate(_EXTRACT_TEXT_AND_ANCHORS_SCRIPT)
+    text = re.sub(r'\s+', ' ', result.get("text") or "").strip()
+    anchors = [(href, anchor_text or "") for href, anchor_text in result.get("anchors") or []]
+    return text, anchors
+
+
+def _record_validators(headers: Any, response_headers: Optional[Dict[str, str]]) -> None:
+    """Copies the ETag/Last-Modified headers of a response into `response_headers`, if given."""
+    if response_headers is None:
+        return
+    for header_name in VALIDATOR_HEADERS:
+        header_value = headers.get(header_name)
+        if header_value:
+            response_headers[header_name] = header_value
+
+
+async def fetch_page_content(
+    page: Page, url: str, input_row_id: Any, company_name_or_id: str, response_headers: Optional[Dict[str, str]] = None,
+    page_extraction: Optional[Dict[str, Any]] = None
+) -> Tuple[Optional[str], Optional[int]]:
+    """
+    Navigates `page` to `url` and returns (html_content, status_code).
+
+    If `page_extraction` is given and `scraper_in_browser_extraction` is enabled, the
+    text and anchors are extracted in the browser and stored in it ("text", "anchors",
+    "source"), and html_content is returned as "" instead of the serialized DOM.
+    """
     logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Navigating to URL: {url}")
     try:
         response = await page.goto(url, timeout=config_instance.default_navigation_timeout, wait_until='domcontentloaded')
@@ -15,13 +139,19 @@ async def fetch_page_content(page: Page, url: str, input_row_id: Any, company_na
             logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Navigation to {url} successful. Status: {response.status}")
             if response.ok:
                 if config_instance.scraper_networkidle_timeout_ms > 0:
-                    logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Waiting for networkidle on {url} (timeout: {config_instance.scraper_networkidle_timeout_ms}ms)...")
+                    await _wait_for_networkidle(page, url, input_row_id, company_name_or_id)
+                if page_extraction is not None and config_instance.scraper_in_browser_extraction:
                     try:
-                        await page.wait_for_load_state('networkidle', timeout=config_instance.scraper_networkidle_timeout_ms)
-                        logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Networkidle achieved for {url}.")
-                    except PlaywrightTimeoutError:
-                        logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Timeout waiting for networkidle on {url} after {config_instance.scraper_networkidle_timeout_ms}ms. Proceeding with current DOM content.")
+                        page_extraction["text"], page_extraction["anchors"] = await extract_in_browser(page)
+                        page_extraction["source"] = FETCH_MODE_BROWSER
+                        _record_validators(response.headers, response_headers)
+                        logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Text and links extracted in browser for {url}.")
+                        return "", response.status
+                    except PlaywrightError as e:
+                        page_extraction.clear()
+                        logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] In-browser extraction failed for {url}: {e}. Using page content instead.")
                 content = await page.content()
+                _record_validators(response.headers, response_headers)
                 logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Content fetched successfully for {url}.")
                 return content, response.status
             else:
@@ -42,4 +172,108 @@ async def fetch_page_content(page: Page, url: str, input_row_id: Any, company_na
         return None, -4 # Other Playwright error
     except Exception as e:
         logger.error(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Unexpected error fetching page {url}: {type(e).__name__} - {e}", exc_info=True)
-        return None, -5 # Generic exception
\ No newline at end of file
+        return None, -5 # Generic exception
+
+def _looks_client_rendered(html_content: str, text: str) -> bool:
+    """
+    Decides whether statically fetched HTML needs a browser to render its content.
+
+    `text` is the text already extracted from `html_content`. A page is treated as
+    client-rendered if it has too little extractable text (`scraper_http_min_text_chars`),
+    or if it has an empty framework mount point or a "please enable JavaScript"
+    notice and not clearly more text than that.
+    """
+    text_length = len(text)
+    min_chars = config_instance.scraper_http_min_text_chars
+    if text_length < min_chars:
+        return True
+    if text_length < 2 * min_chars and (
+        _CLIENT_APP_ROOT_PATTERN.search(html_content) or _NOSCRIPT_JS_REQUIRED_PATTERN.search(html_content)
+    ):
+        return True
+    return False
+
+
+async def _fetch_page_content_http(
+    http_client: httpx.AsyncClient, url: str, input_row_id: Any, company_name_or_id: str,
+    response_headers: Optional[Dict[str, str]] = None, prefetched_response: Optional[httpx.Response] = None
+) -> Tuple[Optional[str], Optional[int], Optional[str]]:
+    """
+    Fetches a page with a plain HTTP GET, or uses `prefetched_response` if given.
+
+    Returns:
+        (html_content, status_code, landed_url). html_content is None if the
+        response was not a successful HTML response.
+    """
+    response = prefetched_response
+    if response is None:
+        response = await http_client.get(
+            url,
+            headers={'User-Agent': config_instance.user_agent},
+            timeout=config_instance.default_navigation_timeout / 1000
+        )
+    content_type = response.headers.get('content-type', '').lower()
+    if not response.is_success or 'html' not in content_type:
+        logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] HTTP fast path for {url} not usable: status {response.status_code}, content-type '{content_type}'.")
+        return None, response.status_code, str(response.url)
+    _record_validators(response.headers, response_headers)
+    return response.text, response.status_code, str(response.url)
+
+
+async def fetch_page_content_fast(
+    page: Page,
+    http_client: httpx.AsyncClient,
+    url: str,
+    fetch_mode_by_domain: Dict[str, str],
+    input_row_id: Any,
+    company_name_or_id: str,
+    response_headers: Optional[Dict[str, str]] = None,
+    page_extraction: Optional[Dict[str, Any]] = None,
+    prefetched_response: Optional[httpx.Response] = None
+) -> Tuple[Optional[str], Optional[int], str]:
+    """
+    Fetches a page over plain HTTP first and escalates to Playwright only when needed.
+
+    The first page fetched for a domain decides that domain's mode: if its HTML
+    looks client-rendered, the domain is switched to the browser for the rest
+    of the crawl (recorded in `fetch_mode_by_domain`). HTTP errors, non-HTML
+    responses and transport errors fall back to Playwright for that URL only.
+
+    Only a domain's first HTTP page is checked; once the domain is in HTTP mode
+    its pages are used as fetched.
+
+    If `response_headers` is given, the ETag/Last-Modified headers of the
+    response that produced the returned HTML are stored in it. If `page_extraction`
+    is given, the text and anchors parsed from an HTTP page are stored in it
+    ("text", "anchors", "source"), so the caller does not parse the page again;
+    for pages rendered in the browser it is passed on to `fetch_page_content`.
+    `prefetched_response` (e.g. from a page cache revalidation) is used instead
+    of a new HTTP request.
+
+    Returns:
+        (html_content, status_code, landed_url), with the same status code
+        conventions as `fetch_page_content`.
+    """
+    domain = urlparse(url).netloc.lower()
+    if config_instance.scraper_http_fast_path_enabled and fetch_mode_by_domain.get(domain) != FETCH_MODE_BROWSER:
+        try:
+            html_content, status_code, landed_url = await _fetch_page_content_http(
+                http_client, url, input_row_id, company_name_or_id, response_headers, prefetched_response
+            )
+            if html_content is not None:
+                text, anchors = extract_text_and_anchors(html_content)
+                if fetch_mode_by_domain.get(domain) == FETCH_MODE_HTTP or not _looks_client_rendered(html_content, text):
+                    fetch_mode_by_domain[domain] = FETCH_MODE_HTTP
+                    if page_extraction is not None:
+                        page_extraction.update(text=text, anchors=anchors, source=FETCH_MODE_HTTP)
+                    logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Fetched {url} via HTTP fast path. Status: {status_code}")
+                    return html_content, status_code, landed_url or url
+                logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] {url} looks client-rendered; using browser for domain '{domain}' from now on.")
+                fetch_mode_by_domain[domain] = FETCH_MODE_BROWSER
+        except httpx.HTTPError as e:
+            logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] HTTP fast path failed for {url}: {type(e).__name__} - {e}. Falling back to browser.")
+
+    if response_headers is not None:
+        response_headers.clear()  # Drop validators of a rejected HTTP fast-path response
+    html_content, status_code = await fetch_page_content(page, url, input_row_id, company_name_or_id, response_headers, page_extraction)
+    return html_content, status_code, page.url
@@ -0,0 +1,112 @@
+"""
+Request interception profile for Playwright browser contexts.
+
+The scraper only keeps the text of `page.content()`, yet a browser navigation
+loads every image, font, video, stylesheet and analytics script of the page.
+`ResourceBlocker` installs a route handler on a browser context that aborts
+requests for blocked resource types (by default images, media, fonts and
+stylesheets) and for known third-party tracker domains, and lets everything
+else (documents, scripts, XHR/fetch) through.
+
+Sites that break without some of these resources can be allowlisted per domain
+(`SCRAPER_RESOURCE_BLOCKING_ALLOWLIST`):
+- "example.com" disables blocking entirely for that site and its subdomains.
+- "example.com:stylesheet|font" only lets those resource types through for that site.
+"""
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Set
+from urllib.parse import urlparse
+
+from playwright.async_api import BrowserContext, Route
+
+logger = logging.getLogger(__name__)
+
+ALLOW_ALL = "*"
+
+
+def _host_matches(host: str, domains: Iterable[str]) -> bool:
+    """True if `host` is one of `domains` or a subdomain of one."""
+    return any(host == domain or host.endswith(f".{domain}") for domain in domains)
+
+
+def parse_allowlist(entries: List[str]) -> Dict[str, Set[str]]:
+    """
+    Parses allowlist entries ("domain" or "domain:type1|type2") into {domain: allowed resource types}.
+    A domain without types maps to {"*"}, i.e. nothing is blocked for it.
+    """
+    allowlist: Dict[str, Set[str]] = {}
+    for entry in entries:
+        domain, _, resource_types = entry.partition(":")
+        domain = domain.strip().lower()
+        if domain.startswith("www."):
+            domain = domain[4:]
+        if not domain:
+            continue
+        allowed_types = {t.strip().lower() for t in resource_types.split("|") if t.strip()} or {ALLOW_ALL}
+        allowlist.setdefault(domain, set()).update(allowed_types)
+    return allowlist
+
+
+class ResourceBlocker:
+    """Aborts requests for heavy resource types and tracker domains on the contexts it is installed on."""
+
+    def __init__(self, blocked_resource_types: List[str], blocked_domains: List[str], allowlist_entries: List[str]):
+        """
+        Args:
+            blocked_resource_types (List[str]): Playwright resource types to abort (e.g. "image", "font").
+            blocked_domains (List[str]): Third-party domains whose requests are always aborted (subdomains included).
+            allowlist_entries (List[str]): Per-site exceptions, see the module docstring.
+        """
+        self.blocked_resource_types = {t.lower() for t in blocked_resource_types}
+        self.blocked_domains = [d.lower() for d in blocked_domains]
+        self.allowlist = parse_allowlist(allowlist_entries)
+        self._stats: Dict[str, Any] = {
+            "contexts_profiled": 0,
+            "contexts_allowlisted": 0,
+            "requests_continued": 0,
+            "requests_blocked_by_type": {},
+            "requests_blocked_tracker": 0,
+        }
+
+    def _allowed_types_for_site(self, site_host: str) -> Set[str]:
+        site_host = site_host.lower()
+        if site_host.startswith("www."):
+            site_host = site_host[4:]
+        allowed: Set[str] = set()
+        for domain, resource_types in self.allowlist.items():
+            if _host_matches(site_host, [domain]):
+                allowed |= resource_types
+        return allowed
+
+    async def install(self, context: BrowserContext, site_host: Optional[str], log_prefix: str = "") -> None:
+        """Installs the blocking route handler on `context` for a crawl of `site_host`."""
+        allowed_types = self._allowed_types_for_site(site_host or "")
+        if ALLOW_ALL in allowed_types:
+            self._stats["contexts_allowlisted"] += 1
+            logger.info(f"{log_prefix} Resource blocking disabled for allowlisted site '{site_host}'.")
+            return
+        blocked_types = self.blocked_resource_types - allowed_types
+        self._stats["contexts_profiled"] += 1
+
+        async def _handle_route(route: Route) -> None:
+            request = route.request
+            request_host = (urlparse(request.url).hostname or "").lower()
+            if request.resource_type in blocked_types:
+                by_type = self._stats["requests_blocked_by_type"]
+                by_type[request.resource_type] = by_type.get(request.resource_type, 0) + 1
+                await route.abort()
+            elif request.resource_type != "document" and _host_matches(request_host, self.blocked_domains):
+                self._stats["requests_blocked_tracker"] += 1
+                await route.abort()
+            else:
+                self._stats["requests_continued"] += 1
+                await route.continue_()
+
+        await context.route("**/*", _handle_route)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns blocking statistics suitable for `run_metrics`."""
+        stats = dict(self._stats)
+        stats["requests_blocked_by_type"] = dict(self._stats["requests_blocked_by_type"])
+        stats["requests_blocked_total"] = sum(stats["requests_blocked_by_type"].values()) + stats["requests_blocked_tracker"]
+        return stats
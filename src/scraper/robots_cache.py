@@ -0,0 +1,194 @@
+"""
+Cross-row cache of parsed robots.txt files.
+
+Without a cache, every row downloads and parses robots.txt for its host, even
+when many input rows point at the same site. `RobotsCache` keeps one parsed
+`RobotFileParser` per origin (scheme + host + port) for a configurable TTL,
+makes concurrent lookups for one origin share a single download, and can
+persist the fetched robots.txt bodies to a JSON file so later runs start warm.
+
+Only definitive answers are persisted: a fetched robots.txt (HTTP 200) and a
+missing one (HTTP 4xx, which means everything is allowed). Network errors and
+5xx responses are treated as "allowed", as before, and cached for this run only.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class _RobotsEntry:
+    """A cached robots.txt lookup. `lines` is None when everything is allowed."""
+
+    def __init__(self, lines: Optional[List[str]], fetched_at: float, persistent: bool):
+        self.lines = lines
+        self.fetched_at = fetched_at
+        self.persistent = persistent
+        self.parser: Optional[RobotFileParser] = None
+        if lines is not None:
+            self.parser = RobotFileParser()
+            self.parser.parse(lines)
+
+
+class RobotsCache:
+    """Caches parsed robots.txt files per origin with TTL, in-flight de-duplication and optional persistence."""
+
+    def __init__(self, ttl_seconds: int, persist_path: Optional[str] = None, fetch_timeout_seconds: float = 10.0):
+        """
+        Args:
+            ttl_seconds (int): How long a fetched robots.txt is reused before it is fetched again.
+            persist_path (Optional[str]): JSON file to load cached entries from and save them to. None disables persistence.
+            fetch_timeout_seconds (float): Timeout for downloading a robots.txt file.
+        """
+        self.ttl_seconds = max(0, ttl_seconds)
+        self.persist_path = persist_path
+        self.fetch_timeout_seconds = fetch_timeout_seconds
+        self._entries: Dict[str, _RobotsEntry] = {}
+        self._in_flight: Dict[str, "asyncio.Task[_RobotsEntry]"] = {}
+        self._loaded = False
+        self._dirty = False
+        self._stats: Dict[str, int] = {"lookups": 0, "cache_hits": 0, "fetches": 0, "in_flight_shared": 0}
+
+    async def is_allowed(
+        self,
+        url: str,
+        user_agent: str,
+        client: Optional[httpx.AsyncClient],
+        log_prefix: str = ""
+    ) -> bool:
+        """
+        Returns whether `user_agent` may fetch `url` according to the origin's robots.txt.
+
+        `client` is used for a download on a cache miss; if None, a short-lived client is created.
+        """
+        entry = await self._get_entry(url, user_agent, client, log_prefix)
+        if entry.parser is None:
+            return True
+        return entry.parser.can_fetch(user_agent, url)
+
+    async def sitemap_urls(
+        self,
+        url: str,
+        user_agent: str,
+        client: Optional[httpx.AsyncClient],
+        log_prefix: str = ""
+    ) -> List[str]:
+        """Returns the `Sitemap:` URLs declared in the robots.txt of `url`'s origin (empty if none)."""
+        entry = await self._get_entry(url, user_agent, client, log_prefix)
+        if entry.parser is None:
+            return []
+        return list(entry.parser.site_maps() or [])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns cache statistics suitable for `run_metrics`."""
+        stats: Dict[str, Any] = dict(self._stats)
+        stats["origins_cached"] = len(self._entries)
+        return stats
+
+    def save(self) -> None:
+        """Writes persistent, unexpired entries to `persist_path` if anything changed."""
+        if not self.persist_path or not self._dirty:
+            return
+        now = time.time()
+        data = {
+            origin: {"fetched_at": entry.fetched_at, "lines": entry.lines}
+            for origin, entry in self._entries.items()
+            if entry.persistent and not self._is_expired(entry, now)
+        }
+        try:
+            persist_dir = os.path.dirname(self.persist_path)
+            if persist_dir:
+                os.makedirs(persist_dir, exist_ok=True)
+            tmp_path = f"{self.persist_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.persist_path)
+            self._dirty = False
+            logger.info(f"RobotsCache: saved {len(data)} entries to {self.persist_path}.")
+        except OSError as e:
+            logger.warning(f"RobotsCache: could not save cache to {self.persist_path}: {e}")
+
+    def _load(self) -> None:
+        self._loaded = True
+        if not self.persist_path or not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"RobotsCache: could not load cache from {self.persist_path}: {e}")
+            return
+        now = time.time()
+        for origin, raw_entry in data.items():
+            entry = _RobotsEntry(raw_entry.get("lines"), raw_entry.get("fetched_at", 0.0), persistent=True)
+            if not self._is_expired(entry, now):
+                self._entries[origin] = entry
+        logger.info(f"RobotsCache: loaded {len(self._entries)} unexpired entries from {self.persist_path}.")
+
+    def _is_expired(self, entry: _RobotsEntry, now: float) -> bool:
+        return now - entry.fetched_at > self.ttl_seconds
+
+    async def _get_entry(self, url: str, user_agent: str, client: Optional[httpx.AsyncClient], log_prefix: str) -> _RobotsEntry:
+        if not self._loaded:
+            self._load()
+        self._stats["lookups"] += 1
+        parsed_url = urlparse(url)
+        origin = f"{parsed_url.scheme}://{parsed_url.netloc}".lower()
+
+        entry = self._entries.get(origin)
+        if entry is not None and not self._is_expired(entry, time.time()):
+            self._stats["cache_hits"] += 1
+            return entry
+
+        in_flight = self._in_flight.get(origin)
+        if in_flight is not None:
+            self._stats["in_flight_shared"] += 1
+        else:
+            # The download runs in its own task, so a cancelled caller never cancels it for the others
+            in_flight = asyncio.create_task(self._fetch_and_store(origin, user_agent, client, log_prefix))
+            self._in_flight[origin] = in_flight
+            in_flight.add_done_callback(lambda _: self._in_flight.pop(origin, None))
+        return await asyncio.shield(in_flight)
+
+    async def _fetch_and_store(self, origin: str, user_agent: str, client: Optional[httpx.AsyncClient], log_prefix: str) -> _RobotsEntry:
+        entry = await self._fetch(origin, user_agent, client, log_prefix)
+        self._entries[origin] = entry
+        if entry.persistent:
+            self._dirty = True
+        return entry
+
+    async def _fetch(self, origin: str, user_agent: str, client: Optional[httpx.AsyncClient], log_prefix: str) -> _RobotsEntry:
+        robots_url = f"{origin}/robots.txt"
+        headers = {'User-Agent': user_agent}
+        self._stats["fetches"] += 1
+        now = time.time()
+        try:
+            logger.debug(f"{log_prefix} Fetching robots.txt from: {robots_url}")
+            if client is None:
+                async with httpx.AsyncClient(follow_redirects=True, verify=False) as own_client:
+                    response = await own_client.get(robots_url, timeout=self.fetch_timeout_seconds, headers=headers)
+            else:
+                response = await client.get(robots_url, timeout=self.fetch_timeout_seconds, headers=headers)
+        except RuntimeError as e:  # The caller's client was closed while other rows still wait for this download
+            logger.warning(f"{log_prefix} Could not fetch robots.txt from {robots_url}: {e}. Assuming allowed.")
+            return _RobotsEntry(None, now, persistent=False)
+        except httpx.RequestError as e:
+            logger.warning(f"{log_prefix} httpx.RequestError fetching robots.txt from {robots_url}: {e}. Assuming allowed.")
+            return _RobotsEntry(None, now, persistent=False)
+
+        if response.status_code == 200:
+            logger.debug(f"{log_prefix} Successfully fetched robots.txt from {robots_url}.")
+            return _RobotsEntry(response.text.splitlines(), now, persistent=True)
+        if 400 <= response.status_code < 500:
+            logger.debug(f"{log_prefix} robots.txt not available at {robots_url} (status {response.status_code}), assuming allowed.")
+            return _RobotsEntry(None, now, persistent=True)
+        logger.warning(f"{log_prefix} Failed to fetch robots.txt from {robots_url}, status: {response.status_code}. Assuming allowed.")
+        return _RobotsEntry(None, now, persistent=False)
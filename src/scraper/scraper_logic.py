@@ -1,25 +1,37 @@
 import asyncio
+import contextlib
 import os
-import re
 import logging
 import time
 import hashlib # Added for hashing long filenames
-from urllib.parse import urljoin, urlparse, urldefrag, urlunparse
+from urllib.parse import urljoin, urlparse, urldefrag
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError, Error as PlaywrightError
 from bs4 import BeautifulSoup
 from bs4.element import Tag # Added for type checking
 import httpx # For asynchronous robots.txt checking
-from urllib.robotparser import RobotFileParser
-from typing import Set, Tuple, Optional, List, Dict, Any
-import tldextract # Added for DNS fallback logic
+from typing import Set, Tuple, Optional, List, Dict, Any, AsyncIterator, Iterable
 
 # Assuming config.py is in src.core
 from ..core.config import AppConfig
 from ..core.logging_config import setup_logging # For main app setup, or test setup
 
 # Import refactored functions
-from .scraper_utils import normalize_url, get_safe_filename, extract_text_from_html, find_internal_links, _classify_page_type, validate_link_status
-from .page_handler import fetch_page_content
+from .scraper_utils import (
+    normalize_url, get_safe_filename, extract_text_and_anchors, score_internal_links, _classify_page_type, validate_links,
+    dns_fallback_chain, probe_host_alive
+)
+from .page_handler import fetch_page_content_fast, FETCH_MODE_BROWSER, FETCH_MODE_HTTP
+from .browser_pool import BrowserPool, BROWSER_LAUNCH_ARGS
+from .robots_cache import RobotsCache
+from .page_cache import PageCache, CachedPage
+from .dns_resolver import AsyncDNSResolver
+from .resource_blocker import ResourceBlocker
+from .sitemap import SitemapDiscoverer
+from .host_limiter import HostRateLimiter
+from .artifact_store import (
+    ArtifactSink, DirectoryArtifactSink, PackedArtifactSink, STORE_PACKED, resolve_compression, packed_store_path
+)
+from .frontier import CrawlFrontier, BUDGET_EXHAUSTED, BUDGET_BYPASS, domain_key
 
 # Instantiate AppConfig for scraper_logic
 config_instance = AppConfig()
@@ -28,39 +40,288 @@ config_instance = AppConfig()
 logger = logging.getLogger(__name__)
 
 
-async def is_allowed_by_robots(url: str, client: httpx.AsyncClient, input_row_id: Any, company_name_or_id: str) -> bool:
+# Shared by all rows of a run (and across runs when ROBOTS_CACHE_PATH is set).
+robots_cache = RobotsCache(
+    ttl_seconds=config_instance.robots_cache_ttl_seconds,
+    persist_path=config_instance.robots_cache_path or None
+)
+
+# Pages of earlier runs, revalidated with conditional requests before fetching again.
+page_cache: Optional[PageCache] = PageCache(
+    db_path=config_instance.page_cache_path,
+    ttl_seconds=config_instance.page_cache_ttl_seconds
+) if config_instance.page_cache_enabled else None
+
+# Request interception profile installed on every browser context used for scraping.
+resource_blocker: Optional[ResourceBlocker] = ResourceBlocker(
+    blocked_resource_types=config_instance.scraper_blocked_resource_types,
+    blocked_domains=config_instance.scraper_blocked_tracker_domains,
+    allowlist_entries=config_instance.scraper_resource_blocking_allowlist
+) if config_instance.scraper_resource_blocking_enabled else None
+
+# Finds about/product pages in sitemaps while the homepage is being fetched.
+sitemap_discoverer: Optional[SitemapDiscoverer] = SitemapDiscoverer(
+    max_files=config_instance.scraper_sitemap_max_files,
+    max_urls=config_instance.scraper_sitemap_max_urls,
+    max_bytes_per_file=config_instance.scraper_sitemap_max_bytes
+) if config_instance.scraper_sitemap_discovery_enabled else None
+
+# Per-host concurrency cap and politeness delay for page fetches, shared by all rows.
+host_limiter = HostRateLimiter(
+    max_concurrent_per_host=config_instance.scraper_max_concurrent_fetches_per_host,
+    min_interval_seconds=config_instance.scraper_host_politeness_delay_ms / 1000
+)
+
+# Shared DNS answers for the run; filled by `preflight_dns` before rows are scraped.
+dns_resolver: Optional[AsyncDNSResolver] = AsyncDNSResolver(
+    concurrency=config_instance.dns_resolve_concurrency,
+    timeout_seconds=config_instance.dns_resolve_timeout_seconds
+) if config_instance.dns_preflight_enabled else None
+
+
+# Pages crawled versus pages whose text is used for the summary, across all rows of the run.
+_crawl_stats: Dict[str, int] = {
+    "entry_crawls": 0,
+    "pages_crawled": 0,
+    "pages_used_for_summary": 0,
+    "crawls_stopped_early": 0,
+    "queued_urls_skipped_by_early_stop": 0,
+    "concurrent_fetch_batches": 0,
+    "pages_fetched_concurrently": 0,
+    "pages_extracted_in_browser": 0,
+}
+
+
+# DNS fallback candidates probed concurrently instead of being navigated one by one.
+_dns_fallback_stats: Dict[str, Any] = {
+    "entry_dns_errors": 0,
+    "dns_error_navigation_seconds": 0.0,
+    "fallback_probe_rounds": 0,
+    "candidates_probed": 0,
+    "fallback_wins": 0,
+    "navigations_avoided": 0,
+    "probe_seconds": 0.0,
+}
+
+
+# Artifact sink per run output directory; pages of all rows of a run go to the same sink.
+_artifact_sinks: Dict[str, ArtifactSink] = {}
+
+
+def get_artifact_sink(output_dir_for_run: str) -> ArtifactSink:
+    """Returns the sink storing the cleaned page text of the run in `output_dir_for_run`."""
+    sink = _artifact_sinks.get(output_dir_for_run)
+    if sink is None:
+        content_dir = os.path.join(output_dir_for_run, config_instance.scraped_content_subdir)
+        if config_instance.scraped_content_store == STORE_PACKED:
+            compression = resolve_compression(config_instance.scraped_content_compression)
+            sink = PackedArtifactSink(packed_store_path(content_dir, compression), compression)
+        else:
+            sink = DirectoryArtifactSink(content_dir)
+        _artifact_sinks[output_dir_for_run] = sink
+        logger.info(f"Storing scraped page text with {type(sink).__name__} in {content_dir}.")
+    return sink
+
+
+def close_artifact_sinks() -> Dict[str, Any]:
+    """Closes all artifact sinks. Returns the statistics of the last one, for `run_metrics`."""
+    stats: Dict[str, Any] = {}
+    for output_dir_for_run, sink in list(_artifact_sinks.items()):
+        stats = sink.get_stats()
+        sink.close()
+        del _artifact_sinks[output_dir_for_run]
+    return stats
+
+
+def get_dns_fallback_stats() -> Dict[str, Any]:
+    """Returns DNS fallback probing statistics suitable for `run_metrics`."""
+    stats: Dict[str, Any] = dict(_dns_fallback_stats)
+    rounds = stats["fallback_probe_rounds"]
+    stats["fallback_win_rate"] = round(stats["fallback_wins"] / rounds, 4) if rounds else 0.0
+    # Each avoided navigation would have cost about as long as an observed DNS-error navigation
+    avg_dns_error_navigation = stats["dns_error_navigation_seconds"] / stats["entry_dns_errors"] if stats["entry_dns_errors"] else 0.0
+    stats["estimated_seconds_saved"] = round(max(0.0, stats["navigations_avoided"] * avg_dns_error_navigation - stats["probe_seconds"]), 3)
+    stats["dns_error_navigation_seconds"] = round(stats["dns_error_navigation_seconds"], 3)
+    stats["probe_seconds"] = round(stats["probe_seconds"], 3)
+    return stats
+
+
+def get_crawl_stats() -> Dict[str, Any]:
+    """Returns crawl statistics suitable for `run_metrics`."""
+    stats: Dict[str, Any] = dict(_crawl_stats)
+    stats["summary_driven_crawl_enabled"] = config_instance.scraper_summary_driven_crawl
+    stats["pages_not_used_for_summary"] = stats["pages_crawled"] - stats["pages_used_for_summary"]
+    return stats
+
+
+async def preflight_dns(given_urls: Iterable[Any]) -> Optional[Dict[str, Any]]:
+    """
+    Resolves the hosts of all input URLs and their DNS fallback variants concurrently.
+
+    The answers are cached in `dns_resolver`, so `scrape_website` later classifies
+    dead domains without a network round trip. Returns a summary for `run_metrics`,
+    or None if DNS pre-resolution is disabled.
+    """
+    if not dns_resolver:
+        return None
+    start_time = time.time()
+    hosts: List[str] = []
+    for given_url in given_urls:
+        if not given_url or not isinstance(given_url, str) or not given_url.strip():
+            continue
+        url = given_url.strip()
+        if not url.startswith(('http://', 'https://')):
+            url = f"http://{url}"
+        normalized_url = normalize_url(url)
+        host = urlparse(normalized_url).hostname
+        if not host or '.' not in host:
+            continue  # Hosts without a TLD are probed during URL validation
+        hosts.append(host)
+        if config_instance.enable_dns_error_fallbacks:
+            hosts.extend(urlparse(candidate).hostname or "" for candidate in dns_fallback_chain(normalized_url))
+    results = await dns_resolver.resolve_many(hosts)
+    summary = {
+        "hosts_checked": len(results),
+        "hosts_resolvable": sum(1 for resolvable in results.values() if resolvable),
+        "hosts_unresolvable": sum(1 for resolvable in results.values() if not resolvable),
+        "duration_seconds": round(time.time() - start_time, 3),
+    }
+    logger.info(
+        f"DNS pre-flight: {summary['hosts_checked']} hosts checked in {summary['duration_seconds']}s, "
+        f"{summary['hosts_unresolvable']} do not resolve."
+    )
+    return summary
+
+
+async def _probe_dns_fallbacks(
+    candidates: List[str], http_client: httpx.AsyncClient, log_prefix: str
+) -> Tuple[Optional[str], List[str]]:
+    """
+    Probes all DNS fallback `candidates` concurrently (DNS lookup, then a HEAD request).
+
+    Returns (the first live candidate in `candidates` order or None, the candidates after it).
+    Probes still running once a preferred candidate is known to be live are cancelled.
+    """
+    start_time = time.time()
+
+    async def _probe(candidate: str) -> bool:
+        if dns_resolver and not await dns_resolver.is_resolvable(urlparse(candidate).hostname or ""):
+            return False
+        return await probe_host_alive(candidate, http_client, config_instance.dns_fallback_probe_timeout_seconds)
+
+    probe_tasks = [asyncio.create_task(_probe(candidate)) for candidate in candidates]
+    winner_index: Optional[int] = None
+    try:
+        for index, probe_task in enumerate(probe_tasks):
+            if await probe_task:
+                winner_index = index
+                break
+    finally:
+        for probe_task in probe_tasks:
+            if not probe_task.done():
+                probe_task.cancel()
+
+    _dns_fallback_stats["fallback_probe_rounds"] += 1
+    _dns_fallback_stats["candidates_probed"] += len(candidates)
+    _dns_fallback_stats["probe_seconds"] += time.time() - start_time
+    # Serially, every candidate before the live one would have been a failed browser navigation
+    _dns_fallback_stats["navigations_avoided"] += len(candidates) if winner_index is None else winner_index
+    if winner_index is None:
+        logger.info(f"{log_prefix} DNS Fallback: none of {len(candidates)} candidates is live ({', '.join(candidates)}).")
+        return None, []
+    _dns_fallback_stats["fallback_wins"] += 1
+    logger.info(f"{log_prefix} DNS Fallback: '{candidates[winner_index]}' is live (candidate {winner_index + 1} of {len(candidates)}).")
+    return candidates[winner_index], candidates[winner_index + 1:]
+
+
+async def is_allowed_by_robots(url: str, client: Optional[httpx.AsyncClient], input_row_id: Any, company_name_or_id: str) -> bool:
+    """
+    Checks robots.txt for `url` using the shared `robots_cache`.
+
+    `client` is only used if robots.txt has to be downloaded; if None, the cache
+    opens a short-lived client for the download.
+    """
     if not config_instance.respect_robots_txt:
         logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] robots.txt check is disabled.")
         return True
-    parsed_url = urlparse(url)
-    robots_url = f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt"
-    rp = RobotFileParser()
+    log_prefix = f"[RowID: {input_row_id}, Company: {company_name_or_id}]"
     try:
-        logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Fetching robots.txt from: {robots_url}")
-        response = await client.get(robots_url, timeout=10, headers={'User-Agent': config_instance.robots_txt_user_agent})
-        if response.status_code == 200:
-            logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Successfully fetched robots.txt for {url}, status: {response.status_code}")
-            rp.parse(response.text.splitlines())
-        elif response.status_code == 404:
-            logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] robots.txt not found at {robots_url} (status 404), assuming allowed.")
-            return True
-        else:
-            logger.warning(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Failed to fetch robots.txt from {robots_url}, status: {response.status_code}. Assuming allowed.")
-            return True
-    except httpx.RequestError as e:
-        logger.warning(f"[RowID: {input_row_id}, Company: {company_name_or_id}] httpx.RequestError fetching robots.txt from {robots_url}: {e}. Assuming allowed.")
-        return True
+        allowed = await robots_cache.is_allowed(url, config_instance.robots_txt_user_agent, client, log_prefix)
     except Exception as e:
-        logger.error(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Unexpected error processing robots.txt for {robots_url}: {e}. Assuming allowed.", exc_info=True)
+        logger.error(f"{log_prefix} Unexpected error processing robots.txt for {url}: {e}. Assuming allowed.", exc_info=True)
         return True
-    allowed = rp.can_fetch(config_instance.robots_txt_user_agent, url)
     if not allowed:
-        logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Scraping disallowed by robots.txt for URL: {url} (User-agent: {config_instance.robots_txt_user_agent})")
+        logger.info(f"{log_prefix} Scraping disallowed by robots.txt for URL: {url} (User-agent: {config_instance.robots_txt_user_agent})")
     else:
-        logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Scraping allowed by robots.txt for URL: {url}")
+        logger.debug(f"{log_prefix} Scraping allowed by robots.txt for URL: {url}")
     return allowed
 
 
+async def _discover_sitemap_seeds(
+    entry_url: str, http_client: httpx.AsyncClient, input_row_id: Any, company_name_or_id: str
+) -> List[Tuple[str, int]]:
+    """
+    Returns the best-scoring sitemap URLs of `entry_url`'s site as (url, score), best first.
+
+    Sitemaps declared in robots.txt are used, or /sitemap.xml if none are declared. URLs are
+    scored with the same keyword rules as links found on pages.
+    """
+    assert sitemap_discoverer is not None
+    log_prefix = f"[RowID: {input_row_id}, Company: {company_name_or_id}]"
+    try:
+        declared_sitemaps = await robots_cache.sitemap_urls(entry_url, config_instance.robots_txt_user_agent, http_client, log_prefix)
+        parsed_entry_url = urlparse(entry_url)
+        sitemap_urls = declared_sitemaps or [f"{parsed_entry_url.scheme}://{parsed_entry_url.netloc}/sitemap.xml"]
+        page_urls = await sitemap_discoverer.discover(sitemap_urls, http_client, config_instance.user_agent, log_prefix)
+    except Exception as e:
+        logger.warning(f"{log_prefix} Sitemap discovery failed for {entry_url}: {type(e).__name__} - {e}")
+        return []
+    if not page_urls:
+        return []
+    scored_urls = score_internal_links([(page_url, "") for page_url in page_urls], entry_url, input_row_id, company_name_or_id)
+    scored_urls.sort(key=lambda url_and_score: -url_and_score[1])  # Stable: sitemap order among equal scores
+    return scored_urls[:config_instance.scraper_sitemap_seed_count]
+
+
+async def _fetch_crawl_page(
+    url: str,
+    page,
+    http_client: httpx.AsyncClient,
+    fetch_mode_by_domain: Dict[str, str],
+    input_row_id: Any,
+    company_name_or_id: str
+) -> Tuple[Optional[CachedPage], Optional[str], Optional[int], str, Dict[str, str], Dict[str, Any]]:
+    """
+    Fetches one frontier URL (from the page cache if unchanged) within the host's politeness limits.
+    Returns (cached_page, html_content, status_code, landed_url, response_headers, page_extraction);
+    page_extraction holds the page's "text" and "anchors" if the fetch already extracted them,
+    and their "source" (FETCH_MODE_HTTP or FETCH_MODE_BROWSER).
+    """
+    async with host_limiter.slot(domain_key(url)):
+        prefetched_response = None
+        if page_cache:
+            cached_page, prefetched_response = await page_cache.revalidate(
+                url, http_client, config_instance.user_agent,
+                config_instance.default_navigation_timeout / 1000,
+                f"[RowID: {input_row_id}, Company: {company_name_or_id}]"
+            )
+            if cached_page:
+                return cached_page, cached_page.html_content, cached_page.status_code, cached_page.landed_url, {}, {}
+        response_headers: Dict[str, str] = {}
+        page_extraction: Dict[str, Any] = {}
+        html_content, status_code, landed_url = await fetch_page_content_fast(
+            page, http_client, url, fetch_mode_by_domain, input_row_id, company_name_or_id, response_headers, page_extraction,
+            prefetched_response
+        )
+        return None, html_content, status_code, landed_url, response_headers, page_extraction
+
+
+async def _close_pages(pages: List[Any]) -> None:
+    """Closes the Playwright pages of an entry attempt that are still open."""
+    for page in pages:
+        if not page.is_closed():
+            await page.close()
+
 
 async def _perform_scrape_for_entry_point(
     entry_url_to_process: str,
@@ -77,15 +338,12 @@ async def _perform_scrape_for_entry_point(
     Returns page details, status, canonical URL, and collected text for summary.
     """
     start_time_entry = time.time()
+    _crawl_stats["entry_crawls"] += 1
     # final_canonical_entry_url_for_this_attempt will be the canonical URL derived *from this specific entry_url_to_process*
     # if it's successfully scraped.
     final_canonical_entry_url_for_this_attempt: Optional[str] = None
-    pages_scraped_this_entry_count = 0
-    high_priority_pages_scraped_after_limit_entry = 0
     
-    base_scraped_content_dir = os.path.join(output_dir_for_run, config_instance.scraped_content_subdir)
-    cleaned_pages_storage_dir = base_scraped_content_dir # Removed "cleaned_pages_text" subdirectory
-    # os.makedirs(cleaned_pages_storage_dir, exist_ok=True) # Already created in outer function
+    artifact_sink = get_artifact_sink(output_dir_for_run)
 
     company_safe_name = get_safe_filename(
         company_name_or_id,
@@ -99,130 +357,220 @@ async def _perform_scrape_for_entry_point(
     # These should ideally come from AppConfig if they need to be more dynamic
     # For now, using the types specified in the task.
     priority_page_types_for_summary = {"homepage", "about", "product_service"}
+    pages_for_summary_count = config_instance.scraper_pages_for_summary_count
+    max_summary_chars = config_instance.LLM_MAX_INPUT_CHARS_FOR_SUMMARY
+    collected_summary_chars = 0
+
+    # Frontier for this specific entry point attempt. Its seen-set tracks URLs queued or processed
+    # starting from *this* entry_url_to_process to avoid loops within its own scraping process.
+    frontier = CrawlFrontier(
+        max_pages_per_domain=config_instance.scraper_max_pages_per_domain,
+        score_threshold_for_limit_bypass=config_instance.scraper_score_threshold_for_limit_bypass,
+        max_high_priority_pages_after_limit=config_instance.scraper_max_high_priority_pages_after_limit
+    )
+    frontier.push(entry_url_to_process, 0, 100)
+    # All pages of this entry attempt count against the entry domain's budget, as before.
+    budget_domain = domain_key(entry_url_to_process)
 
-    # Queue for this specific entry point attempt
-    urls_to_scrape_q: List[Tuple[str, int, int]] = [(entry_url_to_process, 0, 100)]
-    # processed_urls_this_entry_call tracks URLs processed starting from *this* entry_url_to_process
-    # to avoid loops within its own scraping process.
-    processed_urls_this_entry_call: Set[str] = {entry_url_to_process}
-
-    # Use the passed Playwright context to create a new page for this entry attempt
+    # Use the passed Playwright context to create a new page for this entry attempt;
+    # more pages are opened on demand for concurrent child fetches.
     page = await playwright_context.new_page()
     page.set_default_timeout(config_instance.default_page_timeout)
+    pages = [page]
+    summary_input_complete = False
     
     entry_point_status_code: Optional[int] = None # To store status of the entry point itself
+    # Domain -> "http" or "browser"; decided by the first page fetched from each domain
+    fetch_mode_by_domain: Dict[str, str] = {}
+
+    # Sitemap discovery runs while the entry page is fetched; its best URLs are queued
+    # next to the entry page's own links.
+    sitemap_task: Optional[asyncio.Task] = None
+    if sitemap_discoverer and config_instance.max_depth_internal_links > 0:
+        sitemap_task = asyncio.create_task(
+            _discover_sitemap_seeds(entry_url_to_process, http_client, input_row_id, company_name_or_id)
+        )
 
     try:
-        while urls_to_scrape_q:
-            urls_to_scrape_q.sort(key=lambda x: (-x[2], x[1]))
-            current_url_from_queue, current_depth, current_score = urls_to_scrape_q.pop(0)
+        while frontier:
+            first_entry = frontier.pop()
+            current_url_from_queue, current_depth, current_score = first_entry
             
-            logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}, Entry: {entry_url_to_process}] Dequeuing URL: '{current_url_from_queue}' (Depth: {current_depth}, Score: {current_score}, Queue: {len(urls_to_scrape_q)})")
+            logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}, Entry: {entry_url_to_process}] Dequeuing URL: '{current_url_from_queue}' (Depth: {current_depth}, Score: {current_score}, Queue: {len(frontier)})")
 
             # Domain page limit checks
-            if config_instance.scraper_max_pages_per_domain > 0 and \
-               pages_scraped_this_entry_count >= config_instance.scraper_max_pages_per_domain:
-                if current_score < config_instance.scraper_score_threshold_for_limit_bypass or \
-                   high_priority_pages_scraped_after_limit_entry >= config_instance.scraper_max_high_priority_pages_after_limit:
-                    logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}, Entry: {entry_url_to_process}] Page limit reached, skipping '{current_url_from_queue}'.")
-                    continue
-                else: # Bypass for high priority
-                    logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}, Entry: {entry_url_to_process}] Page limit reached, but processing high-priority '{current_url_from_queue}'.")
-
-
-            html_content, status_code_fetch = await fetch_page_content(page, current_url_from_queue, input_row_id, company_name_or_id)
-            
-            if current_url_from_queue == entry_url_to_process and current_depth == 0: # This is the fetch for the entry point itself
-                entry_point_status_code = status_code_fetch
-
-
-            if html_content:
-                pages_scraped_this_entry_count += 1
-                if pages_scraped_this_entry_count > config_instance.scraper_max_pages_per_domain and \
-                   current_score >= config_instance.scraper_score_threshold_for_limit_bypass:
-                    high_priority_pages_scraped_after_limit_entry +=1
-
-                final_landed_url_raw = page.url
-                final_landed_url_normalized = normalize_url(final_landed_url_raw)
+            budget_status = frontier.check_budget(budget_domain, current_score)
+            if budget_status == BUDGET_EXHAUSTED:
+                logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}, Entry: {entry_url_to_process}] Page limit reached, skipping '{current_url_from_queue}'.")
+                continue
+            elif budget_status == BUDGET_BYPASS:
+                logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}, Entry: {entry_url_to_process}] Page limit reached, but processing high-priority '{current_url_from_queue}'.")
+
+            # Child pages are fetched in batches of the next best-scoring URLs, within the page budget.
+            # The entry page and high-priority pages beyond the limit are fetched on their own.
+            fetch_batch = [first_entry]
+            if current_depth > 0 and budget_status != BUDGET_BYPASS:
+                batch_size = config_instance.scraper_child_fetch_concurrency
+                remaining_pages = frontier.remaining_pages(budget_domain)
+                if remaining_pages is not None:
+                    batch_size = min(batch_size, remaining_pages)
+                while frontier and len(fetch_batch) < batch_size:
+                    fetch_batch.append(frontier.pop())
+            if len(fetch_batch) > 1:
+                _crawl_stats["concurrent_fetch_batches"] += 1
+                _crawl_stats["pages_fetched_concurrently"] += len(fetch_batch)
+                logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}, Entry: {entry_url_to_process}] Fetching {len(fetch_batch)} pages concurrently: {[batch_entry.url for batch_entry in fetch_batch]}")
+            while len(pages) < len(fetch_batch):
+                extra_page = await playwright_context.new_page()
+                extra_page.set_default_timeout(config_instance.default_page_timeout)
+                pages.append(extra_page)
+            fetch_results = await asyncio.gather(*(
+                _fetch_crawl_page(batch_entry.url, batch_page, http_client, fetch_mode_by_domain, input_row_id, company_name_or_id)
+                for batch_entry, batch_page in zip(fetch_batch, pages)
+            ))
+
+            # Results are processed one by one in frontier (score) order, so deduplication against
+            # globally_processed_urls, summary collection and link queueing behave as in a serial crawl.
+            for batch_index, ((current_url_from_queue, current_depth, current_score), fetch_result) in enumerate(zip(fetch_batch, fetch_results)):
+                cached_page, html_content, status_code_fetch, final_landed_url_raw, response_headers, page_extraction = fetch_result
+                # Pages extracted in the browser come back without HTML, and so do cached ones
+                page_fetched = cached_page is not None or bool(html_content) or bool(page_extraction)
+                if current_url_from_queue == entry_url_to_process and current_depth == 0: # This is the fetch for the entry point itself
+                    entry_point_status_code = status_code_fetch
+                    if sitemap_task is not None and page_fetched:
+                        sitemap_seeds = await sitemap_task
+                        sitemap_task = None
+                        seed_candidates = [
+                            (seed_url, seed_score) for seed_url, seed_score in sitemap_seeds
+                            if seed_url not in globally_processed_urls and seed_url not in frontier
+                        ]
+                        seed_validity = await validate_links(
+                            [seed_url for seed_url, _ in seed_candidates], http_client,
+                            config_instance.scraper_link_validation_concurrency_per_host
+                        )
+                        seeds_queued = sum(
+                            1 for seed_url, seed_score in seed_candidates
+                            if seed_validity.get(seed_url) and frontier.push(seed_url, 1, seed_score)
+                        )
+                        sitemap_discoverer.record_seeded(seeds_queued)
+                        if seeds_queued:
+                            logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}, Entry: {entry_url_to_process}] Queued {seeds_queued} URLs from sitemaps.")
+
+
+                if page_fetched:
+                    frontier.record_page(budget_domain, current_score)
+                    _crawl_stats["pages_crawled"] += 1
+
+                    final_landed_url_normalized = normalize_url(final_landed_url_raw)
                 
-                logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}, Entry: {entry_url_to_process}] Page fetch: Req='{current_url_from_queue}', LandedNorm='{final_landed_url_normalized}', Status: {status_code_fetch}")
+                    logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}, Entry: {entry_url_to_process}] Page fetch: Req='{current_url_from_queue}', LandedNorm='{final_landed_url_normalized}', Status: {status_code_fetch}")
 
-                if not final_canonical_entry_url_for_this_attempt and current_depth == 0:
-                    final_canonical_entry_url_for_this_attempt = final_landed_url_normalized
-                    logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Canonical URL for this entry attempt '{entry_url_to_process}' set to: '{final_canonical_entry_url_for_this_attempt}'")
-                
-                if final_landed_url_normalized in globally_processed_urls:
-                    logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}, Entry: {entry_url_to_process}] Landed URL '{final_landed_url_normalized}' already globally processed. Skipping content save/link extraction.")
-                    continue
+                    if not final_canonical_entry_url_for_this_attempt and current_depth == 0:
+                        final_canonical_entry_url_for_this_attempt = final_landed_url_normalized
+                        logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Canonical URL for this entry attempt '{entry_url_to_process}' set to: '{final_canonical_entry_url_for_this_attempt}'")
                 
-                globally_processed_urls.add(final_landed_url_normalized)
-                processed_urls_this_entry_call.add(final_landed_url_normalized)
-
-                # ... (rest of content saving and link extraction logic from original function, lines 394-433)
-                cleaned_text = extract_text_from_html(html_content)
-                parsed_landed_url = urlparse(final_landed_url_normalized)
-                source_domain = parsed_landed_url.netloc
-                safe_source_name = re.sub(r'^www\.', '', source_domain)
-                safe_source_name = re.sub(r'[^\w.-]', '_', safe_source_name)
-                # Truncate safe_source_name to avoid overly long directory names
-                safe_source_name_truncated_dir = safe_source_name[:50]
-                source_specific_output_dir = os.path.join(cleaned_pages_storage_dir, safe_source_name_truncated_dir)
-                os.makedirs(source_specific_output_dir, exist_ok=True)
-
-                landed_url_safe_name = get_safe_filename(final_landed_url_normalized, for_url=True)
-                cleaned_page_filename = f"{company_safe_name}__{landed_url_safe_name}_cleaned.txt"
-                cleaned_page_filepath = os.path.join(source_specific_output_dir, cleaned_page_filename)
+                    if final_landed_url_normalized in globally_processed_urls:
+                        logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}, Entry: {entry_url_to_process}] Landed URL '{final_landed_url_normalized}' already globally processed. Skipping content save/link extraction.")
+                        continue
                 
-                try:
-                    with open(cleaned_page_filepath, 'w', encoding='utf-8') as f_cleaned_page:
-                        f_cleaned_page.write(cleaned_text)
-                    page_type = _classify_page_type(final_landed_url_normalized, config_instance)
-                    scraped_page_details_for_this_entry.append((cleaned_page_filepath, final_landed_url_normalized, page_type))
-
-                    # New logic: Collect text for summary
-                    if page_type in priority_page_types_for_summary and \
-                       priority_pages_collected_count < getattr(config_instance, 'SCRAPER_PAGES_FOR_SUMMARY_COUNT', 3): # Default to 3 if not set
-                        collected_texts_for_summary.append(cleaned_text)
-                        priority_pages_collected_count += 1
-                        logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Collected text from '{final_landed_url_normalized}' (type: {page_type}) for summary. Count: {priority_pages_collected_count}")
-
-                except IOError as e:
-                    logger.error(f"[RowID: {input_row_id}, Company: {company_name_or_id}] IOError saving cleaned text for '{final_landed_url_normalized}': {e}")
-
-                if current_depth < config_instance.max_depth_internal_links:
-                    newly_found_links_with_scores = find_internal_links(html_content, final_landed_url_normalized, input_row_id, company_name_or_id)
-                    added_to_queue_count = 0
-                    for link_url, link_score in newly_found_links_with_scores:
-                        if link_url not in globally_processed_urls and link_url not in processed_urls_this_entry_call:
-                            if await validate_link_status(link_url, http_client):
-                                urls_to_scrape_q.append((link_url, current_depth + 1, link_score))
-                                processed_urls_this_entry_call.add(link_url)
-                                added_to_queue_count += 1
+                    globally_processed_urls.add(final_landed_url_normalized)
+                    frontier.mark_seen(final_landed_url_normalized)
+
+                    # ... (rest of content saving and link extraction logic from original function, lines 394-433)
+                    # Single parse for text and links; unchanged cached pages and pages
+                    # already parsed by the fetch are not parsed again
+                    if cached_page:
+                        cleaned_text, page_anchors = cached_page.text, cached_page.anchors
+                    else:
+                        if page_extraction:
+                            cleaned_text, page_anchors = page_extraction["text"], page_extraction["anchors"]
+                            if page_extraction["source"] == FETCH_MODE_BROWSER:
+                                _crawl_stats["pages_extracted_in_browser"] += 1
+                        else:
+                            cleaned_text, page_anchors = extract_text_and_anchors(html_content)
+                        if page_cache and html_content:  # Pages extracted in the browser have no HTML to revalidate against
+                            page_cache.put(
+                                current_url_from_queue, final_landed_url_raw, status_code_fetch or 200,
+                                response_headers, html_content, cleaned_text, page_anchors,
+                                html_is_http_body=page_extraction.get("source") == FETCH_MODE_HTTP
+                            )
+                    newly_found_links_with_scores: List[Tuple[str, int]] = []
+                    if current_depth < config_instance.max_depth_internal_links:
+                        newly_found_links_with_scores = score_internal_links(page_anchors, final_landed_url_normalized, input_row_id, company_name_or_id)
+
+                    try:
+                        page_type = _classify_page_type(final_landed_url_normalized, config_instance)
+                        # A file path, or "<store path>#<offset>" for the packed store
+                        artifact_ref = artifact_sink.write_page(company_safe_name, final_landed_url_normalized, page_type, cleaned_text)
+                        scraped_page_details_for_this_entry.append((artifact_ref, final_landed_url_normalized, page_type))
+
+                        # New logic: Collect text for summary
+                        if page_type in priority_page_types_for_summary and \
+                           priority_pages_collected_count < pages_for_summary_count:
+                            collected_texts_for_summary.append(cleaned_text)
+                            priority_pages_collected_count += 1
+                            # Joined with single spaces below
+                            collected_summary_chars += len(cleaned_text) + (1 if collected_summary_chars else 0)
+                            _crawl_stats["pages_used_for_summary"] += 1
+                            logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Collected text from '{final_landed_url_normalized}' (type: {page_type}) for summary. Count: {priority_pages_collected_count}")
+
+                    except IOError as e:
+                        logger.error(f"[RowID: {input_row_id}, Company: {company_name_or_id}] IOError saving cleaned text for '{final_landed_url_normalized}': {e}")
+
+                    # Summary-driven mode: further pages cannot change the summary input once
+                    # enough priority pages are collected or the character budget is filled.
+                    if config_instance.scraper_summary_driven_crawl and \
+                       (priority_pages_collected_count >= pages_for_summary_count or collected_summary_chars >= max_summary_chars):
+                        _crawl_stats["crawls_stopped_early"] += 1
+                        _crawl_stats["queued_urls_skipped_by_early_stop"] += len(frontier)
+                        unprocessed_pages = len(fetch_batch) - batch_index - 1  # Fetched in this batch, but not needed
+                        _crawl_stats["queued_urls_skipped_by_early_stop"] += unprocessed_pages
+                        logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}, Entry: {entry_url_to_process}] Summary input complete ({priority_pages_collected_count} priority pages, {collected_summary_chars} chars); stopping crawl with {len(frontier) + unprocessed_pages} URLs still queued.")
+                        summary_input_complete = True
+                        break
+
+                    if current_depth < config_instance.max_depth_internal_links:
+                        candidate_links = [
+                            (link_url, link_score) for link_url, link_score in newly_found_links_with_scores
+                            if link_url not in globally_processed_urls and link_url not in frontier
+                        ]
+                        # Validate all candidates of this page concurrently (capped per host, memoised per URL)
+                        link_validity = await validate_links(
+                            [link_url for link_url, _ in candidate_links], http_client,
+                            config_instance.scraper_link_validation_concurrency_per_host
+                        )
+                        for link_url, link_score in candidate_links:
+                            if link_url in frontier:
+                                continue  # Same link found twice on this page
+                            if link_validity.get(link_url):
+                                frontier.push(link_url, current_depth + 1, link_score)
                             else:
                                 logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Skipping invalid link: {link_url}")
-                    if added_to_queue_count > 0: urls_to_scrape_q.sort(key=lambda x: (-x[2], x[1]))
-            else: # html_content is None
-                logger.warning(f"[RowID: {input_row_id}, Company: {company_name_or_id}, Entry: {entry_url_to_process}] Failed to fetch content from '{current_url_from_queue}'. Status code: {status_code_fetch}.")
-                if current_url_from_queue == entry_url_to_process and current_depth == 0: # Critical failure on the entry point itself
-                    status_map = {-1: "TimeoutError", -2: "DNSError", -3: "ConnectionRefused", -4: "PlaywrightError", -5: "GenericScrapeError", -6: "RequestAborted"}
-                    http_status_report = "UnknownScrapeError"
-                    if status_code_fetch is not None:
-                        if status_code_fetch > 0: http_status_report = f"HTTPError_{status_code_fetch}"
-                        elif status_code_fetch in status_map: http_status_report = status_map[status_code_fetch]
-                        else: http_status_report = "UnknownScrapeErrorCode"
-                    else: http_status_report = "NoStatusFromServer"
+                else: # No content fetched
+                    logger.warning(f"[RowID: {input_row_id}, Company: {company_name_or_id}, Entry: {entry_url_to_process}] Failed to fetch content from '{current_url_from_queue}'. Status code: {status_code_fetch}.")
+                    if current_url_from_queue == entry_url_to_process and current_depth == 0: # Critical failure on the entry point itself
+                        status_map = {-1: "TimeoutError", -2: "DNSError", -3: "ConnectionRefused", -4: "PlaywrightError", -5: "GenericScrapeError", -6: "RequestAborted"}
+                        http_status_report = "UnknownScrapeError"
+                        if status_code_fetch is not None:
+                            if status_code_fetch > 0: http_status_report = f"HTTPError_{status_code_fetch}"
+                            elif status_code_fetch in status_map: http_status_report = status_map[status_code_fetch]
+                            else: http_status_report = "UnknownScrapeErrorCode"
+                        else: http_status_report = "NoStatusFromServer"
                     
-                    logger.error(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Critical failure on entry point '{entry_url_to_process}'. Scraper status: {http_status_report}.")
-                    await page.close()
-                    return [], http_status_report, None, "" # No canonical URL, empty summary text
+                        logger.error(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Critical failure on entry point '{entry_url_to_process}'. Scraper status: {http_status_report}.")
+                        await _close_pages(pages)
+                        return [], http_status_report, None, "" # No canonical URL, empty summary text
+
+            if summary_input_complete:
+                break
         
         # After loop for this entry point
-        await page.close()
+        await _close_pages(pages)
 
         final_summary_input_text = ""
         if collected_texts_for_summary:
             final_summary_input_text = " ".join(collected_texts_for_summary)
-            max_chars = getattr(config_instance, 'LLM_MAX_INPUT_CHARS_FOR_SUMMARY', 40000) # Default to 40k
+            max_chars = max_summary_chars
             if len(final_summary_input_text) > max_chars:
                 final_summary_input_text = final_summary_input_text[:max_chars]
                 logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Truncated collected summary text to {max_chars} characters.")
@@ -246,7 +594,7 @@ async def _perform_scrape_for_entry_point(
             return [], final_status_for_this_entry, final_canonical_entry_url_for_this_attempt, final_summary_input_text # Return canonical if set, and whatever summary text was gathered (likely empty)
     except Exception as e_entry_scrape:
         logger.error(f"[RowID: {input_row_id}, Company: {company_name_or_id}, Entry: {entry_url_to_process}] General error during scraping process: {type(e_entry_scrape).__name__} - {e_entry_scrape}", exc_info=True)
-        if page.is_closed() == False : await page.close()
+        await _close_pages(pages)
         # Attempt to return any summary text collected before the error
         final_summary_input_text_on_error = ""
         if collected_texts_for_summary: # Check if this list was populated before error
@@ -255,6 +603,42 @@ async def _perform_scrape_for_entry_point(
             if len(final_summary_input_text_on_error) > max_chars:
                 final_summary_input_text_on_error = final_summary_input_text_on_error[:max_chars]
         return [], f"GeneralScrapingError_{type(e_entry_scrape).__name__}", final_canonical_entry_url_for_this_attempt, final_summary_input_text_on_error
+    finally:
+        if sitemap_task is not None and not sitemap_task.done():
+            sitemap_task.cancel()  # Entry page failed; its sitemap seeds are not needed
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Creates the HTTP client for page fetches, robots.txt, sitemaps and link validation.
+
+    The pipeline creates one per run and passes it to every `scrape_website`
+    call, so connections and TLS sessions are reused across rows.
+    """
+    return httpx.AsyncClient(
+        follow_redirects=True,
+        verify=False,
+        limits=httpx.Limits(
+            max_connections=config_instance.scraper_http_max_connections,
+            max_keepalive_connections=config_instance.scraper_http_max_keepalive_connections
+        )
+    )
+
+
+@contextlib.asynccontextmanager
+async def _standalone_browser_context() -> AsyncIterator[Any]:
+    """Launches a dedicated browser for one scrape_website call and yields a context on it."""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True, args=BROWSER_LAUNCH_ARGS)
+        try:
+            yield await browser.new_context(
+                user_agent=config_instance.user_agent,
+                java_script_enabled=True,
+                ignore_https_errors=True
+            )
+        finally:
+            if browser.is_connected():
+                await browser.close()
 
 
 async def scrape_website(
@@ -262,8 +646,18 @@ async def scrape_website(
     output_dir_for_run: str,
     company_name_or_id: str,
     globally_processed_urls: Set[str],
-    input_row_id: Any
+    input_row_id: Any,
+    browser_pool: Optional[BrowserPool] = None,
+    http_client: Optional[httpx.AsyncClient] = None
 ) -> Tuple[List[Tuple[str, str, str]], str, Optional[str], Optional[str]]: # Added Optional[str] for summary text
+    """
+    Scrapes a website starting from `given_url`, trying DNS fallback variants if enabled.
+
+    If `browser_pool` is given, a browser context is leased from it for the duration
+    of the call; otherwise a browser is launched and closed for this call only.
+    Likewise, `http_client` (see `create_http_client`) is used if given; otherwise
+    a client is opened and closed for this call only.
+    """
     start_time = time.time()
     logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Starting scrape_website for original URL: {given_url}")
 
@@ -274,45 +668,59 @@ async def scrape_website(
         logger.warning(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Invalid URL after normalization: {normalized_given_url}")
         return [], "InvalidURL", None, None # Added None for summary text
 
-    # Initial robots.txt check for the very first normalized URL
-    async with httpx.AsyncClient(follow_redirects=True, verify=False) as http_client:
-        if not await is_allowed_by_robots(normalized_given_url, http_client, input_row_id, company_name_or_id):
-            return [], "RobotsDisallowed", None, None # Added None for summary text
+    # Entry candidates in the order they are tried; with DNS pre-resolution, candidates whose
+    # host does not resolve are dropped up front instead of failing a browser navigation each.
+    initial_entry_candidates: List[str] = [normalized_given_url]
+    if dns_resolver:
+        candidate_chain = [normalized_given_url]
+        if config_instance.enable_dns_error_fallbacks:
+            candidate_chain += dns_fallback_chain(normalized_given_url, f"[RowID: {input_row_id}, Company: {company_name_or_id}]")
+        host_resolvable = await dns_resolver.resolve_many(urlparse(candidate).hostname or "" for candidate in candidate_chain)
+        initial_entry_candidates = [
+            candidate for candidate in candidate_chain if host_resolvable.get(urlparse(candidate).hostname or "", True)
+        ]
+        if not initial_entry_candidates:
+            logger.warning(f"[RowID: {input_row_id}, Company: {company_name_or_id}] No entry candidate resolves in DNS ({', '.join(candidate_chain)}). Skipping browser navigation.")
+            return [], "DNSError", None, None
+        if initial_entry_candidates[0] != normalized_given_url:
+            logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] '{normalized_given_url}' does not resolve; starting at DNS fallback '{initial_entry_candidates[0]}'.")
+
+    # Initial robots.txt check for the first entry candidate (cached per origin across rows)
+    if not await is_allowed_by_robots(initial_entry_candidates[0], http_client, input_row_id, company_name_or_id):
+        return [], "RobotsDisallowed", None, None # Added None for summary text
     
     # Prepare directories once
-    base_scraped_content_dir = os.path.join(output_dir_for_run, config_instance.scraped_content_subdir)
-    cleaned_pages_storage_dir = base_scraped_content_dir # Removed "cleaned_pages_text" subdirectory
-    os.makedirs(cleaned_pages_storage_dir, exist_ok=True) # This now ensures base_scraped_content_dir exists
+    os.makedirs(os.path.join(output_dir_for_run, config_instance.scraped_content_subdir), exist_ok=True)
 
+    # Only one candidate is queued at a time; after a DNS error the untried candidates are
+    # probed concurrently and the first live one is queued next.
     entry_candidates_queue: asyncio.Queue[str] = asyncio.Queue()
-    await entry_candidates_queue.put(normalized_given_url)
+    await entry_candidates_queue.put(initial_entry_candidates[0])
+    untried_fallback_candidates: List[str] = initial_entry_candidates[1:]
     
     # Tracks entry URLs attempted *within this specific call to scrape_website* to avoid loops from fallbacks
+    # (pre-resolved candidates count as attempted, so dead variants are not queued again)
     attempted_entry_candidates_this_call: Set[str] = {normalized_given_url}
+    if dns_resolver:
+        attempted_entry_candidates_this_call.update(candidate_chain)
     
     last_dns_error_status = "DNSError_AllFallbacksExhausted" # Default if all fallbacks lead to DNS errors
 
-    async with async_playwright() as p, httpx.AsyncClient(follow_redirects=True, verify=False) as http_client_for_validation:
-        browser = None
-        try:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=['--no-sandbox', '--disable-setuid-sandbox', '--disable-dev-shm-usage']
-            )
-            # Create one context to be reused by _perform_scrape_for_entry_point attempts
-            # This means cookies/state might persist across fallback attempts for the same original given_url.
-            # If strict isolation is needed, context creation would move inside the loop.
-            playwright_context = await browser.new_context(
-                user_agent=config_instance.user_agent,
-                java_script_enabled=True,
-                ignore_https_errors=True
-            )
-
+    log_prefix = f"[RowID: {input_row_id}, Company: {company_name_or_id}]"
+    context_source = browser_pool.lease_context(log_prefix) if browser_pool else _standalone_browser_context()
+    http_client_source = contextlib.nullcontext(http_client) if http_client else create_http_client()
+    try:
+        # One context is reused by _perform_scrape_for_entry_point attempts, so cookies/state
+        # persist across fallback attempts for the same original given_url.
+        async with context_source as playwright_context, http_client_source as http_client_for_validation:
+            if resource_blocker:
+                await resource_blocker.install(playwright_context, urlparse(initial_entry_candidates[0]).hostname, log_prefix)
             while not entry_candidates_queue.empty():
                 current_entry_url_to_attempt = await entry_candidates_queue.get()
                 
                 logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Trying entry point: {current_entry_url_to_attempt}")
 
+                attempt_start_time = time.time()
                 details, status, canonical_landed, collected_summary_text = await _perform_scrape_for_entry_point(
                     current_entry_url_to_attempt, playwright_context, http_client_for_validation, output_dir_for_run,
                     company_name_or_id, globally_processed_urls, input_row_id
@@ -320,75 +728,41 @@ async def scrape_website(
 
                 if status != "DNSError": # Any success or non-DNS error is final for this given_url
                     logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Entry point {current_entry_url_to_attempt} resulted in non-DNS status: {status}. Finalizing.")
-                    if browser.is_connected(): await browser.close()
                     return details, status, canonical_landed, collected_summary_text # Propagate summary text
                 
                 # It was a DNSError for current_entry_url_to_attempt
                 last_dns_error_status = status # Store the most recent DNS error type
+                _dns_fallback_stats["entry_dns_errors"] += 1
+                _dns_fallback_stats["dns_error_navigation_seconds"] += time.time() - attempt_start_time
                 logger.warning(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Entry point {current_entry_url_to_attempt} failed with DNSError. Status: {status}.")
 
                 if config_instance.enable_dns_error_fallbacks:
-                    generated_fallbacks_for_current_failed_entry: List[str] = []
-                    
-                    # Strategy 1: Hyphen Simplification
-                    try:
-                        parsed_failed_entry = tldextract.extract(current_entry_url_to_attempt)
-                        domain_part = parsed_failed_entry.domain
-                        suffix_part = parsed_failed_entry.suffix
-                        
-                        if '-' in domain_part:
-                            simplified_domain_part = domain_part.split('-', 1)[0]
-                            if simplified_domain_part:
-                                variant1_domain = f"{simplified_domain_part}.{suffix_part}"
-                                parsed_original_for_reconstruct = urlparse(current_entry_url_to_attempt)
-                                variant1_url = urlunparse((parsed_original_for_reconstruct.scheme, variant1_domain, parsed_original_for_reconstruct.path, parsed_original_for_reconstruct.params, parsed_original_for_reconstruct.query, parsed_original_for_reconstruct.fragment))
-                                variant1_url_normalized = normalize_url(variant1_url)
-                                if variant1_url_normalized not in attempted_entry_candidates_this_call:
-                                    logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] DNS Fallback (Hyphen): Adding '{variant1_url_normalized}' to try.")
-                                    generated_fallbacks_for_current_failed_entry.append(variant1_url_normalized)
-                    except Exception as e_tld_hyphen:
-                        logger.error(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Error during hyphen simplification for {current_entry_url_to_attempt}: {e_tld_hyphen}")
-
-                    # Strategy 2: TLD Swap (.de to .com) on current_entry_url_to_attempt (that just DNS-failed)
-                    try:
-                        parsed_failed_entry_for_tld_swap = tldextract.extract(current_entry_url_to_attempt)
-                        if parsed_failed_entry_for_tld_swap.suffix.lower() == 'de':
-                            variant2_domain = f"{parsed_failed_entry_for_tld_swap.domain}.com"
-                            parsed_original_for_reconstruct_tld = urlparse(current_entry_url_to_attempt)
-                            variant2_url = urlunparse((parsed_original_for_reconstruct_tld.scheme, variant2_domain, parsed_original_for_reconstruct_tld.path, parsed_original_for_reconstruct_tld.params, parsed_original_for_reconstruct_tld.query, parsed_original_for_reconstruct_tld.fragment))
-                            variant2_url_normalized = normalize_url(variant2_url)
-                            if variant2_url_normalized not in attempted_entry_candidates_this_call:
-                                logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] DNS Fallback (TLD Swap): Adding '{variant2_url_normalized}' to try.")
-                                generated_fallbacks_for_current_failed_entry.append(variant2_url_normalized)
-                    except Exception as e_tld_swap_main:
-                        logger.error(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Error during .de to .com TLD swap for {current_entry_url_to_attempt}: {e_tld_swap_main}")
-
-                    for fb_url in generated_fallbacks_for_current_failed_entry:
-                        if fb_url not in attempted_entry_candidates_this_call: # Double check before adding
-                           await entry_candidates_queue.put(fb_url)
-                           attempted_entry_candidates_this_call.add(fb_url)
+                    fallback_candidates = list(untried_fallback_candidates)
+                    for fb_url in dns_fallback_chain(current_entry_url_to_attempt, log_prefix):
+                        if fb_url not in attempted_entry_candidates_this_call:
+                            fallback_candidates.append(fb_url)
+                            attempted_entry_candidates_this_call.add(fb_url)
+                    untried_fallback_candidates = []
+                    if fallback_candidates:
+                        live_fallback, untried_fallback_candidates = await _probe_dns_fallbacks(
+                            fallback_candidates, http_client_for_validation, log_prefix
+                        )
+                        if live_fallback:
+                            logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] DNS Fallback: Adding '{live_fallback}' to try.")
+                            await entry_candidates_queue.put(live_fallback)
                 else: # DNS fallbacks disabled
                     logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] DNS fallbacks disabled. No further attempts for {current_entry_url_to_attempt}.")
                     # If this was the last item in queue (i.e. normalized_given_url and no fallbacks added)
                     # the loop will terminate and the last_dns_error_status will be returned.
             
             # If queue is exhausted
-            if browser and browser.is_connected(): await browser.close()
             logger.error(f"[RowID: {input_row_id}, Company: {company_name_or_id}] All entry point attempts, including DNS fallbacks, exhausted for original URL: {given_url}. Last DNS status: {last_dns_error_status}")
             return [], last_dns_error_status, None, None # Added None for summary text
 
-        except Exception as e_outer:
-            logger.error(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Outer error in scrape_website for '{given_url}': {type(e_outer).__name__} - {e_outer}", exc_info=True)
-            if browser and browser.is_connected(): await browser.close()
-            return [], f"OuterScrapingError_{type(e_outer).__name__}", None, None # Added None for summary text
-        finally:
-            if browser and browser.is_connected():
-                logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Ensuring browser is closed in scrape_website's final 'finally' block.")
-                await browser.close()
-
-    # Fallback if Playwright setup itself failed before entering the async with block
-    logger.error(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Scrape_website ended, possibly due to Playwright launch failure for '{given_url}'.")
-    return [], "ScraperSetupFailure_Outer", None, None # Added None for summary text
+    except Exception as e_outer:
+        # Also covers browser launch / context lease failures; the browser is closed by the context manager.
+        logger.error(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Outer error in scrape_website for '{given_url}': {type(e_outer).__name__} - {e_outer}", exc_info=True)
+        return [], f"OuterScrapingError_{type(e_outer).__name__}", None, None # Added None for summary text
 
 # TODO: [FutureEnhancement] The _test_scraper function below was for demonstrating and testing
 # the scrape_website functionality directly. It includes setup for logging and test output.
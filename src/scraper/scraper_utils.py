@@ -1,16 +1,28 @@
+import asyncio
+import importlib.util
 import logging
 import re
 import hashlib
-from urllib.parse import urljoin, urlparse, urldefrag
+from collections import OrderedDict
+from urllib.parse import urljoin, urlparse, urldefrag, urlunparse
 from bs4 import BeautifulSoup
 from bs4.element import Tag
-from typing import List, Tuple, Optional, Any
+from typing import Dict, List, Tuple, Optional, Any
 import httpx
+import tldextract
+
+try:
+    from selectolax.lexbor import LexborHTMLParser  # Optional: fastest parser backend
+except ImportError:
+    LexborHTMLParser = None
 
 from ..core.config import AppConfig
+from .link_scorer import LinkKeywordMatcher
 
 config_instance = AppConfig()
 logger = logging.getLogger(__name__)
+# Link scoring rules, compiled once from the keyword settings
+link_keyword_matcher = LinkKeywordMatcher.from_config(config_instance)
 
 def normalize_url(url: str) -> str:
     """
@@ -66,30 +78,99 @@ def get_safe_filename(name_or_url: str, for_url: bool = False, max_len: int = 10
         logger.info(f"DEBUG PATH: get_safe_filename (for_url=False) output: '{safe_name_truncated}' (original sanitized: '{safe_name}', max_len: {max_len}) from input '{original_input}'") # DEBUG PATH LENGTH
         return safe_name_truncated
 
-def extract_text_from_html(html_content: str) -> str:
-    if not html_content: return ""
-    soup = BeautifulSoup(html_content, 'html.parser')
-    for script_or_style in soup(["script", "style"]):
-        script_or_style.decompose()
-    text = soup.get_text(separator=' ', strip=True)
+# Parser backends in order of preference for SCRAPER_HTML_PARSER="auto".
+HTML_PARSER_BACKENDS = ("selectolax", "lxml", "html.parser")
+_resolved_html_parser: Optional[str] = None
+
+
+def _backend_available(backend: str) -> bool:
+    if backend == "selectolax":
+        return LexborHTMLParser is not None
+    if backend == "lxml":
+        return importlib.util.find_spec("lxml") is not None
+    return backend == "html.parser"
+
+
+def available_html_parsers() -> List[str]:
+    """Returns the installed parser backends, fastest first."""
+    return [backend for backend in HTML_PARSER_BACKENDS if _backend_available(backend)]
+
+
+def resolve_html_parser(requested: Optional[str] = None) -> str:
+    """
+    Returns the HTML parser backend to use.
+
+    `requested` (default: `SCRAPER_HTML_PARSER`) is "auto" or one of
+    `HTML_PARSER_BACKENDS`. "auto" picks the fastest installed backend; a
+    requested backend that is not installed falls back to "html.parser".
+    """
+    global _resolved_html_parser
+    if requested is None and _resolved_html_parser is not None:
+        return _resolved_html_parser
+    choice = (requested or config_instance.scraper_html_parser or "auto").strip().lower()
+    if choice == "auto":
+        backend = next(b for b in HTML_PARSER_BACKENDS if _backend_available(b))
+    elif choice in HTML_PARSER_BACKENDS and _backend_available(choice):
+        backend = choice
+    else:
+        logger.warning(f"HTML parser '{choice}' is not available; falling back to 'html.parser'.")
+        backend = "html.parser"
+    if requested is None:
+        _resolved_html_parser = backend
+        logger.info(f"Using HTML parser backend: {backend}")
+    return backend
+
+
+def _parse_html(html_content: str, parser: str, collect_links: bool) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Parses `html_content` once and returns (cleaned_text, anchors).
+
+    Anchors are (href, anchor_text) pairs of all `<a href>` elements; they are
+    only collected if `collect_links` is True. Script and style content is
+    excluded from the text.
+    """
+    anchors: List[Tuple[str, str]] = []
+    if parser == "selectolax":
+        tree = LexborHTMLParser(html_content)
+        if collect_links:
+            for node in tree.css("a[href]"):
+                href = (node.attributes.get("href") or "").strip()
+                if href:
+                    anchors.append((href, node.text(deep=True)))
+        tree.strip_tags(["script", "style"])
+        text = tree.root.text(separator=" ", strip=True) if tree.root is not None else ""
+    else:
+        soup = BeautifulSoup(html_content, parser)
+        if collect_links:
+            for link_tag in soup.find_all('a', href=True):
+                if not isinstance(link_tag, Tag): continue
+                href_attr = link_tag.get('href')
+                current_href: Optional[str] = None
+                if isinstance(href_attr, str): current_href = href_attr.strip()
+                elif isinstance(href_attr, list) and href_attr and isinstance(href_attr[0], str): current_href = href_attr[0].strip()
+                if current_href:
+                    anchors.append((current_href, link_tag.get_text()))
+        for script_or_style in soup(["script", "style"]):
+            script_or_style.decompose()
+        text = soup.get_text(separator=' ', strip=True)
     text = re.sub(r'\s+', ' ', text).strip()
-    return text
+    return text, anchors
 
-def find_internal_links(html_content: str, base_url: str, input_row_id: Any, company_name_or_id: str) -> List[Tuple[str, int]]:
-    if not html_content: return []
+
+def extract_text_and_anchors(html_content: str, parser: Optional[str] = None) -> Tuple[str, List[Tuple[str, str]]]:
+    """
+    Parses a page once and returns its cleaned text and the (href, anchor_text) pairs of its links.
+    `parser` is one of `HTML_PARSER_BACKENDS` (default: `SCRAPER_HTML_PARSER`, see `resolve_html_parser`).
+    """
+    if not html_content: return "", []
+    return _parse_html(html_content, resolve_html_parser(parser), collect_links=True)
+
+def score_internal_links(anchors: List[Tuple[str, str]], base_url: str, input_row_id: Any, company_name_or_id: str) -> List[Tuple[str, int]]:
     scored_links: List[Tuple[str, int]] = []
-    soup = BeautifulSoup(html_content, 'html.parser')
     normalized_base_url_str = normalize_url(base_url)
     parsed_base_url = urlparse(normalized_base_url_str)
 
-    for link_tag in soup.find_all('a', href=True):
-        if not isinstance(link_tag, Tag): continue
-        href_attr = link_tag.get('href')
-        current_href: Optional[str] = None
-        if isinstance(href_attr, str): current_href = href_attr.strip()
-        elif isinstance(href_attr, list) and href_attr and isinstance(href_attr[0], str): current_href = href_attr[0].strip()
-        if not current_href: continue
-
+    for current_href, anchor_text in anchors:
         absolute_url_raw = urljoin(base_url, current_href)
         normalized_link_url = normalize_url(absolute_url_raw)
         parsed_normalized_link = urlparse(normalized_link_url)
@@ -97,86 +178,12 @@ def find_internal_links(html_content: str, base_url: str, input_row_id: Any, com
         if parsed_normalized_link.scheme not in ['http', 'https']: continue
         if parsed_normalized_link.netloc != parsed_base_url.netloc: continue
 
-        link_text = link_tag.get_text().lower().strip()
-        link_href_lower = normalized_link_url.lower()
-        initial_keyword_match = False
-        if config_instance.target_link_keywords:
-            if any(kw in link_text for kw in config_instance.target_link_keywords) or \
-               any(kw in link_href_lower for kw in config_instance.target_link_keywords):
-                initial_keyword_match = True
-        if not initial_keyword_match: continue
-
-        if config_instance.scraper_exclude_link_path_patterns:
-            path_lower = parsed_normalized_link.path.lower()
-            if any(p and p in path_lower for p in config_instance.scraper_exclude_link_path_patterns):
-                logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Link '{normalized_link_url}' hard excluded by pattern in path: '{path_lower}'.")
-                continue
-        
-        score = 0
-        path_segments = [seg for seg in parsed_normalized_link.path.lower().strip('/').split('/') if seg]
-        num_segments = len(path_segments)
-
-        if config_instance.scraper_critical_priority_keywords:
-            for crit_kw in config_instance.scraper_critical_priority_keywords:
-                if any(seg == crit_kw for seg in path_segments):
-                    current_score_val = 100
-                    if num_segments > config_instance.scraper_max_keyword_path_segments:
-                        current_score_val -= min(20, (num_segments - config_instance.scraper_max_keyword_path_segments) * 5)
-                    score = max(score, current_score_val)
-                    if score >= 100: break
-            if score >= 100: pass
-
-        if score < 90 and config_instance.scraper_high_priority_keywords:
-            for high_kw in config_instance.scraper_high_priority_keywords:
-                if any(seg == high_kw for seg in path_segments):
-                    current_score_val = 90
-                    if num_segments > config_instance.scraper_max_keyword_path_segments:
-                        current_score_val -= min(20, (num_segments - config_instance.scraper_max_keyword_path_segments) * 5)
-                    score = max(score, current_score_val)
-                    if score >= 90: break
-            if score >= 90: pass
-        
-        if score < 80:
-            combined_keywords = list(set(config_instance.scraper_critical_priority_keywords + config_instance.scraper_high_priority_keywords))
-            if combined_keywords:
-                for p_kw in combined_keywords:
-                    for i, seg in enumerate(path_segments):
-                        if seg == p_kw:
-                            current_score_val = 80 - (i * 5)
-                            if num_segments > config_instance.scraper_max_keyword_path_segments:
-                                current_score_val -= min(15, (num_segments - config_instance.scraper_max_keyword_path_segments) * 5)
-                            score = max(score, current_score_val)
-                            break 
-                    if score >= 80: break
-        
-# NEW TIER: For other target keywords (not critical/high) as exact path segments
-        if score < 70: # Ensure we haven't already scored higher
-            all_target_kws = config_instance.target_link_keywords or []
-            critical_kws = set(config_instance.scraper_critical_priority_keywords or [])
-            high_kws = set(config_instance.scraper_high_priority_keywords or [])
-            
-            priority_kws = critical_kws.union(high_kws)
-            other_target_kws = [kw for kw in all_target_kws if kw not in priority_kws]
-
-            if other_target_kws:
-                for ot_kw in other_target_kws: # e.g., "about", "company", "team", "mission"
-                    if any(seg == ot_kw for seg in path_segments): # Exact match in any path segment
-                        current_score_val = 70 # Base score for this tier
-                        if num_segments > config_instance.scraper_max_keyword_path_segments:
-                            # Apply a penalty similar to other tiers, adjust multiplier/cap as needed
-                            penalty = min(10, (num_segments - config_instance.scraper_max_keyword_path_segments) * 3) 
-                            current_score_val -= penalty
-                        score = max(score, current_score_val)
-                        if score >= 70: # If this tier's max score is reached, no need to check other ot_kw
-                            break
-        if score < 50 and config_instance.target_link_keywords:
-            if any(tk in seg for tk in config_instance.target_link_keywords for seg in path_segments):
-                score = max(score, 50)
-        
-        if score < 40 and config_instance.target_link_keywords:
-            if any(tk in link_text for tk in config_instance.target_link_keywords):
-                score = max(score, 40)
+        score = link_keyword_matcher.score_link(normalized_link_url, anchor_text)
+        if score is None:
+            logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Link '{normalized_link_url}' is not a target link or is excluded by its path. Discarding.")
+            continue
 
+        link_text = anchor_text.lower().strip()
         if score >= config_instance.scraper_min_score_to_queue:
             log_text_snippet = link_text[:50].replace('\n', ' ')
             logger.debug(f"[RowID: {input_row_id}, Company: {company_name_or_id}] Link '{normalized_link_url}' scored: {score} (Text: '{log_text_snippet}...', Path: '{parsed_normalized_link.path}') - Adding to potential queue.")
@@ -188,6 +195,48 @@ def find_internal_links(html_content: str, base_url: str, input_row_id: Any, com
     logger.info(f"[RowID: {input_row_id}, Company: {company_name_or_id}] From page {base_url}, found {len(scored_links)} internal links meeting score criteria.")
     return scored_links
 
+def generate_dns_fallback_candidates(url: str, log_prefix: str = "") -> List[str]:
+    """
+    Returns the DNS fallback variants of a URL whose host does not resolve, normalized.
+
+    Strategy 1 (hyphen simplification): 'my-company.de' -> 'my.de'.
+    Strategy 2 (TLD swap): 'company.de' -> 'company.com'.
+    """
+    candidates: List[str] = []
+    parsed_url = urlparse(url)
+    try:
+        extracted = tldextract.extract(url)
+    except Exception as e:
+        logger.error(f"{log_prefix} Error parsing domain of {url} for DNS fallbacks: {e}")
+        return candidates
+
+    if '-' in extracted.domain:
+        simplified_domain_part = extracted.domain.split('-', 1)[0]
+        if simplified_domain_part:
+            variant_netloc = f"{simplified_domain_part}.{extracted.suffix}"
+            candidates.append(normalize_url(urlunparse(parsed_url._replace(netloc=variant_netloc))))
+    if extracted.suffix.lower() == 'de':
+        variant_netloc = f"{extracted.domain}.com"
+        candidates.append(normalize_url(urlunparse(parsed_url._replace(netloc=variant_netloc))))
+    return [candidate for candidate in dict.fromkeys(candidates) if candidate != url]
+
+def dns_fallback_chain(url: str, log_prefix: str = "") -> List[str]:
+    """
+    Returns every fallback variant reachable from `url` (fallbacks of fallbacks included),
+    in the order `scrape_website` would try them after successive DNS failures.
+    """
+    chain: List[str] = []
+    seen = {url}
+    pending = [url]
+    while pending:
+        current_url = pending.pop(0)
+        for candidate in generate_dns_fallback_candidates(current_url, log_prefix):
+            if candidate not in seen:
+                seen.add(candidate)
+                chain.append(candidate)
+                pending.append(candidate)
+    return chain
+
 def _classify_page_type(url_str: str, config: AppConfig) -> str:
     """Classifies a URL based on keywords in its path."""
     if not url_str:
@@ -225,10 +274,57 @@ def _classify_page_type(url_str: str, config: AppConfig) -> str:
 
     return "general_content"
 
+# Definitive link validation results for this run, keyed by normalized URL (least recently used first).
+_link_status_cache: "OrderedDict[str, bool]" = OrderedDict()
+_LINK_STATUS_CACHE_MAX_ENTRIES = 100_000
+# Validations currently running, shared by every row that asks for the same URL.
+_link_validation_in_flight: Dict[str, "asyncio.Task[Tuple[bool, bool]]"] = {}
+# Host -> (semaphore capping concurrent validation requests to that host, requests using it).
+# A host's entry is dropped once no request uses it, so the dict stays small.
+_link_validation_hosts: Dict[str, Tuple[asyncio.Semaphore, int]] = {}
+# HEAD responses that usually mean "HEAD not supported" rather than "page missing".
+_HEAD_REJECTED_STATUSES = {400, 403, 405, 501}
+# 4xx responses that say nothing lasting about the page.
+_TRANSIENT_CLIENT_ERROR_STATUSES = {408, 425, 429}
+
+
+async def _check_link_status(url: str, http_client: httpx.AsyncClient) -> Tuple[bool, bool]:
+    """
+    Validates a URL with a HEAD request (or a ranged GET if HEAD is rejected).
+
+    Returns:
+        (is_valid, is_definitive). Only a 2xx or a lasting 4xx answer is definitive;
+        5xx, rate limiting, timeouts and transport errors may pass and are not.
+    """
+    try:
+        response = await http_client.head(url, timeout=10, follow_redirects=True)
+        status_code = response.status_code
+        if status_code in _HEAD_REJECTED_STATUSES:
+            async with http_client.stream(
+                "GET", url, timeout=10, follow_redirects=True, headers={"Range": "bytes=0-0"}
+            ) as ranged_response:
+                status_code = ranged_response.status_code
+            logger.debug(f"HEAD rejected (status {response.status_code}) for {url}; ranged GET returned {status_code}.")
+        if 200 <= status_code < 300:
+            return True, True
+        else:
+            logger.warning(f"Skipping broken link (status {status_code}): {url}")
+            return False, 400 <= status_code < 500 and status_code not in _TRANSIENT_CLIENT_ERROR_STATUSES
+    except httpx.RequestError as e:
+        logger.warning(f"Skipping link due to request error: {e}")
+        return False, False
+    except Exception as e:
+        logger.error(f"An unexpected error occurred during link validation for {url}: {e}", exc_info=True)
+        return False, False
+
+
 async def validate_link_status(url: str, http_client: httpx.AsyncClient) -> bool:
     """
     Validates the status of a URL by performing a HEAD request.
 
+    Servers that reject HEAD requests are retried with a ranged GET for the
+    first byte, so the page body is not downloaded.
+
     Args:
         url: The URL to validate.
         http_client: An httpx.AsyncClient instance.
@@ -236,16 +332,89 @@ async def validate_link_status(url: str, http_client: httpx.AsyncClient) -> bool
     Returns:
         True if the URL is valid (2xx status code), False otherwise.
     """
+    is_valid, _ = await _check_link_status(url, http_client)
+    return is_valid
+
+
+async def probe_host_alive(url: str, http_client: httpx.AsyncClient, timeout_seconds: float) -> bool:
+    """
+    Cheap liveness check for a DNS fallback candidate: a single HEAD request without redirects.
+
+    Any HTTP response (including 4xx/5xx) means a web server answers for the host.
+    A timeout also counts as alive, since the host resolved and may just be slow;
+    connection and DNS errors count as dead.
+    """
     try:
-        response = await http_client.head(url, timeout=10, follow_redirects=True)
-        if 200 <= response.status_code < 300:
-            return True
-        else:
-            logger.warning(f"Skipping broken link (status {response.status_code}): {url}")
-            return False
+        await http_client.head(url, timeout=timeout_seconds, follow_redirects=False)
+        return True
+    except httpx.TimeoutException:
+        return True
     except httpx.RequestError as e:
-        logger.warning(f"Skipping link due to request error: {e}")
+        logger.debug(f"Probe: {url} is not reachable: {type(e).__name__} - {e}")
         return False
-    except Exception as e:
-        logger.error(f"An unexpected error occurred during link validation for {url}: {e}", exc_info=True)
-        return False
\ No newline at end of file
+
+
+async def validate_links(urls: List[str], http_client: httpx.AsyncClient, per_host_limit: int) -> Dict[str, bool]:
+    """
+    Validates several links concurrently.
+
+    Definitive results (2xx, or a lasting 4xx) are memoised per normalized URL
+    for the run, up to `_LINK_STATUS_CACHE_MAX_ENTRIES` URLs, so a link seen on
+    many pages is only checked once; a link that failed with a timeout, a
+    transport error or a 5xx is checked again next time. Concurrent callers
+    share a running check. At most `per_host_limit` requests run against one
+    host at a time, across all callers.
+
+    Args:
+        urls: The URLs to validate (already normalized).
+        http_client: An httpx.AsyncClient instance.
+        per_host_limit: Maximum concurrent validation requests per host.
+
+    Returns:
+        A dict mapping each URL in `urls` to True if it is valid.
+    """
+    async def _validate_with_host_cap(url: str) -> Tuple[bool, bool]:
+        host = urlparse(url).netloc
+        semaphore, users = _link_validation_hosts.get(host, (None, 0))
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, per_host_limit))
+        _link_validation_hosts[host] = (semaphore, users + 1)
+        try:
+            async with semaphore:
+                is_valid, is_definitive = await _check_link_status(url, http_client)
+        finally:
+            semaphore, users = _link_validation_hosts[host]
+            if users > 1:
+                _link_validation_hosts[host] = (semaphore, users - 1)
+            else:
+                del _link_validation_hosts[host]
+        if is_definitive:
+            _link_status_cache[url] = is_valid
+            if len(_link_status_cache) > _LINK_STATUS_CACHE_MAX_ENTRIES:
+                _link_status_cache.popitem(last=False)
+        return is_valid, is_definitive
+
+    async def _validate_shared(url: str) -> bool:
+        in_flight = _link_validation_in_flight.get(url)
+        if in_flight is None:
+            # The check runs in its own task, so a cancelled row never cancels it for the others
+            in_flight = asyncio.create_task(_validate_with_host_cap(url))
+            _link_validation_in_flight[url] = in_flight
+            in_flight.add_done_callback(lambda _: _link_validation_in_flight.pop(url, None))
+        is_valid, _ = await asyncio.shield(in_flight)
+        return is_valid
+
+    results: Dict[str, bool] = {}
+    to_check: List[str] = []
+    for url in dict.fromkeys(urls):  # De-duplicate, keep order
+        cached = _link_status_cache.get(url)
+        if cached is not None:
+            _link_status_cache.move_to_end(url)
+            results[url] = cached
+        else:
+            to_check.append(url)
+
+    if to_check:
+        statuses = await asyncio.gather(*(_validate_shared(url) for url in to_check))
+        results.update(zip(to_check, statuses))
+    return results
@@ -0,0 +1,146 @@
+"""
+Sitemap-based page discovery.
+
+Finding a site's "about" and product pages normally requires fetching (and
+often rendering) the homepage first. Many sites list those pages in a
+`sitemap.xml`, usually declared in robots.txt. `SitemapDiscoverer` downloads
+sitemaps and parses them while they stream in, following sitemap indexes and
+decompressing gzipped sitemaps, and returns the page URLs they list. The
+scraper scores these URLs with the same keyword rules as links found on pages
+and seeds the crawl frontier with the best ones.
+
+Downloads are bounded by a maximum number of sitemap files, page URLs and
+(decompressed) bytes per file, so very large sitemaps stay cheap.
+"""
+import logging
+import xml.etree.ElementTree as ET
+import zlib
+from typing import Any, Dict, List, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def _local_tag(tag: str) -> str:
+    """Returns an element tag without its XML namespace."""
+    return tag.rsplit("}", 1)[-1]
+
+
+class SitemapDiscoverer:
+    """Streams sitemaps and sitemap indexes and collects the page URLs they list."""
+
+    def __init__(self, max_files: int, max_urls: int, max_bytes_per_file: int, fetch_timeout_seconds: float = 15.0):
+        """
+        Args:
+            max_files (int): Maximum sitemap files (indexes included) fetched per site.
+            max_urls (int): Maximum page URLs collected per site.
+            max_bytes_per_file (int): Stop reading a sitemap after this many decompressed bytes.
+            fetch_timeout_seconds (float): Timeout for downloading one sitemap.
+        """
+        self.max_files = max(1, max_files)
+        self.max_urls = max(1, max_urls)
+        self.max_bytes_per_file = max(1, max_bytes_per_file)
+        self.fetch_timeout_seconds = fetch_timeout_seconds
+        self._stats: Dict[str, int] = {
+            "sites_checked": 0,
+            "sites_with_sitemap": 0,
+            "sitemaps_fetched": 0,
+            "sitemap_errors": 0,
+            "page_urls_found": 0,
+            "seed_urls_queued": 0,
+        }
+
+    async def discover(
+        self,
+        sitemap_urls: List[str],
+        client: httpx.AsyncClient,
+        user_agent: str,
+        log_prefix: str = ""
+    ) -> List[str]:
+        """
+        Fetches the given sitemaps (following sitemap indexes breadth-first) and returns
+        the page URLs they list, in sitemap order.
+        """
+        self._stats["sites_checked"] += 1
+        pending = list(dict.fromkeys(sitemap_urls))
+        seen = set(pending)
+        page_urls: List[str] = []
+        files_fetched = 0
+        while pending and files_fetched < self.max_files and len(page_urls) < self.max_urls:
+            sitemap_url = pending.pop(0)
+            files_fetched += 1
+            child_sitemaps, urls = await self._fetch_and_parse(
+                sitemap_url, client, user_agent, self.max_urls - len(page_urls), log_prefix
+            )
+            page_urls.extend(urls)
+            for child_sitemap in child_sitemaps:
+                if child_sitemap not in seen:
+                    seen.add(child_sitemap)
+                    pending.append(child_sitemap)
+        if page_urls:
+            self._stats["sites_with_sitemap"] += 1
+            self._stats["page_urls_found"] += len(page_urls)
+            logger.info(f"{log_prefix} Sitemaps: found {len(page_urls)} page URLs in {files_fetched} file(s).")
+        return page_urls
+
+    async def _fetch_and_parse(
+        self,
+        sitemap_url: str,
+        client: httpx.AsyncClient,
+        user_agent: str,
+        url_budget: int,
+        log_prefix: str
+    ) -> Tuple[List[str], List[str]]:
+        """Streams one sitemap. Returns (child sitemap URLs, page URLs)."""
+        child_sitemaps: List[str] = []
+        page_urls: List[str] = []
+        parser = ET.XMLPullParser(events=("end",))
+        decompressor = None
+        bytes_read = 0
+        first_chunk = True
+        try:
+            async with client.stream(
+                "GET", sitemap_url, headers={'User-Agent': user_agent}, timeout=self.fetch_timeout_seconds
+            ) as response:
+                if response.status_code != 200:
+                    logger.debug(f"{log_prefix} Sitemap {sitemap_url} not available (status {response.status_code}).")
+                    return child_sitemaps, page_urls
+                self._stats["sitemaps_fetched"] += 1
+                async for chunk in response.aiter_bytes():
+                    if first_chunk:
+                        first_chunk = False
+                        if chunk.startswith(_GZIP_MAGIC):  # .xml.gz served without Content-Encoding
+                            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+                    # Never inflate past the per-file budget, so a gzip bomb cannot blow up memory
+                    remaining_bytes = self.max_bytes_per_file - bytes_read
+                    data = decompressor.decompress(chunk, remaining_bytes) if decompressor else chunk[:remaining_bytes]
+                    bytes_read += len(data)
+                    parser.feed(data)
+                    for _, element in parser.read_events():
+                        tag = _local_tag(element.tag)
+                        if tag not in ("url", "sitemap"):
+                            continue
+                        loc_element = element.find("{*}loc")
+                        if loc_element is None:
+                            loc_element = element.find("loc")
+                        loc = (loc_element.text or "").strip() if loc_element is not None else ""
+                        if loc:
+                            (page_urls if tag == "url" else child_sitemaps).append(loc)
+                        element.clear()
+                    if len(page_urls) >= url_budget or bytes_read >= self.max_bytes_per_file:
+                        break
+        except (httpx.HTTPError, ET.ParseError, zlib.error) as e:
+            self._stats["sitemap_errors"] += 1
+            logger.debug(f"{log_prefix} Error reading sitemap {sitemap_url}: {type(e).__name__} - {e}")
+        return child_sitemaps, page_urls[:url_budget]
+
+    def record_seeded(self, count: int) -> None:
+        """Counts sitemap URLs that were added to a crawl frontier."""
+        self._stats["seed_urls_queued"] += count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns discovery statistics suitable for `run_metrics`."""
+        return dict(self._stats)
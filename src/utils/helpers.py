@@ -171,6 +171,33 @@ def precompute_input_duplicate_stats(df: pd.DataFrame, app_config: AppConfig, ru
     df.drop(columns=['temp_input_canonical_url_for_dup_count', 'temp_input_company_name_for_dup_count'], inplace=True)
     logger.info("Input duplicate pre-computation complete.")
     return df
+def plan_domain_groups(df: pd.DataFrame, app_config: AppConfig) -> Dict[int, List[int]]:
+    """
+    Groups input rows that share an input canonical URL so that each domain is scraped
+    and analyzed once.
+
+    The first row (by position) of each group is its leader; the other rows are
+    followers that reuse the leader's results. Rows without a usable URL are not grouped.
+
+    Returns:
+        A dict mapping the 0-based position of each leader to the positions of its
+        followers. Only groups with at least one follower are included.
+    """
+    active_profile = app_config.INPUT_COLUMN_PROFILES.get(app_config.input_file_profile_name, app_config.INPUT_COLUMN_PROFILES['default'])
+    url_col_key = active_profile.get('GivenURL', 'GivenURL')
+
+    positions_by_canonical: Dict[str, List[int]] = {}
+    for position, given_url_val in enumerate(df[url_col_key] if url_col_key in df.columns else []):
+        derived_input_canonical = get_input_canonical_url(given_url_val)
+        if derived_input_canonical:
+            positions_by_canonical.setdefault(derived_input_canonical, []).append(position)
+
+    return {
+        positions[0]: positions[1:]
+        for positions in positions_by_canonical.values()
+        if len(positions) > 1
+    }
+
 def initialize_dataframe_columns(df: pd.DataFrame) -> pd.DataFrame:
     """
     Ensures that the DataFrame has all required columns for the pipeline,
@@ -0,0 +1,79 @@
+"""Writing and reading back scraped page text with the artifact sinks and `PackedArtifactReader`."""
+import os
+
+import pytest
+
+from src.scraper import artifact_store
+from src.scraper.artifact_store import (
+    DirectoryArtifactSink, PackedArtifactReader, PackedArtifactSink, directory_layout_path,
+    export_to_directory, packed_store_path
+)
+
+COMPRESSIONS = ["gzip", "none"] + (["zstd"] if artifact_store.zstandard is not None else [])
+
+
+def _write_pages(store_path, compression):
+    sink = PackedArtifactSink(store_path, compression)
+    sink.write_page("acme", "https://acme.example/", "homepage", "Welcome to Acme")
+    sink.write_page("acme", "https://acme.example/about", "about", "About Acme – Über uns")
+    sink.write_page("acme", "https://acme.example/", "homepage", "Welcome to Acme, updated")
+    stats = sink.get_stats()
+    sink.close()
+    return stats
+
+
+@pytest.mark.parametrize("compression", COMPRESSIONS)
+def test_packed_store_round_trips(tmp_path, compression):
+    store_path = packed_store_path(str(tmp_path), compression)
+    stats = _write_pages(store_path, compression)
+    assert stats["pages_written"] == 3
+
+    reader = PackedArtifactReader(store_path)
+    assert len(reader) == 2
+    assert "https://acme.example/about" in reader
+    assert reader.get("https://acme.example/")["text"] == "Welcome to Acme, updated"  # Later record wins
+    about = reader.get("https://acme.example/about")
+    assert (about["company"], about["page_type"], about["text"]) == ("acme", "about", "About Acme – Über uns")
+    assert reader.get("https://acme.example/missing") is None
+    assert [record["url"] for record in reader.iter_records()] == ["https://acme.example/about", "https://acme.example/"]
+
+
+def test_resumed_run_appends_to_the_same_store(tmp_path):
+    store_path = packed_store_path(str(tmp_path), "gzip")
+    _write_pages(store_path, "gzip")
+    sink = PackedArtifactSink(store_path, "gzip")
+    sink.write_page("acme", "https://acme.example/contact", "contact", "Call us")
+    sink.close()
+    reader = PackedArtifactReader(store_path)
+    assert len(reader) == 3
+    assert reader.get("https://acme.example/about")["text"] == "About Acme – Über uns"
+
+
+def test_torn_index_line_is_ignored(tmp_path):
+    store_path = packed_store_path(str(tmp_path), "gzip")
+    _write_pages(store_path, "gzip")
+    with open(store_path + artifact_store.INDEX_SUFFIX, "a", encoding="utf-8") as f:
+        f.write('{"url": "https://acme.example/partial", "off')  # Interrupted write
+    reader = PackedArtifactReader(store_path)
+    assert len(reader) == 2
+    assert "https://acme.example/partial" not in reader
+
+
+def test_export_recreates_directory_layout(tmp_path):
+    store_path = packed_store_path(str(tmp_path / "packed"), "gzip")
+    _write_pages(store_path, "gzip")
+    output_dir = str(tmp_path / "exported")
+    assert export_to_directory(store_path, output_dir) == 2
+    with open(directory_layout_path(output_dir, "acme", "https://acme.example/about"), encoding="utf-8") as f:
+        assert f.read() == "About Acme – Über uns"
+
+
+def test_directory_sink_writes_one_file_per_page(tmp_path):
+    sink = DirectoryArtifactSink(str(tmp_path))
+    file_path = sink.write_page("acme", "https://www.acme.example/about", "about", "About Acme")
+    sink.write_page("acme", "https://www.acme.example/about", "about", "About Acme again")
+    assert os.path.dirname(file_path) == os.path.join(str(tmp_path), "acme.example")
+    with open(file_path, encoding="utf-8") as f:
+        assert f.read() == "About Acme again"
+    assert sink.get_stats()["files_created"] == 1
+    assert sink.get_stats()["pages_written"] == 2
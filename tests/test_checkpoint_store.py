@@ -0,0 +1,53 @@
+"""Save/load round-trips of `PipelineCheckpointStore`, the state behind `--resume`."""
+import pytest
+
+from src.processing.checkpoint_store import (
+    CHECKPOINT_STAGES, STAGE_COMPLETE, STAGE_SCRAPED, STAGE_SUMMARIZED,
+    PipelineCheckpointStore, get_checkpoint_db_path, open_checkpoint_store
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    checkpoint_store = PipelineCheckpointStore(str(tmp_path / "checkpoint.sqlite"))
+    yield checkpoint_store
+    checkpoint_store.close()
+
+
+@pytest.mark.parametrize("stage", CHECKPOINT_STAGES)
+def test_row_round_trips_at_every_stage(store, stage):
+    state = {"processed_url": "https://acme.example", "llm_calls": 2, "pathful_scraper_status": ["https://acme.example/", "Success"]}
+    store.save_row(3, "row-3", stage, state)
+    assert store.load_rows() == {3: (stage, state)}
+
+
+def test_later_stage_replaces_earlier_checkpoint(store):
+    store.save_row(0, 10, STAGE_SCRAPED, {"scraper_status": "Success"})
+    store.save_row(0, 10, STAGE_SUMMARIZED, {"scraper_status": "Success", "llm_calls": 1})
+    store.save_row(1, 11, STAGE_COMPLETE, {"failed": True})
+    assert store.load_rows() == {
+        0: (STAGE_SUMMARIZED, {"scraper_status": "Success", "llm_calls": 1}),
+        1: (STAGE_COMPLETE, {"failed": True}),
+    }
+    assert store.count_rows_by_stage() == {STAGE_SUMMARIZED: 1, STAGE_COMPLETE: 1}
+
+
+def test_unknown_stage_is_rejected(store):
+    with pytest.raises(ValueError):
+        store.save_row(0, 0, "half-done", {})
+
+
+def test_progress_survives_reopening(tmp_path):
+    db_path = get_checkpoint_db_path(str(tmp_path), "run1")
+    first_run = open_checkpoint_store(str(tmp_path), "run1")
+    first_run.save_row(0, 0, STAGE_COMPLETE, {"failed": False})
+    first_run.add_processed_urls(["https://acme.example/", "https://acme.example/about", ""])
+    first_run.add_processed_urls(["https://acme.example/"])
+    first_run.close()
+
+    resumed_run = PipelineCheckpointStore(db_path)
+    try:
+        assert resumed_run.load_rows() == {0: (STAGE_COMPLETE, {"failed": False})}
+        assert resumed_run.load_processed_urls() == {"https://acme.example/", "https://acme.example/about"}
+    finally:
+        resumed_run.close()
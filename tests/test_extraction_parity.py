@@ -0,0 +1,68 @@
+"""
+Parity check for in-browser text and link extraction.
+
+Loads each page in `fixtures/extraction/` into Chromium and compares
+`extract_in_browser` (one `page.evaluate` call) with the BeautifulSoup path on
+`page.content()`: the cleaned text must be identical and the scored internal
+links must match. Skipped when Playwright or its Chromium build is not available.
+"""
+import asyncio
+import logging
+import os
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+pytest.importorskip("playwright.async_api")
+from playwright.async_api import async_playwright, Error as PlaywrightError
+
+from src.scraper.page_handler import extract_in_browser
+from src.scraper.scraper_utils import _parse_html, score_internal_links
+
+BASE_URL = "https://example.com/section/"
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "extraction")
+FIXTURE_PAGES = sorted(name for name in os.listdir(FIXTURE_DIR) if name.lower().endswith((".html", ".htm")))
+
+
+async def _extract_both_ways(page_names: List[str]) -> Dict[str, Tuple[Any, Any]]:
+    """Returns, per page, ((text, links) from BeautifulSoup, (text, links) from the browser)."""
+    results: Dict[str, Tuple[Any, Any]] = {}
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch()
+        try:
+            page = await browser.new_page()
+            for name in page_names:
+                with open(os.path.join(FIXTURE_DIR, name), "r", encoding="utf-8", errors="replace") as f:
+                    await page.set_content(f.read(), wait_until="domcontentloaded")
+                expected_text, expected_anchors = _parse_html(await page.content(), "html.parser", collect_links=True)
+                browser_text, browser_anchors = await extract_in_browser(page)
+                results[name] = (
+                    (expected_text, score_internal_links(expected_anchors, BASE_URL, "parity", "parity")),
+                    (browser_text, score_internal_links(browser_anchors, BASE_URL, "parity", "parity")),
+                )
+        finally:
+            await browser.close()
+    return results
+
+
+@pytest.fixture(scope="module")
+def extraction_results() -> Dict[str, Tuple[Any, Any]]:
+    logging.disable(logging.INFO)  # Link scoring logs every page
+    try:
+        return asyncio.run(_extract_both_ways(FIXTURE_PAGES))
+    except PlaywrightError as e:
+        pytest.skip(f"Chromium is not available: {e}")
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+@pytest.mark.parametrize("page_name", FIXTURE_PAGES)
+def test_in_browser_text_matches_beautifulsoup(extraction_results, page_name):
+    (expected_text, _), (browser_text, _) = extraction_results[page_name]
+    assert browser_text == expected_text
+
+
+@pytest.mark.parametrize("page_name", FIXTURE_PAGES)
+def test_in_browser_links_match_beautifulsoup(extraction_results, page_name):
+    (_, expected_links), (_, browser_links) = extraction_results[page_name]
+    assert browser_links == expected_links
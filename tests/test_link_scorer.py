@@ -0,0 +1,41 @@
+"""
+Golden corpus check for `LinkKeywordMatcher`.
+
+`fixtures/link_scoring_golden.json` holds (url, anchor text, expected score)
+cases generated from the link scoring that the matcher replaced; every case
+must still score the same. `score_link` is what `score_internal_links` uses to
+rank the links of crawled pages.
+"""
+import json
+import os
+from typing import List
+
+from src.scraper.link_scorer import LinkKeywordMatcher
+
+GOLDEN_CORPUS_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "link_scoring_golden.json")
+
+
+def _golden_mismatches(corpus_path: str) -> List[str]:
+    with open(corpus_path, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+    mismatches: List[str] = []
+    for config_block in corpus["configs"]:
+        matcher = LinkKeywordMatcher(**config_block["rules"])
+        for url, link_text, expected_score in config_block["cases"]:
+            actual_score = matcher.score_link(url, link_text)
+            if actual_score != expected_score:
+                mismatches.append(
+                    f"[{config_block['name']}] {url} (text '{link_text}'): expected {expected_score}, got {actual_score}"
+                )
+    return mismatches
+
+
+def test_golden_corpus_has_cases():
+    with open(GOLDEN_CORPUS_PATH, "r", encoding="utf-8") as f:
+        corpus = json.load(f)
+    assert sum(len(config_block["cases"]) for config_block in corpus["configs"]) > 0
+
+
+def test_link_scores_match_golden_corpus():
+    mismatches = _golden_mismatches(GOLDEN_CORPUS_PATH)
+    assert not mismatches, f"{len(mismatches)} golden mismatch(es):\n" + "\n".join(mismatches[:20])
@@ -0,0 +1,175 @@
+"""
+Resume path of the pipeline: row results saved at each stage are restored
+intact, resumed rows only run the stages after their checkpoint, and rows
+that had finished are replayed without scraping, LLM calls or new failure-log
+entries.
+"""
+import asyncio
+from collections import Counter
+
+import pandas as pd
+import pytest
+
+from src.core.schemas import DetailedCompanyAttributes, GoldenPartnerMatchOutput, WebsiteTextSummary
+from src.processing import pipeline_flow
+from src.processing.checkpoint_store import (
+    STAGE_COMPLETE, STAGE_EXTRACTED, STAGE_SCRAPED, STAGE_SUMMARIZED, PipelineCheckpointStore
+)
+
+ROW = pd.Series({"CompanyName": "Acme GmbH", "GivenURL": "https://acme.example"})
+
+
+class RecordingWriter:
+    """Stands in for the failure CSV writer."""
+
+    def __init__(self):
+        self.rows = []
+
+    def writerow(self, row):
+        self.rows.append(row)
+
+
+@pytest.fixture
+def store(tmp_path):
+    checkpoint_store = PipelineCheckpointStore(str(tmp_path / "checkpoint.sqlite"))
+    yield checkpoint_store
+    checkpoint_store.close()
+
+
+def _flow_state(checkpoint_store):
+    return {
+        "company_name_col_key": "CompanyName",
+        "url_col_key": "GivenURL",
+        "total_rows": 1,
+        "df": pd.DataFrame([ROW]),
+        "failure_writer": RecordingWriter(),
+        "checkpoint_store": checkpoint_store,
+        "resume_checkpoints": {},
+        "rows_processed_count": 0,
+        "rows_failed_count": 0,
+        "rows_resumed_count": 0,
+        "row_level_failure_counts": Counter(),
+        "canonical_site_pathful_scraper_status": {},
+        "input_to_canonical_map": {},
+        "canonical_domain_journey_data": {},
+        "outputs_by_position": {},
+        "domain_followers": {},
+        "run_metrics": {"data_processing_stats": {}},
+    }
+
+
+def _finished_row(flow_state):
+    row_result = pipeline_flow._new_row_result(flow_state, 0, 0, ROW)
+    row_result.update(
+        processed_url="https://acme.example",
+        scraper_status="Success",
+        pathful_scraper_status=("https://acme.example/", "Success"),
+        final_canonical_entry_url="https://acme.example/",
+        true_base_domain="acme.example",
+        df_updates={"ScrapingStatus": "Success"},
+        llm_calls=3,
+        llm_tokens=1200,
+        website_summary_obj=WebsiteTextSummary(original_url="https://acme.example", summary="Acme builds robots."),
+        detailed_attributes_obj=DetailedCompanyAttributes(input_summary_url="https://acme.example", industry="Robotics"),
+    )
+    row_result["failures"].append({
+        "stage_of_failure": "LLM_Insights", "error_reason": "Partial", "log_timestamp": "2026-01-01T00:00:00",
+        "error_details": "{}", "associated_pathful_canonical_url": None,
+    })
+    row_result["outputs"].append(GoldenPartnerMatchOutput(
+        analyzed_company_url="https://acme.example",
+        analyzed_company_attributes=row_result["detailed_attributes_obj"],
+        match_score="High",
+    ))
+    return row_result
+
+
+def _resume(flow_state, checkpoint_store):
+    """Starts a 'new run' on the same store and restores row 0."""
+    flow_state["resume_checkpoints"] = checkpoint_store.load_rows()
+    restored = pipeline_flow._new_row_result(flow_state, 0, 0, ROW)
+    return restored, pipeline_flow._restore_row_result(flow_state, restored)
+
+
+@pytest.mark.parametrize("stage", [STAGE_SCRAPED, STAGE_SUMMARIZED, STAGE_EXTRACTED, STAGE_COMPLETE])
+def test_row_result_is_restored_at_every_stage(store, stage):
+    flow_state = _flow_state(store)
+    original = _finished_row(flow_state)
+    pipeline_flow._checkpoint_row(flow_state, original, stage)
+
+    restored, resumed_stage = _resume(flow_state, store)
+    assert resumed_stage == stage
+    for field in pipeline_flow._CHECKPOINT_FIELDS:
+        assert restored[field] == original[field], field
+    assert restored["website_summary_obj"] == original["website_summary_obj"]
+    assert restored["detailed_attributes_obj"] == original["detailed_attributes_obj"]
+    assert restored["outputs"] == original["outputs"]
+    assert flow_state["rows_resumed_count"] == 1
+    assert flow_state["resume_checkpoints"] == {}  # Consumed
+
+
+def test_row_without_checkpoint_is_not_restored(store):
+    flow_state = _flow_state(store)
+    restored, resumed_stage = _resume(flow_state, store)
+    assert resumed_stage is None
+    assert restored["scraper_status"] == "Not_Run"
+
+
+def test_unknown_checkpoint_stage_is_ignored(store):
+    flow_state = _flow_state(store)
+    flow_state["resume_checkpoints"] = {0: ("half-done", {"scraper_status": "Success"})}
+    restored = pipeline_flow._new_row_result(flow_state, 0, 0, ROW)
+    assert pipeline_flow._restore_row_result(flow_state, restored) is None
+    assert restored["scraper_status"] == "Not_Run"
+
+
+@pytest.mark.parametrize("stage, expected_stages", [
+    (STAGE_SCRAPED, ["summarize", "extract", "insights"]),
+    (STAGE_SUMMARIZED, ["extract", "insights"]),
+    (STAGE_EXTRACTED, ["insights"]),
+])
+def test_resumed_row_runs_only_the_later_stages(store, monkeypatch, stage, expected_stages):
+    stages_run = []
+
+    def _recording_stage(name):
+        async def _stage(flow_state, row_result):
+            stages_run.append(name)
+            return True
+        return _stage
+
+    monkeypatch.setattr(pipeline_flow, "_stage_scrape", _recording_stage("scrape"))
+    monkeypatch.setattr(pipeline_flow, "_stage_summarize", _recording_stage("summarize"))
+    monkeypatch.setattr(pipeline_flow, "_stage_extract_attributes", _recording_stage("extract"))
+    monkeypatch.setattr(pipeline_flow, "_stage_sales_insights", _recording_stage("insights"))
+    monkeypatch.setattr(pipeline_flow, "_stage_validate_url", lambda flow_state, row_result: pytest.fail("URL validated again"))
+
+    flow_state = _flow_state(store)
+    pipeline_flow._checkpoint_row(flow_state, _finished_row(flow_state), stage)
+    restored, resumed_stage = _resume(flow_state, store)
+    asyncio.run(pipeline_flow._process_row(flow_state, restored, resumed_stage))
+    assert stages_run == expected_stages
+
+
+def test_finished_row_is_replayed_without_new_work(store, monkeypatch):
+    async def _no_scrape(*args, **kwargs):
+        pytest.fail("A finished row was scraped again")
+
+    monkeypatch.setattr(pipeline_flow, "scrape_website", _no_scrape)
+    for llm_task in ("generate_website_summary", "extract_detailed_attributes", "generate_sales_insights", "generate_summary_and_attributes"):
+        monkeypatch.setattr(pipeline_flow, llm_task, lambda *args, **kwargs: pytest.fail("A finished row called the LLM again"))
+
+    first_run = _flow_state(store)
+    pipeline_flow._merge_row_result(first_run, _finished_row(first_run))  # Checkpoints the row as complete
+    assert len(first_run["failure_writer"].rows) == 1
+    assert store.load_rows()[0][0] == STAGE_COMPLETE
+
+    resumed_run = _flow_state(store)
+    restored, resumed_stage = _resume(resumed_run, store)
+    assert resumed_stage == STAGE_COMPLETE
+    pipeline_flow._merge_row_result(resumed_run, restored, replayed=True)
+
+    assert resumed_run["failure_writer"].rows == []  # Already in the earlier run's failure CSV
+    assert resumed_run["row_level_failure_counts"] == Counter({"LLM_Insights": 1})
+    assert resumed_run["outputs_by_position"][0] == first_run["outputs_by_position"][0]
+    assert resumed_run["canonical_site_pathful_scraper_status"] == {"https://acme.example/": "Success"}
+    assert resumed_run["df"].at[0, "ScrapingStatus"] == "Success"
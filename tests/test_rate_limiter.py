@@ -0,0 +1,97 @@
+"""Token reservation, refunds and pauses of `AsyncRateLimiter`, on a simulated clock."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.llm_clients import rate_limiter
+from src.llm_clients.rate_limiter import AsyncRateLimiter, RateLimiterRegistry
+
+
+class FakeClock:
+    """Replaces `time.monotonic` and `asyncio.sleep` in the limiter module; sleeping advances the clock."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = 0.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.now += seconds
+        self.slept += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", fake_clock)
+    monkeypatch.setattr(rate_limiter, "asyncio", SimpleNamespace(sleep=fake_clock.sleep, Lock=asyncio.Lock))
+    return fake_clock
+
+
+def test_unlimited_limiter_never_waits(clock):
+    limiter = AsyncRateLimiter("model", requests_per_minute=0, tokens_per_minute=0)
+
+    async def run():
+        for _ in range(50):
+            await limiter.acquire(100_000)
+
+    asyncio.run(run())
+    assert clock.slept == 0
+    assert limiter.get_stats()["requests_admitted"] == 50
+
+
+def test_kept_reservation_delays_the_next_caller(clock):
+    limiter = AsyncRateLimiter("model", requests_per_minute=0, tokens_per_minute=6000)
+
+    async def run():
+        reserved = await limiter.acquire(6000)
+        limiter.record_usage(reserved, 6000)
+        await limiter.acquire(3000)
+
+    asyncio.run(run())
+    assert clock.slept == pytest.approx(30.0)
+
+
+def test_failed_call_refunds_its_reservation(clock):
+    limiter = AsyncRateLimiter("model", requests_per_minute=0, tokens_per_minute=6000)
+
+    async def run():
+        reserved = await limiter.acquire(6000)
+        limiter.record_usage(reserved, 0)  # What a failed Gemini attempt records
+        await limiter.acquire(6000)
+
+    asyncio.run(run())
+    assert clock.slept == 0
+
+
+def test_request_rate_is_limited(clock):
+    limiter = AsyncRateLimiter("model", requests_per_minute=60, tokens_per_minute=0)
+
+    async def run():
+        for _ in range(61):
+            await limiter.acquire(0)
+
+    asyncio.run(run())
+    assert clock.slept == pytest.approx(1.0)
+    assert limiter.get_stats()["requests_delayed"] == 1
+
+
+def test_pause_holds_back_all_callers(clock):
+    limiter = AsyncRateLimiter("model", requests_per_minute=0, tokens_per_minute=0)
+    limiter.pause(5.0)
+
+    async def run():
+        await limiter.acquire(10)
+
+    asyncio.run(run())
+    assert clock.slept == pytest.approx(5.0)
+    assert limiter.get_stats()["rate_limit_errors"] == 1
+
+
+def test_registry_keeps_one_limiter_per_model():
+    registry = RateLimiterRegistry(requests_per_minute=10, tokens_per_minute=1000)
+    assert registry.get("models/a") is registry.get("models/a")
+    assert registry.get("models/a") is not registry.get("models/b")
@@ -0,0 +1,87 @@
+"""Keys, round-trips, TTL expiry and LRU eviction of `LLMResponseCache`."""
+from types import SimpleNamespace
+
+import pytest
+
+from src.llm_clients import response_cache
+from src.llm_clients.response_cache import LLMResponseCache, build_cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def time(self) -> float:
+        self.now += 0.001  # Every call is a distinct access time
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake_clock = FakeClock()
+    monkeypatch.setattr(response_cache, "time", SimpleNamespace(time=fake_clock.time))
+    return fake_clock
+
+
+def _open(tmp_path, ttl_seconds=0, max_entries=0):
+    return LLMResponseCache(str(tmp_path / "llm" / "cache.sqlite"), ttl_seconds=ttl_seconds, max_entries=max_entries)
+
+
+def test_cache_key_covers_every_request_part():
+    contents = [{"role": "user", "parts": [{"text": "Summarize acme.example"}]}]
+    config = {"temperature": 0.2, "max_output_tokens": 512}
+    key = build_cache_key("models/a", "system", contents, config)
+    assert key == build_cache_key("models/a", "system", [dict(item) for item in contents], dict(config))
+    assert key != build_cache_key("models/b", "system", contents, config)
+    assert key != build_cache_key("models/a", "other system", contents, config)
+    assert key != build_cache_key("models/a", "system", [{"role": "user", "parts": [{"text": "Summarize other"}]}], config)
+    assert key != build_cache_key("models/a", "system", contents, {"temperature": 0.3, "max_output_tokens": 512})
+
+
+def test_stored_response_round_trips(tmp_path, clock):
+    cache = _open(tmp_path)
+    try:
+        assert cache.get("k") is None
+        cache.put("k", "models/a", '{"summary": "Acme"}', {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120})
+        cached = cache.get("k")
+        assert cached.text == '{"summary": "Acme"}'
+        assert cached.candidates
+        assert cached.usage_metadata.total_token_count == 0  # Cached responses are not billed
+        assert cached.cached_usage == {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120}
+    finally:
+        cache.close()
+
+
+def test_expired_entry_is_a_miss(tmp_path, clock):
+    cache = _open(tmp_path, ttl_seconds=60)
+    try:
+        cache.put("k", "models/a", "text", {})
+        clock.now += 61
+        assert cache.get("k") is None
+    finally:
+        cache.close()
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, clock):
+    cache = _open(tmp_path, max_entries=2)
+    try:
+        cache.put("a", "models/a", "A", {})
+        cache.put("b", "models/a", "B", {})
+        assert cache.get("a") is not None  # "b" is now the least recently used
+        cache.put("c", "models/a", "C", {})
+        assert cache.get("b") is None
+        assert cache.get("a").text == "A"
+        assert cache.get("c").text == "C"
+    finally:
+        cache.close()
+
+
+def test_entries_persist_across_runs(tmp_path, clock):
+    cache = _open(tmp_path)
+    cache.put("k", "models/a", "text", {"total_tokens": 5})
+    cache.close()
+    reopened = _open(tmp_path)
+    try:
+        assert reopened.get("k").cached_usage["total_tokens"] == 5
+    finally:
+        reopened.close()